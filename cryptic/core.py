@@ -64,8 +64,9 @@ class CrypticCrossword(Crossword):
         self.block = None
         self.empty = None
 
-        # add an attributes for solution and words
+        # add an attributes for solution, slots and words
         self.solution = None
+        self.slots = {}
         self.words = {}
 
     @property
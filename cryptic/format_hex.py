@@ -18,6 +18,7 @@ def from_hex(hex_dict):
         "unclued",
         "width",
         "height",
+        "slots",
         "words",
     ]
 
@@ -39,6 +40,7 @@ def from_hex(hex_dict):
     crossword.empty = hex_dict["settings"].get('empty')
 
     crossword.solution = hex_dict.get('solution')
+    crossword.slots = hex_dict.get('slots', {})
     crossword.words = hex_dict.get('words', {})
 
     # create clue containers and clues
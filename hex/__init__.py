@@ -2,10 +2,11 @@
 """Hex is a Python library that implements a file format for cryptic crosswords."""
 
 __title__ = 'hex'
-__version__ = '0.0.1'
+__version__ = '0.0.2'
 __author__ = 'Lukas Karlsson'
 __email__ = 'lukwam@gmail.com'
 __license__ = 'MIT'
 __copyright__ = 'Copyright 2023 Lukas Karlsson'
 
-from hex.core import load, read
+from hex.cache import Cache
+from hex.core import get_cache, load, read, read_yaml, scan_header
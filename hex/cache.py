@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""On-disk cache of parsed hex data."""
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+
+# default cache size limit in bytes
+MAX_SIZE = 64 * 1024 * 1024
+
+SUFFIX = ".pickle"
+
+
+class Cache:
+    """Size-bounded cache of parsed puzzles keyed by content hash."""
+
+    def __init__(self, directory, max_size=MAX_SIZE, version=""):
+        """Initialize the Cache class."""
+        self.directory = directory
+        self.max_size = max_size
+        self.version = version
+        self._size = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        """Return the path of a cache entry."""
+        return os.path.join(self.directory, f"{key}{SUFFIX}")
+
+    def _scan(self):
+        """Return the cache entries as (mtime, size, path), oldest first."""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(entries)
+
+    @property
+    def size(self):
+        """Return the total size of the cache entries in bytes."""
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._scan())
+        return self._size
+
+    def key(self, content, kind="hex"):
+        """Return the cache key for the content of a file."""
+        digest = hashlib.sha256()
+        digest.update(f"{kind}:{self.version}:".encode())
+        digest.update(content)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached data for a key, or None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as error:
+            logging.warning(f"Ignoring unreadable cache entry {path}: {error}")
+            return None
+        # mark the entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def set(self, key, data):
+        """Store data for a key and evict old entries if needed."""
+        payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.max_size:
+            return
+        size = self.size
+        path = self._path(key)
+
+        # an entry that is replaced no longer counts towards the size
+        try:
+            size -= os.stat(path).st_size
+        except FileNotFoundError:
+            pass
+
+        # write atomically so concurrent readers never see partial entries
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, path)
+        except OSError as error:
+            logging.warning(f"Failed to write cache entry {key}: {error}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+
+        self._size = size + len(payload)
+        if self._size > self.max_size:
+            self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until under the size limit."""
+        entries = self._scan()
+        size = sum(size for _, size, _ in entries)
+        for _, entry_size, path in entries:
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+        self._size = size
+
+    def clear(self):
+        """Remove all cache entries."""
+        for _, _, path in self._scan():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._size = 0
@@ -1,9 +1,17 @@
 # -*- coding: utf-8 -*-
 """Hex class file."""
+import functools
 import logging
+import os
 
 import yaml
 
+from hex.cache import Cache
+from hex.cache import MAX_SIZE
+
+# use the libyaml parser when it is available
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 BAR = "|"
 
 BLOCK = "#"
@@ -28,46 +36,69 @@ KEYS = [
     "unclued",       # unclued entries: [entry, ...]
 ]
 
+# top-level scalar keys returned by scan_header
+METADATA_KEYS = KEYS[:7]
+
+# events that open and close a mapping or sequence in a YAML stream
+START_EVENTS = (yaml.MappingStartEvent, yaml.SequenceStartEvent)
+END_EVENTS = (yaml.MappingEndEvent, yaml.SequenceEndEvent)
+
+
+def _scan_slots(lines, direction):
+    """Return the slots in the rows or columns of a grid, in grid order."""
+    slots = {}
+    for b, line in enumerate(lines):
+        a = 0
+        start = 0
+        letters = []
+        # a trailing bar closes the last word in the line
+        for char in line + BAR:
+            if char in (BAR, BLOCK, EMPTY):
+                if len(letters) > 1:
+                    end = start + len(letters) - 1
+                    if direction == "across":
+                        x1, x2, y1, y2 = start, end, b, b
+                    else:
+                        x1, x2, y1, y2 = b, b, start, end
+                    slots[x1, y1, direction] = {
+                        "direction": direction,
+                        "text": "".join(letters),
+                        "length": len(letters),
+                        "start": (x1, y1),
+                        "end": (x2, y2),
+                        "x1": x1, "x2": x2, "y1": y1, "y2": y2,
+                    }
+                letters = []
+                if char != BAR:
+                    a += 1
+                continue
+            if not letters:
+                start = a
+            letters.append(char)
+            a += 1
+    return slots
 
-def _get_across_words(rows):
-    """Return a dict of across words."""
-    words = {}
-    for y, row in enumerate(rows):
-        ltrs = row.replace(BAR, "").replace(BLOCK, "").replace(EMPTY, "")
-        for word in row.replace(BLOCK, BAR).replace(EMPTY, BAR).split(BAR):
-            if len(word) > 1:
-                x1 = ltrs.index(word)
-                x2 = ltrs.index(word) + len(word) - 1
-                y1 = y
-                y2 = y
-                words[word] = {
-                    "direction": "across",
-                    "x1": x1, "x2": x2, "y1": y1, "y2": y2,
-                }
-    return words
+
+def _get_across_slots(rows):
+    """Return a dict of across slots keyed by (x, y, direction)."""
+    return _scan_slots(rows, "across")
 
 
-def _get_down_words(columns):
-    """Return a dict of across words."""
+def _get_down_slots(columns):
+    """Return a dict of down slots keyed by (x, y, direction)."""
+    return _scan_slots(columns, "down")
+
+
+def _index_slots(slots):
+    """Return a dict of slot keys for each word in the grid."""
     words = {}
-    for x, col in enumerate(columns):
-        ltrs = col.replace(BAR, "").replace(BLOCK, "").replace(EMPTY, "")
-        for word in col.replace(BLOCK, BAR).replace(EMPTY, BAR).split(BAR):
-            if len(word) > 1:
-                y1 = ltrs.index(word)
-                y2 = ltrs.index(word) + len(word) - 1
-                x1 = x
-                x2 = x
-                words[word] = {
-                    "direction": "down",
-                    "x1": x1, "x2": x2, "y1": y1, "y2": y2,
-                }
+    for key, slot in slots.items():
+        words.setdefault(slot["text"], []).append(key)
     return words
 
 
-def _parse_clue(item):
-    """Parse a clue."""
-    name, rest = item.split(" ", 1)
+def _make_clue(name, clue, answer, explanation):
+    """Return a clue dict from the parts of a clue string."""
     name = name.strip(".")
 
     # allow clues to be grouped (e.g. "1|a", "1|b", 1|c", ...)
@@ -77,9 +108,6 @@ def _parse_clue(item):
         heading, subheading = name.split("|", 1)
         name = name.replace("|", "")
 
-    # get the clue, answer and explanation
-    clue, answer, explanation = rest.split(" ~ ")
-
     # get entry
     entry = ""
     if "|" in answer:
@@ -107,45 +135,129 @@ def _parse_clue(item):
     }
 
 
-def _parse_clues(data, grid, words):
+def _split_list(value):
+    """Return a list from a list or a semicolon-separated string."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return value.split(";")
+    return [str(item) for item in value]
+
+
+def _parse_clue_dict(item):
+    """Parse a clue from a dict, as accepted by puzzle.Clue."""
+    answers = _split_list(item.get("answer") or item.get("answers"))
+    entries = _split_list(item.get("entry") or item.get("entries"))
+    explanations = _split_list(
+        item.get("solution")
+        or item.get("explanation")
+        or item.get("solutions")
+        or item.get("explanations"),
+    )
+    answer = ";".join(answers)
+    if entries:
+        answer = f"{answer}|{';'.join(entries)}"
+    return _make_clue(
+        str(item.get("name") or ""),
+        item.get("clue"),
+        answer,
+        ";".join(explanations),
+    )
+
+
+def _parse_clue(item):
+    """Parse a clue."""
+    name, rest = item.split(" ", 1)
+
+    # get the clue, answer and explanation
+    clue, answer, explanation = rest.split(" ~ ")
+
+    return _make_clue(name, clue, answer, explanation)
+
+
+def _parse_clue_block(block):
+    """Parse the clues in a multi-line string."""
+    clues = []
+    for item in block.strip().splitlines():
+        if not item.strip():
+            continue
+        try:
+            clues.append(_parse_clue(item))
+        except ValueError:
+            raise ValueError(f"Invalid clue: {item}") from None
+    return clues
+
+
+def _parse_clue_container(container):
+    """Parse the clues in a container string or list."""
+    if isinstance(container, str):
+        return _parse_clue_block(container)
+    clues = []
+    for item in container or []:
+        if isinstance(item, dict):
+            clues.append(_parse_clue_dict(item))
+        else:
+            clues.append(_parse_clue(str(item)))
+    return clues
+
+
+def _claim_slot(words, entry, direction):
+    """Return the key of the next unclaimed slot for an entry, or None."""
+    keys = words.get(entry)
+    if not keys:
+        return None
+    # prefer a slot in the direction named by the clue container
+    for n, key in enumerate(keys):
+        if key[2] == direction:
+            return keys.pop(n)
+    return keys.pop(0)
+
+
+def _parse_clues(data, grid, slots, words):
     """Parse the clues."""
     clues = {}
 
+    # clues are a dict of containers or a list of named groups
+    if isinstance(data, list):
+        data = {group["name"]: group.get("clues") for group in data}
+
+    # slots that have not yet been matched to a clue, by word
+    unclaimed = {word: list(keys) for word, keys in words.items()}
+
     for title, container in data.items():
         clues[title] = []
 
         options = []
         if " ~ " in title:
             options = title.split(" ~ ")[1].split(",")
-
-        # parse the clues from a string
-        if isinstance(container, str):
-            items = container.strip().split("\n")
-            for item in items:
-                clue = _parse_clue(item)
-
-                # identify and label grid words with clue info
-                name = clue["name"]
-                entries = clue["entries"]
-                for entry in entries:
-                    if entry in words:
-                        words[entry]["clue"] = name
-                        words[entry]["clue_container"] = title
-                        # number the grid entry
-                        x = words[entry]["x1"]
-                        y = words[entry]["y1"]
-                        cell = grid[x, y]
-                        number = cell.get("number")
-                        if number and number != name:
-                            print(
-                                f"WARNING: {x}, {y} already numbered {number} ({name})",
-                            )
-                            continue
-                        cell["number"] = name
-                    else:
-                        print(f"WARNING: {entry} not found in grid words")
-
-                clues[title].append(clue)
+        direction = title.split(" ~ ")[0].strip().lower()
+
+        for clue in _parse_clue_container(container):
+
+            # identify and label grid slots with clue info
+            name = clue["name"]
+            entries = clue["entries"]
+            for entry in entries:
+                key = _claim_slot(unclaimed, entry, direction)
+                if key is None:
+                    print(f"WARNING: {entry} not found in grid words")
+                    continue
+                slot = slots[key]
+                slot["clue"] = name
+                slot["clue_container"] = title
+                # number the grid entry
+                x, y = slot["start"]
+                cell = grid[x, y]
+                number = cell.get("number")
+                if number and number != name:
+                    print(
+                        f"WARNING: {x}, {y} already numbered"
+                        f" {number} ({name})",
+                    )
+                    continue
+                cell["number"] = name
+
+            clues[title].append(clue)
 
     return clues
 
@@ -181,12 +293,10 @@ def _parse_grid(data, block=BLOCK, empty=EMPTY):
                 grid[x, y]["style"] = {}
             grid[x, y]["style"][char] = styles.get(char, {})
 
-    # get words from the grid
-    across_words = _get_across_words(rows)
-    down_words = _get_down_words(columns)
-    words = {**across_words, **down_words}
+    # get word slots from the grid
+    slots = {**_get_across_slots(rows), **_get_down_slots(columns)}
 
-    return width, height, grid, words
+    return width, height, grid, slots
 
 
 def _parse_grid_columns(columns, grid):
@@ -238,10 +348,122 @@ def _parse_grid_rows(rows, grid):
         y += 1
 
 
-def read(filename):
+@functools.lru_cache(maxsize=None)
+def _get_cache(directory, max_size):
+    """Return a shared cache instance for a directory."""
+    from hex import __version__
+    return Cache(directory, max_size=max_size, version=__version__)
+
+
+def get_cache():
+    """Return the default cache configured by HEX_CACHE_DIR, or None."""
+    directory = os.environ.get("HEX_CACHE_DIR")
+    if not directory:
+        return None
+    max_size = int(os.environ.get("HEX_CACHE_SIZE", MAX_SIZE))
+    return _get_cache(directory, max_size)
+
+
+def _read(filename, kind, parse, cache=None):
+    """Read a file and return the parsed data, using the cache if enabled."""
+    with open(filename, "rb") as f:
+        content = f.read()
+    if cache is None:
+        cache = get_cache()
+    if not cache:
+        return parse(content)
+
+    key = cache.key(content, kind)
+    data = cache.get(key)
+    if data is None:
+        data = parse(content)
+        cache.set(key, data)
+    return data
+
+
+def load_yaml(content):
+    """Parse YAML content with the fastest available safe loader."""
+    return yaml.load(content, Loader=SafeLoader)
+
+
+def read(filename, cache=None):
     """Read a .hex file and return a dict."""
-    with open(filename) as f:
-        return load(yaml.safe_load(f))
+    return _read(filename, "hex", lambda c: load(load_yaml(c)), cache)
+
+
+def read_yaml(filename, cache=None):
+    """Read a .hex file and return the raw YAML data."""
+    return _read(filename, "yaml", load_yaml, cache)
+
+
+def _construct_scalar(loader, event):
+    """Return the value of a scalar event, resolved like a full parse."""
+    tag = event.tag
+    if tag is None or tag == "!":
+        tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+    node = yaml.ScalarNode(
+        tag, event.value, event.start_mark, event.end_mark, style=event.style,
+    )
+    return loader.construct_object(node, deep=True)
+
+
+def _skip_node(loader, event):
+    """Consume the events of the node that starts with the given event."""
+    depth = 0
+    while True:
+        if isinstance(event, START_EVENTS):
+            depth += 1
+        elif isinstance(event, END_EVENTS):
+            depth -= 1
+        if depth == 0:
+            return
+        event = loader.get_event()
+
+
+def _scan_header(f, keys):
+    """Return the metadata from a YAML stream, or None to parse it fully."""
+    header = dict.fromkeys(keys)
+    wanted = set(keys)
+    loader = SafeLoader(f)
+    try:
+        event = loader.get_event()
+        while not isinstance(
+            event, (yaml.MappingStartEvent, yaml.StreamEndEvent),
+        ):
+            event = loader.get_event()
+        if isinstance(event, yaml.StreamEndEvent):
+            return header
+
+        # walk the top-level keys and stop once every key has been seen
+        while wanted and not loader.check_event(yaml.MappingEndEvent):
+            event = loader.get_event()
+            key = event.value if isinstance(event, yaml.ScalarEvent) else None
+            _skip_node(loader, event)
+            if key not in wanted:
+                _skip_node(loader, loader.get_event())
+                continue
+            if not loader.check_event(yaml.ScalarEvent):
+                # aliases and collections are left to the full parser
+                return None
+            header[key] = _construct_scalar(loader, loader.get_event())
+            wanted.discard(key)
+        return header
+    finally:
+        loader.dispose()
+
+
+def scan_header(filename, keys=METADATA_KEYS):
+    """Return the metadata of a .hex file without parsing the whole file.
+
+    The YAML event stream is read only until every metadata key has been
+    seen, so the grid and clues are usually never parsed.
+    """
+    with open(filename, "rb") as f:
+        header = _scan_header(f, keys)
+    if header is None:
+        data = read_yaml(filename)
+        header = {key: data.get(key) for key in keys}
+    return header
 
 
 def load(data):
@@ -269,15 +491,17 @@ def load(data):
 
     # parse grid
     grid_data = data.get("grid", {})
-    width, height, grid, words, = _parse_grid(grid_data, block, empty)
+    width, height, grid, slots = _parse_grid(grid_data, block, empty)
+    words = _index_slots(slots)
     puzzle["width"] = width
     puzzle["height"] = height
     puzzle["grid"] = grid
+    puzzle["slots"] = slots
     puzzle["words"] = words
 
     # parse clues
     clues_data = data.get("clues", {})
-    clues = _parse_clues(clues_data, grid, words)
+    clues = _parse_clues(clues_data, grid, slots, words)
     puzzle["clues"] = clues
 
     return puzzle
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import hex
+from hex import Cache
+from hex import get_cache
+from hex import read
+from hex.core import _get_cache
+
+BASIC = os.path.join(
+    os.path.dirname(__file__), os.pardir, os.pardir,
+    "puzzle", "puzzle", "tests", "basic.yaml",
+)
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def _entries(self):
+        return sorted(
+            name for name in os.listdir(self.tmp) if name.endswith(".pickle")
+        )
+
+    def test_hit(self):
+        """Test that a second read comes from the cache."""
+        cache = Cache(self.tmp)
+        data = read(BASIC, cache=cache)
+        self.assertEqual(len(self._entries()), 1)
+        with mock.patch("hex.core.load") as load:
+            self.assertEqual(read(BASIC, cache=cache), data)
+        load.assert_not_called()
+
+    def test_version(self):
+        """Test that a new version misses the entries of the old one."""
+        read(BASIC, cache=Cache(self.tmp, version="1"))
+        read(BASIC, cache=Cache(self.tmp, version="1"))
+        self.assertEqual(len(self._entries()), 1)
+        read(BASIC, cache=Cache(self.tmp, version="2"))
+        self.assertEqual(len(self._entries()), 2)
+
+    def test_get_cache(self):
+        """Test the default cache, keyed on the package version."""
+        _get_cache.cache_clear()
+        self.addCleanup(_get_cache.cache_clear)
+        with mock.patch.dict(os.environ, {"HEX_CACHE_DIR": ""}):
+            self.assertIsNone(get_cache())
+        with mock.patch.dict(os.environ, {"HEX_CACHE_DIR": self.tmp}):
+            cache = get_cache()
+            self.assertIs(get_cache(), cache)
+            self.assertEqual(cache.version, hex.__version__)
+            read(BASIC)
+            with mock.patch("hex.__version__", "999"):
+                _get_cache.cache_clear()
+                self.assertEqual(get_cache().version, "999")
+                read(BASIC)
+        self.assertEqual(len(self._entries()), 2)
+
+    def test_size(self):
+        """Test that the size counts each entry once, even when replaced."""
+        cache = Cache(self.tmp)
+        cache.set("a", "x" * 100)
+        size = cache.size
+        for _ in range(5):
+            cache.set("a", "x" * 100)
+        self.assertEqual(cache.size, size)
+        self.assertEqual(Cache(self.tmp).size, size)
+        cache.clear()
+        self.assertEqual(cache.size, 0)
+        self.assertEqual(self._entries(), [])
+
+    def test_evict(self):
+        """Test that the least recently used entries are evicted."""
+        cache = Cache(self.tmp)
+        cache.set("a", "x" * 1000)
+        cache = Cache(self.tmp, max_size=cache.size * 2 + 10)
+        os.utime(os.path.join(self.tmp, "a.pickle"), (1, 1))
+        cache.set("b", "x" * 1000)
+        os.utime(os.path.join(self.tmp, "b.pickle"), (2, 2))
+
+        # replacing an entry does not push the cache over its limit
+        cache.set("b", "y" * 1000)
+        self.assertEqual(self._entries(), ["a.pickle", "b.pickle"])
+        os.utime(os.path.join(self.tmp, "b.pickle"), (2, 2))
+
+        # reading an entry marks it as recently used
+        self.assertEqual(cache.get("a"), "x" * 1000)
+        cache.set("c", "x" * 1000)
+        self.assertEqual(self._entries(), ["a.pickle", "c.pickle"])
+        self.assertLessEqual(cache.size, cache.max_size)
+        self.assertIsNone(cache.get("b"))
+
+        # entries larger than the cache are not stored
+        cache.set("d", "x" * cache.max_size)
+        self.assertIsNone(cache.get("d"))
+
+    def test_unreadable(self):
+        """Test that an unreadable entry is a miss."""
+        cache = Cache(self.tmp)
+        with open(os.path.join(self.tmp, "a.pickle"), "wb") as f:
+            f.write(b"not a pickle")
+        with self.assertLogs(level="WARNING"):
+            self.assertIsNone(cache.get("a"))
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+import datetime
+import os
+import tempfile
+import unittest
+
+import yaml
+
+from hex import load
+from hex import read
+from hex import scan_header
+
+BASIC = os.path.join(
+    os.path.dirname(__file__), os.pardir, os.pardir,
+    "puzzle", "puzzle", "tests", "basic.yaml",
+)
+
+GRID = {
+    "rows": ["CAT#CAT", "O_____O", "W_____W"],
+    "columns": ["COW", "A__", "T__", "#__", "C__", "A__", "TOW"],
+}
+
+
+class TestLoad(unittest.TestCase):
+
+    def test_read(self):
+        """Test reading a puzzle file."""
+        puzzle = read(BASIC)
+        self.assertEqual(puzzle["metadata"]["title"], "Hello World!")
+        self.assertEqual(puzzle["metadata"]["date"], datetime.date(1970, 1, 1))
+        self.assertEqual(
+            puzzle["width"], len(puzzle["grid"]) // puzzle["height"],
+        )
+        across = puzzle["clues"]["Across"]
+        self.assertEqual(across[0]["name"], "1")
+        self.assertEqual(across[0]["answers"], ["FRENCH BED"])
+        self.assertEqual(across[0]["entries"], ["FRENCHBED"])
+
+    def test_clue_forms(self):
+        """Test that clues may be a string, a list of strings or of dicts."""
+        strings = ["1. First ~ CAT ~ cat", "5. Second ~ CAT|TAC ~ rev."]
+        dicts = [
+            {"name": 1, "clue": "First", "answer": "CAT", "solution": "cat"},
+            {
+                "name": "5",
+                "clue": "Second",
+                "answers": ["CAT"],
+                "entries": "TAC",
+                "explanations": ["rev."],
+            },
+        ]
+        puzzles = [
+            load({"grid": GRID, "clues": {"Across": "\n".join(strings)}}),
+            load({"grid": GRID, "clues": {"Across": strings}}),
+            load({"grid": GRID, "clues": {"Across": dicts}}),
+            load(
+                {"grid": GRID, "clues": [{"name": "Across", "clues": dicts}]},
+            ),
+        ]
+        for puzzle in puzzles:
+            clues = puzzle["clues"]["Across"]
+            self.assertEqual([clue["name"] for clue in clues], ["1", "5"])
+            self.assertEqual(
+                [clue["entries"] for clue in clues], [["CAT"], ["TAC"]],
+            )
+            self.assertEqual(clues[1]["explanations"], ["rev."])
+        self.assertEqual(puzzles[0]["clues"], puzzles[1]["clues"])
+        self.assertEqual(puzzles[2]["clues"], puzzles[3]["clues"])
+
+        with self.assertRaises(ValueError):
+            load({"grid": GRID, "clues": {"Across": "1. No answer"}})
+
+    def test_duplicate_slots(self):
+        """Test that a word in more than one slot gets a clue for each."""
+        clues = {
+            "Across": ["1. Pet ~ CAT ~ cat", "2. Pet again ~ CAT ~ cat"],
+            "Down": ["1. Cattle ~ COW ~ cow", "2. Pull ~ TOW ~ tow"],
+        }
+        puzzle = load({"grid": GRID, "clues": clues})
+        self.assertEqual(
+            puzzle["words"]["CAT"], [(0, 0, "across"), (4, 0, "across")],
+        )
+        self.assertEqual(puzzle["slots"][0, 0, "across"]["clue"], "1")
+        self.assertEqual(puzzle["slots"][4, 0, "across"]["clue"], "2")
+        self.assertEqual(
+            puzzle["slots"][0, 0, "down"]["clue_container"], "Down",
+        )
+        self.assertEqual(puzzle["grid"][4, 0]["number"], "2")
+        self.assertEqual(puzzle["grid"][6, 0]["number"], "2")
+        # the index of the words is not used up by matching the clues
+        self.assertEqual(len(puzzle["words"]["CAT"]), 2)
+
+
+class TestScanHeader(unittest.TestCase):
+
+    def _write(self, text):
+        f = tempfile.NamedTemporaryFile("w", suffix=".yaml", delete=False)
+        self.addCleanup(os.remove, f.name)
+        with f:
+            f.write(text)
+        return f.name
+
+    def test_scan_header(self):
+        """Test reading the metadata without the grid and clues."""
+        header = scan_header(BASIC)
+        with open(BASIC) as f:
+            data = yaml.safe_load(f)
+        self.assertEqual(header, {key: data.get(key) for key in header})
+        self.assertEqual(header["date"], datetime.date(1970, 1, 1))
+        self.assertEqual(header["number"], 42)
+
+    def test_keys(self):
+        """Test reading only some keys, and missing keys."""
+        filename = self._write("title: A\ngrid: {rows: [AB]}\nauthor: B\n")
+        self.assertEqual(
+            scan_header(filename, keys=["author"]), {"author": "B"},
+        )
+        self.assertEqual(
+            scan_header(filename, keys=["title", "issue"]),
+            {"title": "A", "issue": None},
+        )
+        self.assertEqual(
+            scan_header(self._write(""), keys=["title"]), {"title": None},
+        )
+
+    def test_stops_early(self):
+        """Test that the rest of the file is not parsed once keys are seen."""
+        filename = self._write("title: A\nauthor: B\ngrid: [unclosed\n")
+        self.assertEqual(
+            scan_header(filename, keys=["title", "author"]),
+            {"title": "A", "author": "B"},
+        )
+
+    def test_aliases(self):
+        """Test that values that are not plain scalars need a full parse."""
+        filename = self._write("base: &name A\ntitle: *name\nauthor: [B, C]\n")
+        self.assertEqual(
+            scan_header(filename, keys=["title", "author"]),
+            {"title": "A", "author": ["B", "C"]},
+        )
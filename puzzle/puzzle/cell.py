@@ -1,76 +1,58 @@
 # -*- coding: utf-8 -*-
 """Cell class file."""
+import types
 
+# bits of the edge mask computed for each cell by the grid
+TOP_BAR = 1
+RIGHT_BAR = 2
+BOTTOM_BAR = 4
+LEFT_BAR = 8
+TOP_BORDER = 16
+RIGHT_BORDER = 32
+BOTTOM_BORDER = 64
+LEFT_BORDER = 128
 
-class Cell:
-    """Cell class."""
-
-    def __init__(self, row, col, value, grid, name=None):
-        """Initialize the Cell class."""
-        self._value = None
+# bits of the flags stored for each cell by the grid, after the four bar bits
+BLANK = 16
+BLOCK = 32
+EXISTS = 64
 
-        self.col = col
-        self.row = row
-        self.x = col
-        self.y = row
 
-        self.name = name
-        self.value = value
+class Cell:
+    """Cell class.
 
-        # grid
-        self.grid = grid
+    A cell is a lightweight view of one position in the grid, which stores
+    the cell data in flat arrays.
+    """
 
-        # bars
-        self._bottom_bar = False
-        self._left_bar = False
-        self._right_bar = False
-        self._top_bar = False
+    __slots__ = ("grid", "col", "row", "index")
 
-        # styling information
-        self._blank = False
-        self._block = False
-        self.default = None
-        self.styles = {}
+    def __init__(self, grid, row, col):
+        """Initialize the Cell class."""
+        self.grid = grid
+        self.col = col
+        self.row = row
+        self.index = row * grid.width + col
 
     @property
     def blank(self):
         """Return true if this cell is blank."""
-        return self._blank
+        return bool(self.grid.flags[self.index] & BLANK)
 
     @property
     def block(self):
         """Return true if this cell is a block."""
-        return self._block
+        return bool(self.grid.flags[self.index] & BLOCK)
 
     @property
     def bottom_bar(self):
         """Return true if cell has a bottom bar."""
-        if self._bottom_bar:
-            return True
-        if not self.grid.puzzle.show_grid_border:
-            return False
-        try:
-            bottom = self.grid.grid[self.row + 1][self.col]
-            if self.value and not bottom.value:
-                return True
-        except Exception:
-            return False
-        return False
+        return self._edge(BOTTOM_BAR)
 
     @property
     def bottom_border(self):
         """Return true if cell has a bottom border."""
-        if not self.grid.puzzle.show_grid_border:
-            return False
-        if self.row == self.grid.height - 1 and (self.value or self.block):
-            return True
-        try:
-            bottom = self.grid.grid[self.row + 1][self.col]
-            if self.value and not bottom.value:
-                return True
-        except Exception:
-            return False
-        return False
+        return self._edge(BOTTOM_BORDER)
 
     @property
     def circle(self):
@@ -83,83 +65,78 @@ class Cell:
             return self.styles["stroke"]
         return "lightgrey"
 
+    @property
+    def default(self):
+        """Return the default value of this cell."""
+        return self.grid.defaults.get(self.index)
+
+    @default.setter
+    def default(self, default):
+        """Set the default value of this cell."""
+        self.grid.defaults[self.index] = default
+        self._changed()
+
     @property
     def left_bar(self):
         """Return true if cell has a left bar."""
-        if self._left_bar:
-            return True
-        if not self.grid.puzzle.show_grid_border:
-            return False
-        if self.col > 0:
-            try:
-                left = self.grid.grid[self.row][self.col - 1]
-                if bool(self.value) ^ bool(left.value):
-                    return True
-            except Exception:
-                return False
-        return False
+        return self._edge(LEFT_BAR)
 
     @property
     def left_border(self):
         """Return true if cell has a left border."""
-        if not self.grid.puzzle.show_grid_border:
-            return False
-        if self.col == 0 and (self.value or self.block):
-            return True
-        if self.col > 0:
-            try:
-                left = self.grid.grid[self.row][self.col - 1]
-                if self.value and not left.value:
-                    return True
-            except Exception:
-                return False
-        return False
+        return self._edge(LEFT_BORDER)
+
+    @property
+    def name(self):
+        """Return the label of this cell."""
+        return self.grid.names[self.index]
+
+    @name.setter
+    def name(self, name):
+        """Set the label of this cell."""
+        self.grid.names[self.index] = name
+        self._changed()
 
     @property
     def right_bar(self):
         """Return true if cell has a right var."""
-        if self._right_bar:
-            return True
-        if not self.grid.puzzle.show_grid_border:
-            return False
-        try:
-            right = self.grid.grid[self.row][self.col + 1]
-            if bool(self.value) ^ bool(right.value):
-                return True
-        except Exception:
-            return False
-        return False
+        return self._edge(RIGHT_BAR)
 
     @property
     def right_border(self):
         """Return true if cell has a right border."""
-        if not self.grid.puzzle.show_grid_border:
-            return False
-        if self.col == self.grid.width - 1 and (self.value or self.block):
-            return True
-        try:
-            right = self.grid.grid[self.row][self.col + 1]
-            if self.value and not right.value:
-                return True
-        except Exception:
-            return False
-        return False
+        return self._edge(RIGHT_BORDER)
+
+    def _changed(self):
+        """Record a change to the puzzle that this cell belongs to."""
+        if self.grid.puzzle is not None:
+            self.grid.puzzle.invalidate()
+
+    def _edge(self, mask):
+        """Return true if the grid edge mask of this cell has the given bit."""
+        return bool(self.grid.edges[self.index] & mask)
+
+    def _set_flag(self, flag):
+        """Set a flag of this cell in the grid."""
+        self.grid.flags[self.index] |= flag
+        self.grid.invalidate_edges()
+        self._changed()
 
     def set_bottom_bar(self):
         """Set the bottom bar."""
-        self._bottom_bar = True
+        self._set_flag(BOTTOM_BAR)
 
     def set_left_bar(self):
         """Set the left bar."""
-        self._left_bar = True
+        self._set_flag(LEFT_BAR)
 
     def set_right_bar(self):
         """Set the right bar."""
-        self._right_bar = True
+        self._set_flag(RIGHT_BAR)
 
     def set_top_bar(self):
         """Set the top bar."""
-        self._top_bar = True
+        self._set_flag(TOP_BAR)
 
     @property
     def shade_circle(self):
@@ -195,54 +172,58 @@ class Cell:
                 return style
         return None
 
+    @property
+    def styles(self):
+        """Return the read-only styles of this cell; set them to change."""
+        styles = self.grid.cell_styles.get(self.index, {})
+        return types.MappingProxyType(styles)
+
+    @styles.setter
+    def styles(self, styles):
+        """Set the styles of this cell."""
+        self.grid.cell_styles[self.index] = styles
+        self._changed()
+
     @property
     def top_bar(self):
         """Return true if cell has a top bar."""
-        if self._top_bar:
-            return True
-        if not self.grid.puzzle.show_grid_border:
-            return False
-        if self.row > 0:
-            try:
-                top = self.grid.grid[self.row - 1][self.col]
-                if bool(self.value) ^ bool(top.value):
-                    return True
-            except Exception:
-                return False
-        return False
+        return self._edge(TOP_BAR)
 
     @property
     def top_border(self):
         """Return true if cell has a top border."""
-        if not self.grid.puzzle.show_grid_border:
-            return False
-        if self.row == 0 and (self.value or self.block):
-            return True
-        if self.row > 0:
-            try:
-                top = self.grid.grid[self.row - 1][self.col]
-                if self.value and not top.value:
-                    return True
-            except Exception:
-                return False
-        return False
+        return self._edge(TOP_BORDER)
 
     @property
     def value(self):
         """Return the value of this cell."""
-        return self._value
+        return self.grid.values[self.index]
 
     @value.setter
     def value(self, value):
         """Set the value of this cell."""
         # catch blanks
         if value == "_":
-            self._blank = True
+            self._set_flag(BLANK)
         # catch blocks
         elif value == "#":
-            self._block = True
+            self._set_flag(BLOCK)
         # handle periods as spaces
         elif value == ".":
-            self._value = " "
+            self.grid.values[self.index] = " "
+            self.grid.invalidate_edges()
+            self._changed()
         else:
-            self._value = value
+            self.grid.values[self.index] = value
+            self.grid.invalidate_edges()
+            self._changed()
+
+    @property
+    def x(self):
+        """Return the column of this cell."""
+        return self.col
+
+    @property
+    def y(self):
+        """Return the row of this cell."""
+        return self.row
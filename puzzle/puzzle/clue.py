@@ -5,10 +5,38 @@ import re
 
 from puzzle.helpers import wrap_text
 
+# patterns for a "name. clue ~ answers|entries ~ solutions" string, from all
+# parts provided down to the name alone, compiled once
+CLUE_STRING_PATTERNS = [
+    re.compile(
+        r"^(?P<name>[^\.]+)\. (?P<clue>.+) ~ (?P<answer>[- A-Z0-9★;\|]+)"
+        r" ~ (?P<solution>.*)",
+    ),
+    re.compile(
+        r"^(?P<name>[^\.]+)\. (?P<clue>.+) ~ (?P<answer>[- A-Z0-9★;\|]+)",
+    ),
+    re.compile(r"^(?P<name>[^\.]+)\. (?P<clue>.+)"),
+    re.compile(r"^(?P<name>[^\.]+)\."),
+]
+
 
 class Clue:
     """Clue class."""
 
+    __slots__ = (
+        "container",
+        "puzzle",
+        "_name",
+        "_clue",
+        "_answers",
+        "_entries",
+        "_solutions",
+        "_show_enumeration",
+        "_show_grid_entry",
+        "_show_grid_label",
+        "_starred",
+    )
+
     def __init__(self, clue, container):
         """Initialize a Clue instance."""
         # the clues container that this clue belongs to
@@ -141,22 +169,32 @@ class Clue:
     def disable_enumeration(self):
         """Disable enumeration."""
         self._show_enumeration = False
+        self._changed()
 
     def disable_grid_label(self):
         """Disable grid label."""
         self._show_grid_label = False
+        self._changed()
 
     def enable_enumeration(self):
         """Enable enumeration."""
         self._show_enumeration = True
+        self._changed()
 
     def enable_grid_label(self):
         """Enable grid label."""
         self._show_grid_label = True
+        self._changed()
 
     def enable_star(self):
         """Enable star."""
         self._starred = True
+        self._changed()
+
+    def _changed(self):
+        """Record a change to the puzzle that this clue belongs to."""
+        if self.puzzle is not None:
+            self.puzzle.invalidate()
 
     def _from_dict(self, clue):
         """Create a Clue object from a dictionary."""
@@ -207,7 +245,7 @@ class Clue:
         # get parsed clue data
         name = data.get("name")
         clue = data.get("clue")
-        answer = data.get("answer")
+        answer = data.get("answer", "")
         solution = data.get("solution", "")
 
         # parse the answer/entry info
@@ -257,33 +295,7 @@ class Clue:
 
     def _parse_clue_string(self, clue_string) -> dict:
         """Parse a clue string."""
-        name = r"^(?P<name>[^\.]+)\."
-        clue = r"(?P<clue>.+)"
-        ans = r"(?P<answer>[- A-Z0-9★;\|]+)"
-        sol = r"(?P<solution>.*)"
-
-        # all parts are provided
-        results = re.match(f"{name} {clue} ~ {ans} ~ {sol}", clue_string)
-        if results:
-            return results.groupdict()
-
-        # only solution is missing
-        results = re.match(f"{name} {clue} ~ {ans}", clue_string)
-        if results:
-            return results.groupdict()
-
-        # solution and answer are missing
-        results = re.match(f"{name} {clue}", clue_string)
-        if results:
-            return results.groupdict()
-
-        # clue, solution and answer are missing
-        results = re.match(f"{name}", clue_string)
-        if results:
-            return results.groupdict()
-
-        # give up
-        return {}
+        return parse_clue_string(clue_string)
 
     def _parse_solution_string(self, solution_string) -> list:
         """Parse a solution string."""
@@ -361,10 +373,12 @@ class Clue:
         """Set the answers."""
         # TODO: add validation for incoming answers
         self._answers = answers
+        self.container.invalidate()
 
     def set_clue(self, clue):
         """Set the clue."""
         self._clue = clue
+        self._changed()
 
     def set_entries(self, entries):
         """Set the entries."""
@@ -375,6 +389,7 @@ class Clue:
             for n, entry in enumerate(entries):
                 entries[n] = entry[::-1]
         self._entries = entries
+        self.container.invalidate()
 
     def set_name(self, name):
         """Set the name."""
@@ -386,11 +401,13 @@ class Clue:
             self.enable_star()
             name = name[1:]
         self._name = name
+        self._changed()
 
     def set_solutions(self, solutions):
         """Set the solutions."""
         # TODO: add validation for incoming solutions
         self._solutions = solutions
+        self._changed()
 
     @property
     def raw(self):
@@ -444,3 +461,14 @@ class Clue:
             self.puzzle.error(
                 f"Clue does not have a solution: {self.clue}", "clue_format",
             )
+
+
+def parse_clue_string(clue_string) -> dict:
+    """Parse a "name. clue ~ answers|entries ~ solutions" string."""
+    for pattern in CLUE_STRING_PATTERNS:
+        results = pattern.match(clue_string)
+        if results:
+            return results.groupdict()
+
+    # give up
+    return {}
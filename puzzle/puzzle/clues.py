@@ -8,11 +8,25 @@ from puzzle.cluescontainer import CluesContainer
 class Clues:
     """Clues class."""
 
+    __slots__ = (
+        "puzzle",
+        "_clues",
+        "_containers",
+        "_entries",
+        "_entries_versions",
+        "__containers_index",
+    )
+
     def __init__(self, puzzle):
         """Initialize the Clues class."""
         self.puzzle = puzzle
         self._clues = None
         self._containers = None
+
+        # cached index of entries and the container versions it was built from
+        self._entries = None
+        self._entries_versions = None
+
         self._from_dict()
         self.__containers_index = None
 
@@ -33,15 +47,11 @@ class Clues:
     @property
     def entries(self) -> dict:
         """Return a dict of entries used in the puzzle."""
-        entries = {}
-        for container in self._containers:
-            for entry, clue in container.entries.items():
-                if entry in entries:
-                    self.puzzle.error(
-                        f"Duplicate entry: {entry}", "duplicate_entry",
-                    )
-                entries[entry] = clue
-        return entries
+        versions = tuple(container.version for container in self._containers)
+        if self._entries is None or versions != self._entries_versions:
+            self._entries = self._index_entries()
+            self._entries_versions = versions
+        return self._entries
 
     @property
     def solutions(self):
@@ -65,6 +75,22 @@ class Clues:
         self.__containers_index = index + 1
         return self._containers[index]
 
+    def _index_entries(self):
+        """Return a dict of entries and report any duplicates."""
+        entries = {}
+        duplicates = []
+        for container in self._containers:
+            for entry, clue in container.entries.items():
+                if entry in entries:
+                    duplicates.append(entry)
+                entries[entry] = clue
+
+        # replace the duplicates found by any previous index
+        self.puzzle.clear_errors("duplicate_entry")
+        for entry in duplicates:
+            self.puzzle.error(f"Duplicate entry: {entry}", "duplicate_entry")
+        return entries
+
     def _from_dict(self):
         """Create the clues from a puzzle."""
         clues_data = self.puzzle.puzzle.get("clues", {})
@@ -86,6 +112,11 @@ class Clues:
                 )
 
         self._containers = containers
+        self.invalidate()
+
+    def invalidate(self):
+        """Clear the cached entries after the clues change."""
+        self._entries = None
 
     def to_dict(self):
         """Return the clues as a dictionary."""
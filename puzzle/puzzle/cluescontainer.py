@@ -6,11 +6,29 @@ from puzzle.clue import Clue
 class CluesContainer(object):
     """Clues Container class."""
 
+    __slots__ = (
+        "puzzle",
+        "_clues",
+        "_title",
+        "_entries",
+        "_version",
+        "_reverse_grid_entries",
+        "_show_enumerations",
+        "_show_grid_entries",
+        "_show_grid_labels",
+        "__clues_index",
+    )
+
     def __init__(self, title, clues, puzzle, settings={}):
         """Initialize the CluesContainer class."""
+        self.puzzle = puzzle
         self._clues = None
         self._title = None
 
+        # cached index of entries, rebuilt when the clues change
+        self._entries = None
+        self._version = 0
+
         # control default behavior of clues
         self._reverse_grid_entries = False
         self._show_enumerations = None
@@ -30,8 +48,6 @@ class CluesContainer(object):
         # set the clues
         self._clues = clues
 
-        self.puzzle = puzzle
-
         # set the title (check for options in title)
         self._create_title(title)
 
@@ -49,11 +65,13 @@ class CluesContainer(object):
     @property
     def entries(self) -> dict:
         """Return the entries."""
-        entries = {}
-        for clue in self._clues:
-            for entry in clue.entries:
-                entries[entry] = clue
-        return entries
+        if self._entries is None:
+            entries = {}
+            for clue in self._clues:
+                for entry in clue.entries:
+                    entries[entry] = clue
+            self._entries = entries
+        return self._entries
 
     @property
     def has_starred_clues(self):
@@ -87,6 +105,11 @@ class CluesContainer(object):
         """Return the title."""
         return self._title
 
+    @property
+    def version(self):
+        """Return a counter that changes whenever the clues change."""
+        return self._version
+
     def __iter__(self):
         """Initialize a new iterator."""
         self.__clues_index = 0
@@ -108,6 +131,7 @@ class CluesContainer(object):
         for raw_clue in self._parse_clues(raw_clues):
             clues.append(Clue(raw_clue, self))
         self._clues = clues
+        self.invalidate()
         return clues
 
     def _create_title(self, title):
@@ -143,22 +167,34 @@ class CluesContainer(object):
     def disable_enumeration(self):
         """Disable enumeration."""
         self._show_enumerations = False
+        self.invalidate()
 
     def disable_grid_entries(self):
         """Disable grid entries."""
         self._show_grid_entries = False
+        self.invalidate()
 
     def disable_grid_labels(self):
         """Disable grid labels."""
         self._show_grid_labels = False
+        self.invalidate()
 
     def enable_enumeration(self, setting="answers"):
         """Enable enumeration."""
         self._show_enumerations = setting
+        self.invalidate()
 
     def enable_grid_labels(self):
         """Enable grid labels."""
         self._show_grid_labels = True
+        self.invalidate()
+
+    def invalidate(self):
+        """Clear the cached entries and record the change on the puzzle."""
+        self._entries = None
+        self._version += 1
+        if self.puzzle is not None:
+            self.puzzle.invalidate()
 
     def get_options(self):
         """Return the options."""
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""Dictionary class file."""
+import mmap
+import struct
+import unicodedata
+
+MAGIC = b"PUZDAWG1"
+
+# header: magic, number of words, number of edges
+HEADER = struct.Struct("<8sQQ")
+
+# each edge is a 64-bit integer: the index of the first edge of the target
+# node in the low 32 bits, then the label and two flags
+TARGET_MASK = 0xFFFFFFFF
+LABEL_SHIFT = 32
+FINAL = 1 << 40  # a word ends at the target of this edge
+LAST = 1 << 41   # the last edge of its node
+
+# characters that match any letter in a pattern, and any run of letters
+WILDCARDS = "?._"
+ANY = "*"
+
+
+def normalize(word):
+    """Return a word or phrase as it is entered in a grid: A-Z and 0-9 only."""
+    word = unicodedata.normalize("NFKD", word).upper()
+    return "".join(char for char in word if char.isascii() and char.isalnum())
+
+
+class _Node:
+    """A node of the automaton while it is being built."""
+
+    __slots__ = ("edges", "final")
+
+    def __init__(self):
+        """Initialize the _Node class."""
+        self.edges = {}
+        self.final = False
+
+    def key(self):
+        """Return a key that is equal for nodes with the same language."""
+        return (
+            self.final,
+            tuple((label, id(node)) for label, node in self.edges.items()),
+        )
+
+
+def compile_words(words):
+    """Return a minimised automaton of the words, serialised as bytes.
+
+    Words are normalised, sorted and added one at a time; the suffix of
+    the previous word is minimised against a register of equivalent
+    nodes before the next word is added (Daciuk et al., 2000).
+    """
+    words = sorted({normalize(word) for word in words} - {""})
+    root = _Node()
+    register = {}
+    path = [(None, root)]
+
+    def minimise(depth):
+        """Replace the nodes below depth with equivalent registered nodes."""
+        while len(path) > depth + 1:
+            label, node = path.pop()
+            parent = path[-1][1]
+            key = node.key()
+            if key in register:
+                parent.edges[label] = register[key]
+            else:
+                register[key] = node
+
+    previous = ""
+    for word in words:
+        common = 0
+        while (
+            common < min(len(word), len(previous))
+            and word[common] == previous[common]
+        ):
+            common += 1
+        minimise(common)
+        node = path[-1][1]
+        for label in word[common:]:
+            child = _Node()
+            node.edges[label] = child
+            path.append((label, child))
+            node = child
+        node.final = True
+        previous = word
+    minimise(0)
+
+    # lay out the edges of each node contiguously, the root's first
+    offsets = {}
+    order = []
+    stack = [root]
+    size = 1  # edge 0 is unused so that a target of 0 means no edges
+    while stack:
+        node = stack.pop()
+        if id(node) in offsets or not node.edges:
+            continue
+        offsets[id(node)] = size
+        order.append(node)
+        size += len(node.edges)
+        stack.extend(node.edges.values())
+
+    edges = [0] * size
+    for node in order:
+        offset = offsets[id(node)]
+        labels = list(node.edges)
+        for n, label in enumerate(labels):
+            child = node.edges[label]
+            edge = offsets.get(id(child), 0) | (ord(label) << LABEL_SHIFT)
+            if child.final:
+                edge |= FINAL
+            if n == len(labels) - 1:
+                edge |= LAST
+            edges[offset + n] = edge
+
+    header = HEADER.pack(MAGIC, len(words), size)
+    return header + struct.pack(f"<{size}Q", *edges)
+
+
+class Dictionary:
+    """Dictionary class.
+
+    A word list stored as a minimised acyclic automaton (a DAWG) in a
+    flat array of edges, which is read in place from a memory-mapped
+    file so that opening even a very large dictionary is cheap.
+    """
+
+    def __init__(self, filename=None, data=None):
+        """Initialize the Dictionary class."""
+        self._file = None
+        self._mmap = None
+        if filename:
+            self._file = open(filename, "rb")
+            self._mmap = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ,
+            )
+            data = self._mmap
+        elif data is None:
+            raise ValueError("Must provide either a filename or data")
+
+        magic, self.count, size = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"Invalid dictionary: {filename}")
+        end = HEADER.size + size * 8
+        self.edges = memoryview(data)[HEADER.size:end].cast("Q")
+
+    @classmethod
+    def from_words(cls, words):
+        """Return an in-memory dictionary of the given words."""
+        return cls(data=compile_words(words))
+
+    @classmethod
+    def compile(cls, filenames, output):
+        """Compile plain-text word lists, one entry per line, to a file."""
+        words = []
+        for filename in filenames:
+            with open(filename, encoding="utf-8") as f:
+                words.extend(line.strip() for line in f)
+        with open(output, "wb") as f:
+            f.write(compile_words(words))
+        return cls(output)
+
+    def __contains__(self, word):
+        """Return true if the word or phrase is in the dictionary."""
+        word = normalize(word)
+        if not word:
+            return False
+        edge = self._walk(word)
+        return edge is not None and bool(edge & FINAL)
+
+    def __iter__(self):
+        """Yield every word in alphabetical order."""
+        yield from self._words(1, "")
+
+    def __len__(self):
+        """Return the number of words."""
+        return self.count
+
+    def close(self):
+        """Close the memory-mapped file."""
+        self.edges.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+
+    def _find(self, offset, label):
+        """Return the edge with the given label out of a node, or None."""
+        # the root of an empty dictionary has no edges at all
+        if not offset or offset >= len(self.edges):
+            return None
+        edges = self.edges
+        code = ord(label)
+        while True:
+            edge = edges[offset]
+            if (edge >> LABEL_SHIFT) & 0xFF == code:
+                return edge
+            if edge & LAST:
+                return None
+            offset += 1
+
+    def _children(self, offset):
+        """Yield the (label, edge) pairs out of a node."""
+        if not offset or offset >= len(self.edges):
+            return
+        edges = self.edges
+        while True:
+            edge = edges[offset]
+            yield chr((edge >> LABEL_SHIFT) & 0xFF), edge
+            if edge & LAST:
+                return
+            offset += 1
+
+    def _walk(self, word):
+        """Return the edge reached by following a word from the root."""
+        offset = 1
+        edge = None
+        for label in word:
+            edge = self._find(offset, label)
+            if edge is None:
+                return None
+            offset = edge & TARGET_MASK
+        return edge
+
+    def _words(self, offset, prefix):
+        """Yield the words below a node."""
+        for label, edge in self._children(offset):
+            word = prefix + label
+            if edge & FINAL:
+                yield word
+            yield from self._words(edge & TARGET_MASK, word)
+
+    def prefix(self, prefix):
+        """Yield the words that start with a prefix, in alphabetical order."""
+        prefix = normalize(prefix)
+        if not prefix:
+            yield from self
+            return
+        edge = self._walk(prefix)
+        if edge is None:
+            return
+        if edge & FINAL:
+            yield prefix
+        yield from self._words(edge & TARGET_MASK, prefix)
+
+    def match(self, pattern):
+        """Yield the words matching a pattern: ? for a letter, * for a run."""
+        pattern = "".join(
+            char if char in WILDCARDS + ANY else normalize(char)
+            for char in pattern
+        )
+        yield from self._match(1, pattern, self._closure(pattern, {0}), "")
+
+    @staticmethod
+    def _closure(pattern, states):
+        """Return the pattern positions reachable by skipping empty runs."""
+        states = set(states)
+        for state in sorted(states):
+            while state < len(pattern) and pattern[state] == ANY:
+                state += 1
+                states.add(state)
+        return frozenset(states)
+
+    def _match(self, offset, pattern, states, prefix):
+        """Yield the words below a node matching the pattern from positions."""
+        for label, edge in self._children(offset):
+            following = set()
+            for state in states:
+                if state == len(pattern):
+                    continue
+                char = pattern[state]
+                if char == ANY:
+                    following.add(state)
+                elif char in WILDCARDS or char == label:
+                    following.add(state + 1)
+            if not following:
+                continue
+            following = self._closure(pattern, following)
+            word = prefix + label
+            if edge & FINAL and len(pattern) in following:
+                yield word
+            yield from self._match(
+                edge & TARGET_MASK, pattern, following, word,
+            )
@@ -4,7 +4,47 @@
 import logging
 import re
 
+from puzzle.cell import BLOCK
+from puzzle.cell import BOTTOM_BAR
+from puzzle.cell import BOTTOM_BORDER
 from puzzle.cell import Cell
+from puzzle.cell import EXISTS
+from puzzle.cell import LEFT_BAR
+from puzzle.cell import LEFT_BORDER
+from puzzle.cell import RIGHT_BAR
+from puzzle.cell import RIGHT_BORDER
+from puzzle.cell import TOP_BAR
+from puzzle.cell import TOP_BORDER
+
+
+def parse_slots(lines, direction):
+    """Return the slots in the rows or columns of a grid, with entries."""
+    slots = []
+    for b, line in enumerate(lines):
+        a = 0
+        start = None
+        # a trailing bar closes the last word in the line
+        for n, char in enumerate(line + "|"):
+            if char in "|._#":
+                if start is not None and n - start > 1:
+                    x, y = (a - (n - start), b)
+                    if direction == "down":
+                        x, y = y, x
+                    slots.append({
+                        "entry": line[start:n],
+                        "direction": direction,
+                        "x": x,
+                        "y": y,
+                        "length": n - start,
+                    })
+                start = None
+                if char != "|":
+                    a += 1
+                continue
+            if start is None:
+                start = n
+            a += 1
+    return slots
 
 
 class Grid:
@@ -32,6 +72,9 @@ class Grid:
         """Initialize the Grid class."""
         self.puzzle = puzzle
 
+        # bar and border bits for each cell, computed on first use
+        self._edges = None
+
         # get the grid data (rows and columns)
         grid = self.puzzle.puzzle.get("grid", {})
         self.columns = grid["columns"]
@@ -54,25 +97,41 @@ class Grid:
 
         self._styles = grid.get("styles", {})
 
-        # create empty grid
-        self.grid = []
-        for _ in range(self.height):
-            self.grid.append([None] * self.width)
+        # cached slots and the rows and columns they were parsed from
+        self._slots = None
+        self._slots_key = None
 
-        self.solution = []
-        for _ in range(self.height):
-            self.solution.append([None] * self.width)
+        # create empty grid: cell data is stored in flat arrays indexed by
+        # row * width + col, with sparse dicts for defaults and styles
+        size = self.height * self.width
+        self.flags = bytearray(size)
+        self.names = [None] * size
+        self.values = [None] * size
+        self.cell_styles = {}
+        self.defaults = {}
 
         self.create_grid()
         # self.create_grid(solution=True)
 
+    @property
+    def edges(self):
+        """Return the bar and border bits of each cell, by cell index."""
+        if self._edges is None:
+            self._edges = self._compute_edges()
+        return self._edges
+
     @property
     def entries(self):
         """Return the entries from the grid."""
-        across_entries = self._across_entries()
-        down_entries = self._down_entries()
-        entries = across_entries + down_entries
-        return entries
+        return [slot["entry"] for slot in self.slots]
+
+    @property
+    def grid(self):
+        """Return rows of cell views built on demand, None for no cell."""
+        return [
+            [self.cell(row, col) for col in range(self.width)]
+            for row in range(self.height)
+        ]
 
     @property
     def height(self):
@@ -85,6 +144,18 @@ class Grid:
             return self.styles[name]
         return self.default_styles.get(name)
 
+    @property
+    def slots(self):
+        """Return the across and down slots, with their entries."""
+        key = (tuple(self.rows), tuple(self.columns))
+        if self._slots is None or key != self._slots_key:
+            self._slots = (
+                parse_slots(self.rows, "across")
+                + parse_slots(self.columns, "down")
+            )
+            self._slots_key = key
+        return self._slots
+
     @property
     def styles(self):
         """Return the styles."""
@@ -95,6 +166,58 @@ class Grid:
         """Return the width."""
         return len(self.columns)
 
+    def _compute_edges(self):
+        """Compute the bar and border bits of every cell in one pass."""
+        show_grid_border = self.puzzle.show_grid_border
+        flags = self.flags
+        height = self.height
+        width = self.width
+
+        # whether each cell has a value, or None where there is no cell
+        values = [
+            bool(value) if flag & EXISTS else None
+            for flag, value in zip(flags, self.values)
+        ]
+
+        edges = bytearray(len(flags))
+        for index, flag in enumerate(flags):
+            if not flag & EXISTS:
+                continue
+            mask = flag & (TOP_BAR | RIGHT_BAR | BOTTOM_BAR | LEFT_BAR)
+
+            if show_grid_border:
+                y, x = divmod(index, width)
+                value = values[index]
+                top = values[index - width] if y > 0 else None
+                bottom = values[index + width] if y < height - 1 else None
+                left = values[index - 1] if x > 0 else None
+                right = values[index + 1] if x < width - 1 else None
+
+                # bars between cells with and without values
+                if top is not None and value != top:
+                    mask |= TOP_BAR
+                if right is not None and value != right:
+                    mask |= RIGHT_BAR
+                if bottom is not None and value and not bottom:
+                    mask |= BOTTOM_BAR
+                if left is not None and value != left:
+                    mask |= LEFT_BAR
+
+                # borders around the outside of the cells with values, where
+                # a neighbour is False if it is a cell without a value
+                solid = value or flag & BLOCK
+                if (y == 0 and solid) or (value and top is False):
+                    mask |= TOP_BORDER
+                if (x == width - 1 and solid) or (value and right is False):
+                    mask |= RIGHT_BORDER
+                if (y == height - 1 and solid) or (value and bottom is False):
+                    mask |= BOTTOM_BORDER
+                if (x == 0 and solid) or (value and left is False):
+                    mask |= LEFT_BORDER
+
+            edges[index] = mask
+        return edges
+
     def _across_entries(self):
         """Return the across entries."""
         return self._parse_entries(self.rows)
@@ -168,38 +291,29 @@ class Grid:
         #     rows = self.solution_rows
         #     grid = self.solution
 
-        # add labels to the across clues
-        for y, row in enumerate(self.rows):
-            for word in self._parse_entries([row]):
-                if word in self.puzzle.entries:
-                    clue = self.puzzle.entries[word]
-                    x = row.replace("|", "").find(word)
-                    if clue.reverse_grid_entries:
-                        x += len(word) - 1
-                    cell = self.grid[y][x]
-                    if not clue.show_grid_label:
-                        continue
-                    if cell.name and cell.name != clue.label:
-                        self.puzzle.error(
-                            f"Duplicate cell label at {x}, {y}: {cell.name} != {clue.label}", "cell_label",
-                        )
-                    cell.name = clue.label
-        # add labels to the down clues
-        for x, column in enumerate(self.columns):
-            for word in self._parse_entries([column]):
-                if word in self.puzzle.entries:
-                    clue = self.puzzle.entries[word]
-                    y = column.replace("|", "").find(word)
-                    if clue.reverse_grid_entries:
-                        y += len(word) - 1
-                    cell = self.grid[y][x]
-                    if not clue.show_grid_label:
-                        continue
-                    if cell.name and cell.name != clue.label:
-                        self.puzzle.error(
-                            f"Duplicate cell label at {x}, {y}: {cell.name} != {clue.label}", "cell_label",
-                        )
-                    cell.name = clue.label
+        # add labels to the across clues, then the down clues
+        entries = self.puzzle.entries
+        for slot in self.slots:
+            word = slot["entry"]
+            if word not in entries:
+                continue
+            clue = entries[word]
+            x, y = slot["x"], slot["y"]
+            if clue.reverse_grid_entries:
+                if slot["direction"] == "across":
+                    x += len(word) - 1
+                else:
+                    y += len(word) - 1
+            cell = self.cell(y, x)
+            if not clue.show_grid_label:
+                continue
+            if cell.name and cell.name != clue.label:
+                self.puzzle.error(
+                    f"Duplicate cell label at {x}, {y}:"
+                    f" {cell.name} != {clue.label}",
+                    "cell_label",
+                )
+            cell.name = clue.label
 
     def _pad_grid_style(self, solution=False):
         """Pad the grid style with spaces to match the dimensions of the grid."""
@@ -251,7 +365,7 @@ class Grid:
                 value = values[id]
                 x, y = id
                 try:
-                    cell = self.grid[y][x]
+                    cell = self.cell(y, x)
                 except IndexError:
                     self.puzzle.error(
                         f"Cell {id} not found: {value}", "grid_style",
@@ -268,23 +382,42 @@ class Grid:
                     if cell_styles:
                         if cell.styles and cell.styles != cell_styles:
                             logging.warning(
-                                f"Mismatched styles for {x}, {y}: {cell_styles} != {cell.styles}",
+                                f"Mismatched styles for {x}, {y}:"
+                                f" {cell_styles} != {dict(cell.styles)}",
                             )
                         cell.styles = cell_styles
                 elif value != "_":
                     cell.default = value
 
+    def invalidate_edges(self):
+        """Clear the cached bar and border bits after cells change."""
+        self._edges = None
+
+    def cell(self, row, col):
+        """Return a view of the cell at a position, or None."""
+        if not (0 <= row < self.height and 0 <= col < self.width):
+            raise IndexError(f"Cell out of range: {row}-{col}")
+        if not self.flags[row * self.width + col] & EXISTS:
+            return None
+        return Cell(self, row, col)
+
+    def cells(self):
+        """Yield a view of each cell, row by row."""
+        width = self.width
+        for index, flag in enumerate(self.flags):
+            if flag & EXISTS:
+                yield Cell(self, *divmod(index, width))
+
     def create_cell(self, row, col, value, name=None, solution=False):
         """Create a cell."""
-        cell = Cell(row, col, value, self, name)
-        # grid = self.grid
-        # if solution:
-        #     grid = self.solution
-        try:
-            self.grid[row][col] = cell
-        except IndexError:
+        if not (0 <= row < self.height and 0 <= col < self.width):
             error = f"Index error at {row}-{col}: {value}"
             logging.error(error)
+            return None
+        self.flags[row * self.width + col] |= EXISTS
+        cell = Cell(self, row, col)
+        cell.value = value
+        cell.name = name
         return cell
 
     def create_grid(self, solution=False):
@@ -314,7 +447,7 @@ class Grid:
 
                     # create or retreive/update the cell
                     try:
-                        cell = self.grid[y][x]
+                        cell = self.cell(y, x)
                     except Exception as error:
                         logging.error(f"Failed to retrieve cell: {x}, {y}")
                         continue
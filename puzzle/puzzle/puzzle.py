@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 """Puzzle class file."""
+import collections
 import datetime
+import hashlib
+import itertools
+import json
 import logging
 import textwrap
 
@@ -14,6 +18,11 @@ from puzzle.helpers import strip_tags
 from puzzle.helpers import wrap_text
 from puzzle.helpers import yaml_dump
 from puzzle.settings import PuzzleSettings
+from puzzle.wordplay import verify
+
+# change counter shared by all puzzles, so that no two changed puzzles
+# have the same fingerprint
+_VERSIONS = itertools.count(1)
 
 
 class Puzzle:
@@ -39,8 +48,12 @@ class Puzzle:
         "unclued",
     ]
 
-    def __init__(self, puzzle):
-        """Initialize the Puzzle class."""
+    def __init__(self, puzzle, lazy=False):
+        """Initialize the Puzzle class.
+
+        In lazy mode only the metadata is loaded; the clues and grid are
+        built and the puzzle is validated on first use.
+        """
         if not puzzle:
             raise ValueError("Puzzle cannot be empty.")
         if not isinstance(puzzle, dict):
@@ -71,20 +84,26 @@ class Puzzle:
         # puzzle content objects
         self._clues = None
         self._grid = None
+        self._building = False
+        self._input_hash = None
+        self._loaded = False
         self._settings = None
         self._unclued = None
+        self._version = 0
 
         # error handling
         self._errors = {}
+        self._findings = []
 
         # load data a from dictionary to initialize the puzzle object
         self._from_dict()
-        self._validate()
+        if not lazy:
+            self._load()
 
     @property
     def answers(self):
         """Return the answers for all clues in the puzzle."""
-        return self._clues.answers
+        return self.clues.answers
 
     @property
     def author(self):
@@ -94,6 +113,7 @@ class Puzzle:
     @property
     def clues(self):
         """Return the clues."""
+        self._load()
         return self._clues
 
     @property
@@ -104,7 +124,7 @@ class Puzzle:
     @property
     def columns(self):
         """Return the columns of the grid."""
-        return self._grid.columns
+        return self.grid.columns
 
     @property
     def date(self):
@@ -119,7 +139,14 @@ class Puzzle:
     @property
     def entries(self):
         """Return the entries all clues in the puzzle."""
-        return self._clues.entries
+        return self.clues.entries
+
+    def clear_errors(self, type=None):
+        """Remove the errors of the given type, or all errors."""
+        if type is None:
+            self._errors = {}
+        else:
+            self._errors.pop(type, None)
 
     def error(self, error, type=None):
         """Add an error."""
@@ -134,17 +161,42 @@ class Puzzle:
     @property
     def errors(self):
         """Return the errors."""
+        self._load()
         return self._errors
 
+    @property
+    def findings(self):
+        """Return the validation findings as a list of dicts."""
+        self._load()
+        return self._findings
+
+    @property
+    def fingerprint(self):
+        """Return a hash of the input data, settings and changes since."""
+        if self._input_hash is None:
+            content = json.dumps(self.puzzle, sort_keys=True, default=str)
+            self._input_hash = hashlib.sha256(content.encode()).hexdigest()
+        settings = json.dumps(
+            self._settings.to_dict(), sort_keys=True, default=str,
+        )
+        content = f"{self._input_hash}:{settings}:{self._version}"
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def invalidate(self):
+        """Record a change to the puzzle content, for a new fingerprint."""
+        if not self._building:
+            self._version = next(_VERSIONS)
+
     @property
     def grid(self):
         """Return the grid."""
+        self._load()
         return self._grid
 
     @property
     def has_starred_clues(self):
         """Return true if the puzzle includes clues labeled with an asterisk."""
-        for container in self._clues:
+        for container in self.clues.containers:
             if container.has_starred_clues:
                 return True
         return False
@@ -177,7 +229,7 @@ class Puzzle:
     @property
     def rows(self):
         """Return the rows of the grid."""
-        return self._grid.rows
+        return self.grid.rows
 
     @property
     def settings(self):
@@ -222,7 +274,7 @@ class Puzzle:
     @property
     def solutions(self):
         """Return the solutions for all clues in the puzzle."""
-        return self._clues.solutions
+        return self.clues.solutions
 
     @property
     def status(self):
@@ -289,11 +341,31 @@ class Puzzle:
         self._set_instructions(puzzle)
         self._set_solution(puzzle)
 
-        # set puzzle content objects
+        # check puzzle content, which is built by _load
         self._set_clues(puzzle)
         self._set_grid(puzzle)
         self._set_unclued(puzzle)
 
+    def _load(self):
+        """Build the clues and grid and validate the puzzle, once."""
+        if self._loaded:
+            return
+        # mark as loaded first: building the grid reads the clue entries
+        self._loaded = True
+        # building the clues and grid goes through the setters
+        self._building = True
+        try:
+            self._clues = Clues(self)
+            self._grid = Grid(self)
+            self._validate()
+        except Exception:
+            self._clues = None
+            self._grid = None
+            self._loaded = False
+            raise
+        finally:
+            self._building = False
+
     def _set_author(self, puzzle):
         """Set the author."""
         author = puzzle.get("author")
@@ -312,7 +384,6 @@ class Puzzle:
             raise ValueError(
                 f"Clues must be a dict or a list. Received {type(clues)}.",
             )
-        self._clues = Clues(self)
 
     def _set_date(self, puzzle):
         """Set the date."""
@@ -345,7 +416,6 @@ class Puzzle:
             raise ValueError(
                 f"Columns must be a list. Received {type(columns)}.",
             )
-        self._grid = Grid(self)
 
     def _set_instructions(self, puzzle):
         """Set the instructions."""
@@ -421,26 +491,120 @@ class Puzzle:
         self._unclued = unclued
 
     def _validate(self):
-        """Validate the puzzle."""
-        clue_entries = self.entries
-        grid_entries = self._grid.entries
+        """Validate the puzzle and return a list of findings."""
+        # count each entry in the clues and in the grid, with positions
+        clue_entries = collections.Counter()
+        for container in self._clues.containers:
+            for clue in container.clues or []:
+                clue_entries.update(clue.entries)
+        grid_entries = collections.Counter()
+        positions = {}
+        for slot in self._grid.slots:
+            entry = slot["entry"]
+            grid_entries[entry] += 1
+            positions.setdefault(entry, []).append(
+                (slot["x"], slot["y"], slot["direction"]),
+            )
+        unclued = set(self._unclued or [])
 
+        findings = []
         extra_clues = []
         missing_clues = []
-        for entry in clue_entries:
-            if entry not in grid_entries and entry not in self._unclued:
-                extra_clues.append(entry)
-        for entry in grid_entries:
-            if entry not in clue_entries and entry not in self._unclued:
-                missing_clues.append(entry)
+        for entry in sorted(clue_entries.keys() | grid_entries.keys()):
+            if entry in unclued:
+                continue
+            count = clue_entries[entry] - grid_entries[entry]
+            if count > 0:
+                code = "extra_clue"
+                extra_clues.extend([entry] * count)
+            elif count < 0:
+                code = "missing_clue"
+                missing_clues.extend([entry] * -count)
+            else:
+                continue
+            findings.append({
+                "code": code,
+                "entry": entry,
+                "count": abs(count),
+                "positions": positions.get(entry, []),
+            })
 
         if extra_clues:
-            self.error(f"Extra clues: {sorted(extra_clues)}", "extra_clues")
+            self.error(f"Extra clues: {extra_clues}", "extra_clues")
         if missing_clues:
             self.error(
-                f"Missing clues: {sorted(missing_clues)}", "missing_clues",
+                f"Missing clues: {missing_clues}", "missing_clues",
+            )
+
+        self._findings = findings
+        return findings
+
+    def check_words(self, dictionary):
+        """Flag the answers and unclued entries not in a dictionary."""
+        self.clear_errors("unknown_words")
+        self._load()
+        findings = [f for f in self._findings if f["code"] != "unknown_word"]
+
+        positions = {}
+        for slot in self._grid.slots:
+            positions.setdefault(slot["entry"], []).append(
+                (slot["x"], slot["y"], slot["direction"]),
+            )
+
+        unknown = []
+        clued = set()
+        for container in self._clues.containers:
+            for clue in container.clues or []:
+                clued.update(clue.entries)
+                entries = clue.entries or clue.answers
+                for answer, entry in zip(clue.answers, entries):
+                    if answer and answer not in dictionary:
+                        unknown.append((answer, positions.get(entry, [])))
+        for entry in sorted(positions):
+            if entry not in clued and entry not in dictionary:
+                unknown.append((entry, positions[entry]))
+
+        for word, found in unknown:
+            findings.append({
+                "code": "unknown_word",
+                "entry": word,
+                "count": 1,
+                "positions": found,
+            })
+        if unknown:
+            self.error(
+                f"Unknown words: {[word for word, _ in unknown]}",
+                "unknown_words",
             )
 
+        self._findings = findings
+        return [f for f in findings if f["code"] == "unknown_word"]
+
+    def check_wordplay(self):
+        """Flag the solutions whose letter arithmetic does not give answers."""
+        self.clear_errors("wordplay")
+        self._load()
+        findings = [f for f in self._findings if f["code"] != "wordplay"]
+
+        for container in self._clues.containers:
+            for clue in container.clues or []:
+                for answer, solution in zip(clue.answers, clue.solutions):
+                    for message in verify(answer, solution, clue.clue):
+                        self.error(
+                            f"{container.title} {clue.name}: {message}",
+                            "wordplay",
+                        )
+                        findings.append({
+                            "code": "wordplay",
+                            "entry": answer,
+                            "clue": f"{container.title} {clue.name}",
+                            "solution": solution,
+                            "message": message,
+                        })
+
+        self._findings = findings
+        return [f for f in findings if f["code"] == "wordplay"]
+
     def get_setting(self, setting, default=None):
         """Get a setting."""
         return self._settings.get(setting, default)
@@ -479,7 +643,7 @@ class Puzzle:
         print(f"published on {self.date} in \"{self.publication}\"")
 
         # display grid
-        self._grid.display_grid()
+        self.grid.display_grid()
 
         # display optional instructions
         if self.instructions:
@@ -492,7 +656,7 @@ class Puzzle:
 
         # display clues
         print("\n[CLUES]")
-        for container in self._clues:
+        for container in self.clues:
             print(f"\n{container.title}:")
             for clue in container:
                 if clue.clue:
@@ -502,7 +666,7 @@ class Puzzle:
         """Display the solution."""
         print("\n[SOLUTION]")
 
-        self._grid.display_grid(show_answers=True)
+        self.grid.display_grid(show_answers=True)
 
         if self.solution:
             solution = ""
@@ -510,7 +674,7 @@ class Puzzle:
                 solution += "\n".join(textwrap.wrap(paragraph, line_length))
             print(strip_tags(solution))
 
-        for container in self._clues:
+        for container in self.clues:
             output = f"{container.title}:"
             unclued_answers = []
             for clue in container:
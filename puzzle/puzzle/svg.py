@@ -1,16 +1,91 @@
 # -*- coding: utf-8 -*-
 """SVG class file."""
+import collections
 import json
 import os
+import threading
 from xml.dom import minidom
 
 from flask import Flask
 from flask import render_template
 
+from puzzle.svgwriter import CompactSVGWriter
+from puzzle.svgwriter import SVGWriter
+
+
+# upper bound on the total length of cached renders, in characters, not
+# bytes: a rendered SVG is kept as a str, not encoded
+RENDER_CACHE_SIZE = 16 * 1024 * 1024
+
+TEMPLATE_FOLDER = os.path.join(os.path.dirname(__file__), "templates")
+
+_template = None
+
+
+def get_template():
+    """Return the compiled SVG template, loading it on first use."""
+    global _template
+    if _template is None:
+        from jinja2 import Environment, FileSystemLoader
+        env = Environment(
+            loader=FileSystemLoader(TEMPLATE_FOLDER),
+            auto_reload=False,
+        )
+        _template = env.get_template("svg.html")
+    return _template
+
+
+class RenderCache:
+    """Least recently used cache of rendered SVG strings.
+
+    The cache is bounded by the total length of the strings in characters,
+    which max_size and size both count.
+    """
+
+    def __init__(self, max_size=RENDER_CACHE_SIZE):
+        """Initialize the RenderCache class."""
+        self.max_size = max_size
+        self.size = 0  # total length of the cached renders, in characters
+        self._items = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Return the number of cached renders."""
+        return len(self._items)
+
+    def clear(self):
+        """Remove all cached renders."""
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+    def get(self, key):
+        """Return the cached render for a key, or None."""
+        with self._lock:
+            svg = self._items.get(key)
+            if svg is not None:
+                self._items.move_to_end(key)
+            return svg
+
+    def set(self, key, svg):
+        """Cache a render and evict the least recently used ones."""
+        if len(svg) > self.max_size:
+            return
+        with self._lock:
+            if key in self._items:
+                self.size -= len(self._items.pop(key))
+            self._items[key] = svg
+            self.size += len(svg)
+            while self.size > self.max_size:
+                _, old = self._items.popitem(last=False)
+                self.size -= len(old)
+
 
 class SVG:
     """SVG class."""
 
+    cache = RenderCache()
+
     def __init__(self, filename=None, string=None):
         """Initialize an SVG instance."""
         if filename:
@@ -189,11 +264,36 @@ class SVG:
         }
 
     @classmethod
-    def create(cls, puzzle, show_solution=False):
-        """Return an SVG string of the puzzle."""
-        from jinja2 import Environment, FileSystemLoader
-        current_dir = os.path.dirname(__file__)
-        template_folder = f"{current_dir}/templates"
-        env = Environment(loader=FileSystemLoader(template_folder))
-        template = env.get_template("svg.html")
-        return template.render(puzzle=puzzle, show_solution=show_solution)
+    def create(cls, puzzle, show_solution=False, compact=False, ids=False):
+        """Return an SVG string of the puzzle.
+
+        In compact mode bars, borders and bar join caps are merged into
+        paths and element ids are only written when ids is set.
+        """
+        key = (
+            puzzle.fingerprint, bool(show_solution), bool(compact), bool(ids),
+        )
+        svg = cls.cache.get(key)
+        if svg is None:
+            svg = cls.writer(puzzle, show_solution, compact, ids).to_string()
+            cls.cache.set(key, svg)
+        return svg
+
+    @classmethod
+    def render_template(cls, puzzle, show_solution=False):
+        """Return an SVG string of the puzzle rendered from the template."""
+        return get_template().render(
+            puzzle=puzzle, show_solution=show_solution,
+        )
+
+    @classmethod
+    def stream(cls, puzzle, show_solution=False, compact=False, ids=False):
+        """Return a generator of SVG chunks for the puzzle."""
+        return iter(cls.writer(puzzle, show_solution, compact, ids))
+
+    @classmethod
+    def writer(cls, puzzle, show_solution=False, compact=False, ids=False):
+        """Return the SVG writer for a render mode."""
+        if compact:
+            return CompactSVGWriter(puzzle, show_solution, ids=ids)
+        return SVGWriter(puzzle, show_solution)
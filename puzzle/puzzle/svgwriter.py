@@ -0,0 +1,494 @@
+# -*- coding: utf-8 -*-
+"""SVG Writer class file."""
+from puzzle.cell import BOTTOM_BAR
+from puzzle.cell import BOTTOM_BORDER
+from puzzle.cell import LEFT_BAR
+from puzzle.cell import LEFT_BORDER
+from puzzle.cell import RIGHT_BAR
+from puzzle.cell import RIGHT_BORDER
+from puzzle.cell import TOP_BAR
+from puzzle.cell import TOP_BORDER
+
+SIZE = 50
+
+# the markup before the layers, as in the template; a backslash joins lines
+# that the template writes as one
+HEADER = """<?xml version="1.0" standalone="no"?>
+<svg xmlns="http://www.w3.org/2000/svg" id="grid" \
+xmlns:xlink="http://www.w3.org/1999/xlink"
+    data-title="{title}" data-rows="{rows}" data-cols="{cols}"
+    data-size="50" data-creator="HexGrids"
+    height="100%" width="100%" fill="white"
+    viewbox="0 0 {view_width} {view_height}">
+
+  <title>{title}</title>
+  <desc>Created by HexGrids - https://github.com/lukwam/hexgrids</desc>
+  <defs>
+    <circle id="svg-circle" r="21" fill="transparent" stroke-width="4px" />
+    <circle id="svg-shadecircle" r="22" />
+    <rect id="svg-barjoincap" fill="black" height="4" width="4" x="0" y="0" />
+    <rect id="svg-block" height="50" width="50" fill="black" stroke="black" \
+stroke-width="1px" />
+    <rect id="svg-shadesquare" height="50" width="50" stroke="black" \
+stroke-width="1px" />
+    <rect id="svg-square" height="50" width="50" {square_stroke} />
+  </defs>
+
+  <!-- Blanks -->
+  <g id="svg-blanks" />"""
+
+BAR = 'stroke="black" stroke-width="4px"'
+TEXT = 'fill="black" font-family="helvetica"'
+
+# layers in output order: {name: (comment, group attributes)}
+LAYERS = {
+    "squares": ("Squares", 'id="svg-squares"'),
+    "blocks": ("Blocks", 'id="svg-blocks"'),
+    "shadesquares": ("Shade Squares", 'id="svg-shadesquares"'),
+    "shadecircles": ("Shade Circles", 'id="svg-shadecircles"'),
+    "circles": ("Circles", 'id="svg-circles"'),
+    "xs": ("Xs", 'id="svg-xs"'),
+    "acrossbars": ("Across Bars", f'id="svg-acrossbars" {BAR}'),
+    "downbars": ("Down Bars", f'id="svg-downbars" {BAR}'),
+    "barjoincaps": ("Bar Join Caps", 'id="svg-barjoincaps"'),
+    "numbers": (
+        "Numbers/Labels", f'id="svg-numbers" {TEXT} font-size="14px"',
+    ),
+    "defaults": (
+        "Defaults",
+        f'id="svg-defaults" {TEXT} font-size="24px" text-anchor="middle"',
+    ),
+    "answers": (
+        "Answers",
+        f'id="svg-answers" {TEXT} font-size="24px" text-anchor="middle"',
+    ),
+    "border": ("Borders", f'id="svg-border" {BAR}'),
+}
+
+# the layers of cell shapes, which are always written
+SHAPES = ["squares", "blocks", "shadesquares", "shadecircles", "circles", "xs"]
+
+
+class SVGWriter:
+    """SVG Writer class.
+
+    Writes the same markup as templates/svg.html with one pass over the grid
+    cells, yielding the document in chunks so it can be streamed.
+    """
+
+    def __init__(self, puzzle, show_solution=False):
+        """Initialize the SVGWriter class."""
+        self.puzzle = puzzle
+        self.show_solution = show_solution
+
+        show_grid_bars = puzzle.show_grid_bars
+        self.show_bars = show_grid_bars in ["all", "puzzle"] or (
+            show_grid_bars == "solution" and show_solution
+        )
+        self.show_bar_join_caps = (
+            show_grid_bars == "all"
+            or (show_grid_bars == "answers" and show_solution)
+            or (show_grid_bars == "puzzle" and not show_solution)
+        )
+        self.show_border = puzzle.show_grid_border
+
+    def __iter__(self):
+        """Yield the SVG document in chunks."""
+        puzzle = self.puzzle
+        yield HEADER.format(
+            title=puzzle.title,
+            rows=puzzle.height,
+            cols=puzzle.width,
+            view_width=puzzle.width * SIZE + 8,
+            view_height=puzzle.height * SIZE + 8,
+            square_stroke=(
+                'stroke="black" stroke-width="1px"'
+                if puzzle.show_grid_lines else ""
+            ),
+        )
+
+        layers = self._write_layers()
+        for name in SHAPES:
+            yield "\n\n  "
+            yield from self._group(name, layers[name])
+
+        # the whitespace around optional groups matches the template
+        yield "\n\n  "
+        if self.show_bars:
+            yield "\n  "
+            yield from self._group("acrossbars", layers["acrossbars"])
+            yield "\n\n  "
+            yield from self._group("downbars", layers["downbars"])
+            yield "\n  "
+        yield "\n\n  "
+        if self.show_bar_join_caps:
+            yield "\n  "
+            yield from self._group("barjoincaps", layers["barjoincaps"])
+            yield "\n  "
+        for name in ["numbers", "defaults"]:
+            yield "\n\n  "
+            yield from self._group(name, layers[name])
+        yield "\n\n  "
+        if self.show_solution:
+            yield from self._group("answers", layers["answers"])
+        yield "\n\n  "
+        if self.show_border:
+            yield "\n  "
+            yield from self._group("border", layers["border"])
+        yield "\n\n</svg>"
+
+    def _group(self, name, items):
+        """Yield a commented group of layer items."""
+        comment, attributes = LAYERS[name]
+        yield f"<!-- {comment} -->\n  <g {attributes}>"
+        yield "".join(items)
+        yield "\n  </g>"
+
+    def _write_layers(self):
+        """Return the markup of every layer from one pass over the cells."""
+        layers = {name: [] for name in LAYERS}
+        squares = layers["squares"]
+        blocks = layers["blocks"]
+        shadesquares = layers["shadesquares"]
+        shadecircles = layers["shadecircles"]
+        circles = layers["circles"]
+        xs = layers["xs"]
+        acrossbars = layers["acrossbars"]
+        downbars = layers["downbars"]
+        barjoincaps = layers["barjoincaps"]
+        numbers = layers["numbers"]
+        defaults = layers["defaults"]
+        answers = layers["answers"]
+        border = layers["border"]
+
+        edges = self.puzzle.grid.edges
+        for cell in self.puzzle.grid.cells():
+            r = cell.row
+            c = cell.col
+            x = c * SIZE
+            y = r * SIZE
+            data = f'data-col="{c}" data-row="{r}"'
+            mask = edges[cell.index]
+
+            value = cell.value
+            if value:
+                squares.append(
+                    f'\n    <use id="svg-square-{r}-{c}"'
+                    f' xlink:href="#svg-square" fill="white" {data}'
+                    f' x="{x + 4}" y="{y + 4}" />',
+                )
+            if cell.block:
+                blocks.append(
+                    f'\n    <use id="svg-block-{r}-{c}"'
+                    f' xlink:href="#svg-block" {data}'
+                    f' x="{x + 4}" y="{y + 4}" />',
+                )
+            if cell.styles:
+                shade_square = cell.shade_square
+                if shade_square:
+                    shadesquares.append(
+                        f'\n    <use id="svg-shadesquare-{r}-{c}"'
+                        ' xlink:href="#svg-shadesquare"'
+                        f' fill="{shade_square}" {data}'
+                        f' x="{x + 4}" y="{y + 4}" />',
+                    )
+                shade_circle = cell.shade_circle
+                if shade_circle:
+                    shadecircles.append(
+                        f'\n    <use id="svg-shadecircle-{r}-{c}"'
+                        ' xlink:href="#svg-shadecircle"'
+                        f' fill="{shade_circle}" {data}'
+                        f' x="{x + 29}" y="{y + 29}" />',
+                    )
+                circle = cell.circle
+                if circle:
+                    circles.append(
+                        f'\n    <use id="svg-circle-{r}-{c}"'
+                        f' xlink:href="#svg-circle" stroke="{circle}" {data}'
+                        f' x="{x + 29}" y="{y + 29}" />',
+                    )
+                shade_x = cell.shade_x
+                if shade_x:
+                    xs.append(
+                        f'\n    <line id="svg-x-{r}-{c}" stroke="{shade_x}"'
+                        f' stroke-width="4px" {data} x1="{x + 8}"'
+                        f' y1="{y + 8}" x2="{x + 50}" y2="{y + 50}" />'
+                        f'\n    <line id="svg-x-{r}-{c}" stroke="{shade_x}"'
+                        f' stroke-width="4px" {data} x1="{x + 50}"'
+                        f' y1="{y + 8}" x2="{x + 8}" y2="{y + 50}" />',
+                    )
+
+            if mask & RIGHT_BAR and not mask & RIGHT_BORDER:
+                acrossbars.append(
+                    f'\n    <line id="svg-acrossbar-{r}-{c}" {data}'
+                    f' x1="{x + 54}" y1="{y + 4}"'
+                    f' x2="{x + 54}" y2="{y + 54}" />',
+                )
+            if mask & BOTTOM_BAR and not mask & BOTTOM_BORDER:
+                downbars.append(
+                    f'\n    <line id="svg-downbar-{r}-{c}" {data}'
+                    f' x1="{x + 4}" y1="{y + 54}"'
+                    f' x2="{x + 54}" y2="{y + 54}" />',
+                )
+
+            for bars, dx, dy in [
+                (TOP_BAR | LEFT_BAR, 2, 2),
+                (TOP_BAR | RIGHT_BAR, 52, 2),
+                (BOTTOM_BAR | LEFT_BAR, 2, 52),
+                (BOTTOM_BAR | RIGHT_BAR, 52, 52),
+            ]:
+                if mask & bars == bars:
+                    barjoincaps.append(
+                        f'\n    <use id="svg-barjoincap-{r}-{c}"'
+                        f' xlink:href="#svg-barjoincap" {data}'
+                        f' x="{x + dx}" y="{y + dy}" />',
+                    )
+
+            if cell.name:
+                numbers.append(
+                    f'\n    <text id="svg-number-{r}-{c}" {data} x="{x + 8}"'
+                    f' y="{y + 19}">{cell.name}</text>',
+                )
+            if cell.default:
+                defaults.append(
+                    f'\n    <text id="svg-default-{r}-{c}" {data}'
+                    f' x="{x + 29}" y="{y + 29}"'
+                    f' dominant-baseline="central">{cell.default}</text>',
+                )
+            if value:
+                answers.append(
+                    f'\n    <text id="svg-answer-{r}-{c}" {data}'
+                    f' x="{x + 29}" y="{y + 29}"'
+                    f' dominant-baseline="central">{value}</text>',
+                )
+
+            if mask & TOP_BORDER:
+                border.append(
+                    f'\n    <line id="svg-topborder-{r}-{c}" {data}'
+                    f' x1="{x + 2}" y1="{y + 4}"'
+                    f' x2="{x + 56}" y2="{y + 4}" />',
+                )
+            if mask & LEFT_BORDER:
+                border.append(
+                    f'\n    <line id="svg-leftborder-{r}-{c}" {data}'
+                    f' x1="{x + 4}" y1="{y + 2}"'
+                    f' x2="{x + 4}" y2="{y + 56}" />',
+                )
+            if mask & RIGHT_BORDER:
+                border.append(
+                    f'\n    <line id="svg-rightborder-{r}-{c}" {data}'
+                    f' x1="{x + 54}" y1="{y + 2}"'
+                    f' x2="{x + 54}" y2="{y + 56}" />',
+                )
+            if mask & BOTTOM_BORDER:
+                border.append(
+                    f'\n    <line id="svg-bottomborder-{r}-{c}" {data}'
+                    f' x1="{x + 2}" y1="{y + 54}"'
+                    f' x2="{x + 56}" y2="{y + 54}" />',
+                )
+        return layers
+
+    def to_string(self):
+        """Return the whole SVG document as a string."""
+        return "".join(self)
+
+
+def merge_segments(segments):
+    """Return collinear segments merged into sorted (line, start, end).
+
+    Segments are (line, start, end) tuples on the same axis; overlapping or
+    touching segments on the same line are joined.
+    """
+    merged = []
+    for line, start, end in sorted(segments):
+        if merged and merged[-1][0] == line and start <= merged[-1][2]:
+            if end > merged[-1][2]:
+                merged[-1] = (line, merged[-1][1], end)
+            continue
+        merged.append((line, start, end))
+    return merged
+
+
+def segments_path(vertical, horizontal):
+    """Return SVG path data for merged vertical and horizontal segments."""
+    data = [f"M{x} {y1}V{y2}" for x, y1, y2 in merge_segments(vertical)]
+    data += [f"M{x1} {y}H{x2}" for y, x1, x2 in merge_segments(horizontal)]
+    return "".join(data)
+
+
+class CompactSVGWriter(SVGWriter):
+    """Compact SVG Writer class.
+
+    Writes the same drawing as SVGWriter with less markup: bars, borders and
+    bar join caps are merged into a few paths and per-element ids and data
+    attributes are left out unless ids is set.
+    """
+
+    def __init__(self, puzzle, show_solution=False, ids=False):
+        """Initialize the CompactSVGWriter class."""
+        super().__init__(puzzle, show_solution)
+        self.ids = ids
+
+    def __iter__(self):
+        """Yield the compact SVG document in chunks."""
+        puzzle = self.puzzle
+        yield HEADER.format(
+            title=puzzle.title,
+            rows=puzzle.height,
+            cols=puzzle.width,
+            view_width=puzzle.width * SIZE + 8,
+            view_height=puzzle.height * SIZE + 8,
+            square_stroke=(
+                'stroke="black" stroke-width="1px"'
+                if puzzle.show_grid_lines else ""
+            ),
+        )
+
+        layers = self._write_layers()
+        names = list(SHAPES)
+        if self.show_bars:
+            names += ["acrossbars", "downbars"]
+        if self.show_bar_join_caps:
+            names.append("barjoincaps")
+        names += ["numbers", "defaults"]
+        if self.show_solution:
+            names.append("answers")
+        if self.show_border:
+            names.append("border")
+
+        for name in names:
+            items = layers[name]
+            if not items:
+                continue
+            _, attributes = LAYERS[name]
+            yield f"\n<g {attributes}>{''.join(items)}</g>"
+        yield "\n</svg>"
+
+    def _attributes(self, name, r, c):
+        """Return the id and data attributes of an element, if enabled."""
+        if not self.ids:
+            return ""
+        return f' id="svg-{name}-{r}-{c}" data-col="{c}" data-row="{r}"'
+
+    def _write_layers(self):
+        """Return the compact markup of every layer in one pass."""
+        layers = {name: [] for name in LAYERS}
+        attributes = self._attributes
+
+        across = []
+        down = []
+        border_vertical = []
+        border_horizontal = []
+        # neighbouring cells can share a join cap, so keep each one once
+        caps = {}
+
+        edges = self.puzzle.grid.edges
+        for cell in self.puzzle.grid.cells():
+            r = cell.row
+            c = cell.col
+            x = c * SIZE
+            y = r * SIZE
+            mask = edges[cell.index]
+
+            value = cell.value
+            if value:
+                layers["squares"].append(
+                    f'<use{attributes("square", r, c)}'
+                    ' xlink:href="#svg-square" fill="white"'
+                    f' x="{x + 4}" y="{y + 4}"/>',
+                )
+            if cell.block:
+                layers["blocks"].append(
+                    f'<use{attributes("block", r, c)} xlink:href="#svg-block"'
+                    f' x="{x + 4}" y="{y + 4}"/>',
+                )
+            if cell.styles:
+                shade_square = cell.shade_square
+                if shade_square:
+                    layers["shadesquares"].append(
+                        f'<use{attributes("shadesquare", r, c)}'
+                        ' xlink:href="#svg-shadesquare"'
+                        f' fill="{shade_square}" x="{x + 4}" y="{y + 4}"/>',
+                    )
+                shade_circle = cell.shade_circle
+                if shade_circle:
+                    layers["shadecircles"].append(
+                        f'<use{attributes("shadecircle", r, c)}'
+                        ' xlink:href="#svg-shadecircle"'
+                        f' fill="{shade_circle}" x="{x + 29}" y="{y + 29}"/>',
+                    )
+                circle = cell.circle
+                if circle:
+                    layers["circles"].append(
+                        f'<use{attributes("circle", r, c)}'
+                        f' xlink:href="#svg-circle" stroke="{circle}"'
+                        f' x="{x + 29}" y="{y + 29}"/>',
+                    )
+                shade_x = cell.shade_x
+                if shade_x:
+                    layers["xs"].append(
+                        f'<path{attributes("x", r, c)} stroke="{shade_x}"'
+                        ' stroke-width="4px"'
+                        f' d="M{x + 8} {y + 8}L{x + 50} {y + 50}'
+                        f'M{x + 50} {y + 8}L{x + 8} {y + 50}"/>',
+                    )
+
+            if mask & RIGHT_BAR and not mask & RIGHT_BORDER:
+                across.append((x + 54, y + 4, y + 54))
+            if mask & BOTTOM_BAR and not mask & BOTTOM_BORDER:
+                down.append((y + 54, x + 4, x + 54))
+
+            for bars, dx, dy in [
+                (TOP_BAR | LEFT_BAR, 2, 2),
+                (TOP_BAR | RIGHT_BAR, 52, 2),
+                (BOTTOM_BAR | LEFT_BAR, 2, 52),
+                (BOTTOM_BAR | RIGHT_BAR, 52, 52),
+            ]:
+                if mask & bars == bars:
+                    caps[f"M{x + dx} {y + dy}h4v4h-4z"] = True
+
+            if cell.name:
+                layers["numbers"].append(
+                    f'<text{attributes("number", r, c)} x="{x + 8}"'
+                    f' y="{y + 19}">{cell.name}</text>',
+                )
+            if cell.default:
+                layers["defaults"].append(
+                    f'<text{attributes("default", r, c)}'
+                    f' x="{x + 29}" y="{y + 29}"'
+                    f' dominant-baseline="central">{cell.default}</text>',
+                )
+            if value:
+                layers["answers"].append(
+                    f'<text{attributes("answer", r, c)}'
+                    f' x="{x + 29}" y="{y + 29}"'
+                    f' dominant-baseline="central">{value}</text>',
+                )
+
+            if mask & TOP_BORDER:
+                border_horizontal.append((y + 4, x + 2, x + 56))
+            if mask & LEFT_BORDER:
+                border_vertical.append((x + 4, y + 2, y + 56))
+            if mask & RIGHT_BORDER:
+                border_vertical.append((x + 54, y + 2, y + 56))
+            if mask & BOTTOM_BORDER:
+                border_horizontal.append((y + 54, x + 2, x + 56))
+
+        if across:
+            layers["acrossbars"].append(
+                f'<path fill="none" d="{segments_path(across, [])}"/>',
+            )
+        if down:
+            layers["downbars"].append(
+                f'<path fill="none" d="{segments_path([], down)}"/>',
+            )
+        if caps:
+            layers["barjoincaps"].append(
+                f'<path fill="black" d="{"".join(caps)}"/>',
+            )
+        if border_vertical or border_horizontal:
+            layers["border"].append(
+                '<path fill="none"'
+                f' d="{segments_path(border_vertical, border_horizontal)}"/>',
+            )
+        return layers
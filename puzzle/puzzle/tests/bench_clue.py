@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the clue string parser against the original per-call regexes.
+
+Run with: python -m puzzle.tests.bench_clue
+"""
+import random
+import re
+import timeit
+
+from puzzle.clue import parse_clue_string
+
+FUZZ_ALPHABET = "AB19 ~~~..|;-★\nab"
+
+TYPICAL = [
+    "1. Europeans plot practical joke ~ FRENCH BED ~ FRENCH BED",
+    "4. Attila gets set back in quest ~ HUNT UP ~ HUNT UP (hun + put rev.)",
+    "9. Mixed ~ tilde ~ clue ~ ANSWER|REWSNA ~ explanation",
+    "12. A clue without an answer",
+]
+
+
+def legacy_parse_clue_string(clue_string) -> dict:
+    """Parse a clue string with the original four regular expressions."""
+    name = r"^(?P<name>[^\.]+)\."
+    clue = r"(?P<clue>.+)"
+    ans = r"(?P<answer>[- A-Z0-9★;\|]+)"
+    sol = r"(?P<solution>.*)"
+
+    for pattern in [
+        f"{name} {clue} ~ {ans} ~ {sol}",
+        f"{name} {clue} ~ {ans}",
+        f"{name} {clue}",
+        f"{name}",
+    ]:
+        results = re.match(pattern, clue_string)
+        if results:
+            return results.groupdict()
+    return {}
+
+
+def fuzz_strings(count, seed=0, length=24):
+    """Yield random clue-like strings built from an alphabet of separators."""
+    rand = random.Random(seed)
+    for _ in range(count):
+        size = rand.randint(0, length)
+        body = "".join(rand.choice(FUZZ_ALPHABET) for _ in range(size))
+        name = rand.choice(["", "1", "1a", "*2|b"])
+        yield name + rand.choice(["", ".", ". "]) + body
+
+
+def worst_case(size):
+    """Return a clue string with many tildes and no valid answer."""
+    return "1. " + "a ~ " * size + "a"
+
+
+def timed(parser, clue_string, number=5):
+    """Return the best time in seconds to parse a clue string."""
+    return min(
+        timeit.repeat(lambda: parser(clue_string), number=1, repeat=number),
+    )
+
+
+def check_linear():
+    """Check that parse time grows linearly with the number of tildes."""
+    small = timed(parse_clue_string, worst_case(1000))
+    large = timed(parse_clue_string, worst_case(16000))
+    print(f"\n16x the tildes: {large / small:.1f}x the time")
+    assert large / small < 16 * 4
+
+
+def main():
+    """Print parse times for typical and growing worst-case clue strings."""
+    number = 100000
+    for clue_string in TYPICAL:
+        legacy = timeit.timeit(
+            lambda: legacy_parse_clue_string(clue_string), number=number,
+        )
+        parser = timeit.timeit(
+            lambda: parse_clue_string(clue_string), number=number,
+        )
+        print(f"{legacy:.3f}s {parser:.3f}s  {number} x {clue_string!r}")
+
+    print(f"\n{'size':>8} {'legacy':>12} {'parser':>12}")
+    for size in [250, 500, 1000, 2000, 4000]:
+        clue_string = worst_case(size)
+        legacy = timed(legacy_parse_clue_string, clue_string, number=1)
+        parser = timed(parse_clue_string, clue_string)
+        print(f"{size:>8} {legacy:>12.6f} {parser:>12.6f}")
+    check_linear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the slotted model classes against dict-based equivalents.
+
+Run with: python -m puzzle.tests.bench_models
+"""
+import os
+import timeit
+import tracemalloc
+
+import yaml
+
+from puzzle import Puzzle
+from puzzle.cell import Cell
+from puzzle.clue import Clue
+from puzzle.cluescontainer import CluesContainer
+
+BASIC = os.path.join(os.path.dirname(__file__), "basic.yaml")
+
+
+# subclasses without __slots__ get a per-instance __dict__ again
+class DictCell(Cell):
+    """Cell with a per-instance dict."""
+
+
+class DictClue(Clue):
+    """Clue with a per-instance dict."""
+
+
+class DictCluesContainer(CluesContainer):
+    """Clues Container with a per-instance dict."""
+
+
+def load_puzzle():
+    """Return the basic test puzzle."""
+    with open(BASIC) as f:
+        return Puzzle(yaml.safe_load(f))
+
+
+def measure(create, count=2000):
+    """Return the bytes allocated per object and the seconds to create one."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [create() for _ in range(count)]
+    size = (tracemalloc.get_traced_memory()[0] - before) / count
+    tracemalloc.stop()
+    del objects
+    seconds = min(timeit.repeat(create, number=count, repeat=5)) / count
+    return size, seconds
+
+
+def access(obj, names, number=200000):
+    """Return the seconds to read a list of attributes from an object."""
+    def read():
+        for name in names:
+            getattr(obj, name)
+    return min(timeit.repeat(read, number=number, repeat=5)) / number
+
+
+def main():
+    """Print per-object memory, creation time and attribute access time."""
+    puzzle = load_puzzle()
+    grid = puzzle.grid
+    container = puzzle.clues.containers[0]
+    clue = container.clues[0]
+    clue_string = clue.raw
+    clues_string = "\n".join(clue.raw for clue in container.clues)
+
+    cases = [
+        (
+            "Cell",
+            lambda: Cell(grid, 0, 1),
+            lambda: DictCell(grid, 0, 1),
+            ["row", "col", "index", "grid"],
+        ),
+        (
+            "Clue",
+            lambda: Clue(clue_string, container),
+            lambda: DictClue(clue_string, container),
+            ["_name", "_clue", "_answers", "_entries", "_show_grid_label"],
+        ),
+        (
+            "CluesContainer",
+            lambda: CluesContainer(
+                container.title, clues_string, puzzle,
+            ),
+            lambda: DictCluesContainer(
+                container.title, clues_string, puzzle,
+            ),
+            ["_title", "_clues", "_entries", "_version", "puzzle"],
+        ),
+    ]
+
+    print(f"{'class':<16} {'':>8} {'bytes':>8} {'create':>10} {'access':>10}")
+    for name, slotted, unslotted, attributes in cases:
+        for label, create in [("slots", slotted), ("dict", unslotted)]:
+            size, seconds = measure(create)
+            read = access(create(), attributes)
+            print(
+                f"{name:<16} {label:>8} {size:>8.0f} "
+                f"{seconds * 1e6:>8.2f}us {read * 1e9:>8.0f}ns",
+            )
+
+
+if __name__ == "__main__":
+    main()
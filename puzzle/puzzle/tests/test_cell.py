@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import copy
+import os
+import unittest
+
+import yaml
+
+from puzzle import Puzzle
+
+BASIC = os.path.join(os.path.dirname(__file__), "basic.yaml")
+
+
+class TestCell(unittest.TestCase):
+
+    def setUp(self):
+        with open(BASIC) as f:
+            self.data = yaml.safe_load(f)
+
+    def test_bars(self):
+        """Test that bars come from the grid edge masks."""
+        puzzle = Puzzle(copy.deepcopy(self.data))
+        cell = puzzle.grid.grid[0][8]
+        self.assertTrue(cell.right_bar)
+        self.assertFalse(cell.left_bar)
+        self.assertTrue(puzzle.grid.grid[0][9].left_bar)
+        self.assertFalse(cell.top_border)
+
+    def test_borders(self):
+        """Test borders around the outside of the grid."""
+        data = copy.deepcopy(self.data)
+        data["settings"] = {"show_grid_border": True}
+        puzzle = Puzzle(data)
+        cell = puzzle.grid.grid[0][0]
+        self.assertTrue(cell.top_border)
+        self.assertTrue(cell.left_border)
+        self.assertFalse(cell.right_border)
+
+    def test_set_bar_invalidates_edges(self):
+        """Test that setting a bar after the grid is built is visible."""
+        puzzle = Puzzle(copy.deepcopy(self.data))
+        cell = puzzle.grid.grid[0][0]
+        self.assertFalse(cell.bottom_bar)
+        cell.set_bottom_bar()
+        self.assertTrue(cell.bottom_bar)
+
+    def test_styles(self):
+        """Test that cell styles are changed through the setter only."""
+        puzzle = Puzzle(copy.deepcopy(self.data))
+        cell = puzzle.grid.grid[0][0]
+        self.assertEqual(dict(cell.styles), {})
+        with self.assertRaises(TypeError):
+            cell.styles["shape"] = "circle"
+        cell.styles = {"shape": "circle"}
+        self.assertEqual(cell.styles["shape"], "circle")
+        self.assertEqual(cell.circle, "lightgrey")
+        with self.assertRaises(TypeError):
+            cell.styles["fill"] = "red"
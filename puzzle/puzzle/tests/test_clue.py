@@ -1,13 +1,57 @@
 # -*- coding: utf-8 -*-
+import os
 import unittest
 
-from clue import Clue
+import yaml
+
+from puzzle import Puzzle
+from puzzle.clue import Clue
+from puzzle.clue import parse_clue_string
+from puzzle.tests.bench_clue import fuzz_strings
+from puzzle.tests.bench_clue import legacy_parse_clue_string
+
+BASIC = os.path.join(os.path.dirname(__file__), "basic.yaml")
 
 
 class TestClue(unittest.TestCase):
 
+    def setUp(self):
+        with open(BASIC) as f:
+            self.puzzle = Puzzle(yaml.safe_load(f))
+        self.container = self.puzzle.clues.containers[0]
+
     def test_parse_clue_string_full(self):
         """Test parsing a full clue string."""
         clue_string = "1. This is a clue. ~ ANSWER ~ SOLUTION"
-        clue = Clue(clue_string, None)
+        clue = Clue(clue_string, self.container)
         self.assertEqual(clue.name, "1")
+
+    def test_parse_clue_string_parts(self):
+        """Test parsing clue strings with missing parts."""
+        self.assertEqual(
+            parse_clue_string("1a. A ~ B ~ ANSWER|REWSNA ~ x ~ y"),
+            {
+                "name": "1a",
+                "clue": "A ~ B",
+                "answer": "ANSWER|REWSNA",
+                "solution": "x ~ y",
+            },
+        )
+        self.assertEqual(
+            parse_clue_string("2. Clue ~ ANSWER"),
+            {"name": "2", "clue": "Clue", "answer": "ANSWER"},
+        )
+        self.assertEqual(
+            parse_clue_string("3. Clue"), {"name": "3", "clue": "Clue"},
+        )
+        self.assertEqual(parse_clue_string("4."), {"name": "4"})
+        self.assertEqual(parse_clue_string("no name"), {})
+
+    def test_parse_clue_string_fuzz(self):
+        """Test the parser against the original regular expressions."""
+        for clue_string in fuzz_strings(20000):
+            self.assertEqual(
+                parse_clue_string(clue_string),
+                legacy_parse_clue_string(clue_string),
+                clue_string,
+            )
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+import copy
+import os
+import unittest
+
+import yaml
+
+from puzzle import Puzzle
+
+BASIC = os.path.join(os.path.dirname(__file__), "basic.yaml")
+
+
+class TestClues(unittest.TestCase):
+
+    def setUp(self):
+        with open(BASIC) as f:
+            self.data = yaml.safe_load(f)
+
+    def test_entries_cached(self):
+        """Test that the entries index is built once."""
+        puzzle = Puzzle(copy.deepcopy(self.data))
+        self.assertIs(puzzle.clues.entries, puzzle.clues.entries)
+        self.assertEqual(puzzle.clues.entries["FRENCHBED"].name, "1")
+
+    def test_entries_invalidated(self):
+        """Test that changing a clue rebuilds the entries index."""
+        puzzle = Puzzle(copy.deepcopy(self.data))
+        clue = puzzle.clues.entries["DOS"]
+        clue.set_answers(["DOES"])
+        self.assertNotIn("DOS", puzzle.clues.entries)
+        self.assertIs(puzzle.clues.entries["DOES"], clue)
+
+    def test_duplicate_entry_reported_once(self):
+        """Test that a duplicate entry is reported exactly once."""
+        data = copy.deepcopy(self.data)
+        data["clues"]["Down"] += "28. Duplicate ~ DOS ~ DOS\n"
+        puzzle = Puzzle(data)
+        for _ in range(3):
+            puzzle.clues.entries
+        self.assertEqual(
+            puzzle.errors["duplicate_entry"], ["Duplicate entry: DOS"],
+        )
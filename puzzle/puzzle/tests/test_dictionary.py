@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+
+import yaml
+
+from puzzle import Puzzle
+from puzzle.dictionary import Dictionary
+
+BASIC = os.path.join(os.path.dirname(__file__), "basic.yaml")
+
+WORDS = ["ocean", "Oceans", "OCELOT", "ore", "Café au lait", "New York", "tea"]
+
+
+class TestDictionary(unittest.TestCase):
+
+    def test_queries(self):
+        """Test membership, prefix and wildcard queries."""
+        dictionary = Dictionary.from_words(WORDS)
+        self.assertEqual(len(dictionary), 7)
+        self.assertIn("OCEAN", dictionary)
+        self.assertIn("cafe au lait", dictionary)
+        self.assertIn("NEWYORK", dictionary)
+        self.assertNotIn("OCEA", dictionary)
+        self.assertNotIn("", dictionary)
+        self.assertEqual(
+            list(dictionary.prefix("oce")), ["OCEAN", "OCEANS", "OCELOT"],
+        )
+        self.assertEqual(list(dictionary.match("?CE??")), ["OCEAN"])
+        self.assertEqual(
+            list(dictionary.match("O*")), ["OCEAN", "OCEANS", "OCELOT", "ORE"],
+        )
+        self.assertEqual(
+            list(dictionary.match("*E*A*")),
+            ["CAFEAULAIT", "OCEAN", "OCEANS", "TEA"],
+        )
+        self.assertEqual(list(dictionary), sorted(list(dictionary)))
+
+        empty = Dictionary.from_words(["", "  "])
+        self.assertEqual(len(empty), 0)
+        self.assertNotIn("X", empty)
+        self.assertEqual(list(empty), [])
+        self.assertEqual(list(empty.prefix("X")), [])
+        self.assertEqual(list(empty.match("?")), [])
+
+    def test_file(self):
+        """Test compiling word lists to a file and opening it."""
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "words.txt")
+            with open(filename, "w", encoding="utf-8") as f:
+                f.write("\n".join(WORDS) + "\n\n")
+            output = os.path.join(tmp, "words.dawg")
+            Dictionary.compile([filename], output).close()
+            dictionary = Dictionary(output)
+            self.assertEqual(
+                list(dictionary), list(Dictionary.from_words(WORDS)),
+            )
+            dictionary.close()
+
+    def test_check_words(self):
+        """Test flagging answers and unclued entries not in a dictionary."""
+        with open(BASIC) as f:
+            puzzle = Puzzle(yaml.safe_load(f))
+        words = [
+            answer
+            for container in puzzle.clues.containers
+            for clue in container.clues
+            for answer in clue.answers
+        ]
+        words += puzzle.unclued
+        dictionary = Dictionary.from_words(
+            w for w in words if w not in ("DOS", "DOC")
+        )
+        found = puzzle.check_words(dictionary)
+        self.assertEqual([f["entry"] for f in found], ["DOS", "DOC"])
+        self.assertEqual(found[1]["positions"], [(0, 11, "across")])
+        self.assertIn("unknown_words", puzzle.errors)
+
+        # checking again replaces the earlier results
+        self.assertEqual(puzzle.check_words(Dictionary.from_words(words)), [])
+        self.assertNotIn("unknown_words", puzzle.errors)
+        self.assertEqual(puzzle.findings, [])
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import copy
+import os
+import unittest
+
+import yaml
+
+from puzzle import Puzzle
+from puzzle.grid import parse_slots
+
+BASIC = os.path.join(os.path.dirname(__file__), "basic.yaml")
+
+
+class TestGrid(unittest.TestCase):
+
+    def setUp(self):
+        with open(BASIC) as f:
+            self.data = yaml.safe_load(f)
+
+    def test_slots(self):
+        """Test that slots count blocks and blanks but not bars."""
+        puzzle = Puzzle(copy.deepcopy(self.data))
+        slots = puzzle.grid.slots
+        self.assertEqual(len(slots), len(puzzle.grid.entries))
+        self.assertIn(
+            {
+                "entry": "AGATES",
+                "direction": "across",
+                "x": 2,
+                "y": 3,
+                "length": 6,
+            },
+            slots,
+        )
+        self.assertIn(
+            {
+                "entry": "GROUND",
+                "direction": "down",
+                "x": 0,
+                "y": 6,
+                "length": 6,
+            },
+            slots,
+        )
+
+    def test_slots_repeated_entry(self):
+        """Test that a repeated word gets a slot at each position."""
+        slots = parse_slots(["CAT#CAT", "_CAT|CAT"], "across")
+        self.assertEqual(
+            [(slot["x"], slot["y"]) for slot in slots],
+            [(0, 0), (4, 0), (1, 1), (4, 1)],
+        )
+
+    def test_cell_views(self):
+        """Test that cells are views of the grid arrays."""
+        puzzle = Puzzle(copy.deepcopy(self.data))
+        grid = puzzle.grid
+        cell = grid.cell(0, 1)
+        self.assertEqual(cell.value, grid.values[1])
+        cell.name = "9"
+        self.assertEqual(grid.cell(0, 1).name, "9")
+        self.assertEqual(grid.grid[0][1].name, "9")
+        self.assertEqual(
+            len(list(grid.cells())),
+            sum(cell is not None for row in grid.grid for cell in row),
+        )
+        with self.assertRaises(IndexError):
+            grid.cell(grid.height, 0)
+
+    def test_grid_views(self):
+        """Test that the rows of cells are views of the grid arrays."""
+        puzzle = Puzzle(copy.deepcopy(self.data))
+        grid = puzzle.grid
+        rows = grid.grid
+        self.assertEqual(len(rows), grid.height)
+        self.assertEqual({len(row) for row in rows}, {grid.width})
+
+        rows[0][0].styles = {"shape": "circle"}
+        self.assertEqual(grid.grid[0][0].styles["shape"], "circle")
+        self.assertEqual(grid.cell_styles[0], {"shape": "circle"})
@@ -1,6 +1,12 @@
 # -*- coding: utf-8 -*-
+import copy
+import os
 import unittest
 
+import yaml
+
+from puzzle import Puzzle
+
 # from clue import Clue
 
 
@@ -11,3 +17,51 @@ import unittest
 #         clue_string = "1. This is a clue. ~ ANSWER ~ SOLUTION"
 #         clue = Clue(clue_string, None)
 #         self.assertEqual(clue.name, "1")
+
+
+class TestPuzzleValidate(unittest.TestCase):
+
+    def test_findings(self):
+        """Test that validation reports extra and missing clue counts."""
+        with open(os.path.join(os.path.dirname(__file__), "basic.yaml")) as f:
+            data = yaml.safe_load(f)
+        self.assertEqual(Puzzle(copy.deepcopy(data)).findings, [])
+
+        data["unclued"].remove("DOC")
+        data["clues"]["Down"] += "28. Extra ~ ZZZ ~ ZZZ\n"
+        puzzle = Puzzle(data)
+        self.assertEqual(
+            puzzle.findings,
+            [
+                {
+                    "code": "missing_clue",
+                    "entry": "DOC",
+                    "count": 1,
+                    "positions": [(0, 11, "across")],
+                },
+                {
+                    "code": "extra_clue",
+                    "entry": "ZZZ",
+                    "count": 1,
+                    "positions": [],
+                },
+            ],
+        )
+
+
+class TestPuzzleLazy(unittest.TestCase):
+
+    def test_lazy(self):
+        """Test that a lazy puzzle builds its clues and grid on first use."""
+        with open(os.path.join(os.path.dirname(__file__), "basic.yaml")) as f:
+            data = yaml.safe_load(f)
+        eager = Puzzle(copy.deepcopy(data))
+        puzzle = Puzzle(copy.deepcopy(data), lazy=True)
+        self.assertEqual(puzzle.title, eager.title)
+        self.assertEqual(puzzle.date, eager.date)
+        self.assertIsNone(puzzle._clues)
+        self.assertIsNone(puzzle._grid)
+
+        self.assertEqual(puzzle.errors, eager.errors)
+        self.assertIs(puzzle.grid, puzzle.grid)
+        self.assertEqual(puzzle.to_dict(), eager.to_dict())
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+import copy
+import itertools
+import os
+import unittest
+from xml.dom import minidom
+
+import yaml
+
+from puzzle import Puzzle
+from puzzle.svgwriter import CompactSVGWriter
+from puzzle.svgwriter import merge_segments
+from puzzle.svgwriter import SVGWriter
+
+BASIC = os.path.join(os.path.dirname(__file__), "basic.yaml")
+
+try:
+    from puzzle.svg import get_template
+    from puzzle.svg import RenderCache
+    from puzzle.svg import SVG
+except ImportError:
+    get_template = None
+    RenderCache = None
+    SVG = None
+
+
+class TestSVGWriter(unittest.TestCase):
+
+    def setUp(self):
+        with open(BASIC) as f:
+            self.data = yaml.safe_load(f)
+
+    def test_stream(self):
+        """Test that the writer yields a complete document in chunks."""
+        chunks = list(SVGWriter(Puzzle(copy.deepcopy(self.data))))
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(chunks[0].startswith("<?xml"))
+        self.assertTrue(chunks[-1].endswith("</svg>"))
+
+    @unittest.skipIf(
+        get_template is None, "flask and jinja2 are not installed",
+    )
+    def test_matches_template(self):
+        """Test that the writer output matches the template byte for byte."""
+        for bars, border, lines, show_solution in itertools.product(
+            ["all", "puzzle", "solution", False],
+            [True, False],
+            [True, False],
+            [True, False],
+        ):
+            data = copy.deepcopy(self.data)
+            data["settings"] = {
+                "show_grid_bars": bars,
+                "show_grid_border": border,
+                "show_grid_lines": lines,
+            }
+            puzzle = Puzzle(data)
+            self.assertEqual(
+                SVGWriter(puzzle, show_solution).to_string(),
+                get_template().render(
+                    puzzle=puzzle, show_solution=show_solution,
+                ),
+            )
+
+    def test_merge_segments(self):
+        """Test that touching and overlapping segments are merged."""
+        self.assertEqual(
+            merge_segments(
+                [(4, 52, 106), (4, 2, 56), (4, 110, 120), (8, 0, 1)],
+            ),
+            [(4, 2, 106), (4, 110, 120), (8, 0, 1)],
+        )
+
+    def test_compact(self):
+        """Test that compact output merges bars and leaves out ids."""
+        data = copy.deepcopy(self.data)
+        data["settings"] = {"show_grid_bars": "all", "show_grid_border": True}
+        puzzle = Puzzle(data)
+        svg = CompactSVGWriter(puzzle).to_string()
+        minidom.parseString(svg)
+        self.assertNotIn("<line", svg)
+        self.assertNotIn(' id="svg-square-', svg)
+        self.assertEqual(svg.count("<path fill"), 4)
+        self.assertLess(len(svg), len(SVGWriter(puzzle).to_string()) / 2)
+
+        svg = CompactSVGWriter(puzzle, ids=True).to_string()
+        self.assertIn(' id="svg-square-0-0" data-col="0" data-row="0"', svg)
+
+
+@unittest.skipIf(SVG is None, "flask and jinja2 are not installed")
+class TestRenderCache(unittest.TestCase):
+
+    def setUp(self):
+        with open(BASIC) as f:
+            self.data = yaml.safe_load(f)
+        SVG.cache.clear()
+
+    def test_hit(self):
+        """Test that equal puzzles share a cached render."""
+        first = SVG.create(Puzzle(copy.deepcopy(self.data)))
+        second = SVG.create(Puzzle(copy.deepcopy(self.data)))
+        self.assertIs(first, second)
+        self.assertEqual(len(SVG.cache), 1)
+
+    def test_mutation(self):
+        """Test that a change through the puzzle API gives a new render."""
+        puzzle = Puzzle(copy.deepcopy(self.data))
+        before = SVG.create(puzzle)
+        fingerprint = puzzle.fingerprint
+        puzzle.grid.cell(0, 0).set_bottom_bar()
+        self.assertNotEqual(puzzle.fingerprint, fingerprint)
+        after = SVG.create(puzzle)
+        self.assertNotEqual(before, after)
+        self.assertEqual(after, SVGWriter(puzzle).to_string())
+
+        fingerprint = puzzle.fingerprint
+        puzzle.clues.containers[0].clues[0].set_clue("Changed")
+        self.assertNotEqual(puzzle.fingerprint, fingerprint)
+
+    def test_container_options(self):
+        """Test that container title options are part of the key."""
+        data = copy.deepcopy(self.data)
+        data["clues"] = {
+            "Across ~ no-grid-labels": data["clues"]["Across"],
+            "Down": data["clues"]["Down"],
+        }
+        plain = Puzzle(copy.deepcopy(self.data))
+        options = Puzzle(data)
+        self.assertNotEqual(plain.fingerprint, options.fingerprint)
+        SVG.create(plain)
+        SVG.create(options)
+        self.assertEqual(len(SVG.cache), 2)
+
+    def test_size(self):
+        """Test that the cache size counts the characters of the renders."""
+        cache = RenderCache(max_size=5)
+        cache.set("a", "éé")
+        cache.set("b", "ééé")
+        self.assertEqual(cache.size, 5)
+        self.assertEqual(len(cache), 2)
+        cache.set("c", "x")
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.size, 4)
+        cache.set("d", "x" * 6)
+        self.assertIsNone(cache.get("d"))
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import os
+import unittest
+
+import yaml
+
+from puzzle import Puzzle
+from puzzle.wordplay import verify
+
+BASIC = os.path.join(os.path.dirname(__file__), "basic.yaml")
+
+
+class TestWordplay(unittest.TestCase):
+
+    def test_verify(self):
+        """Test checking the letter arithmetic of solutions."""
+        self.assertEqual(verify("AGATES", "AGATES (se[tag]a rev.)"), [])
+        self.assertEqual(
+            verify("NEIGHS", "NEIGHS (ig inside hens, anag.)"), [],
+        )
+        self.assertEqual(verify("BETEL", "BETEL (Beatle anag. without a)"), [])
+        self.assertEqual(verify("PROCTOR", "PROCTOR (pro + ROTC rev.)"), [])
+        self.assertEqual(verify("SILENT", "anagram of listen"), [])
+        self.assertEqual(verify("DEAF", "DEAF (hidden)", "Parade a fault"), [])
+        self.assertEqual(verify("APACHE", "APACHE (homophone)"), [])
+        self.assertEqual(verify("X", "X ( )"), [])
+
+        self.assertEqual(
+            verify("ANCIENT", "AN(CI)ET"),
+            ["Solution AN(CI)ET does not spell ANCIENT"],
+        )
+        self.assertEqual(
+            verify("TAPS", "TAPS (spot rev.)"),
+            ["Wordplay gives TOPS, not TAPS"],
+        )
+        self.assertEqual(
+            verify("BETEL", "BETEL (Beatle anag. without z)"),
+            ["Cannot take Z from ABEELT (anagram)"],
+        )
+        self.assertEqual(
+            verify("OARS", "OARS (hidden)", "Propellers in up roar"),
+            ["OARS is not hidden in the clue"],
+        )
+        self.assertEqual(
+            verify("ENCASE", "ENCASE (anag.)", "Put in casket"),
+            ["No anagram of ENCASE in the clue"],
+        )
+
+    def test_verify_prose(self):
+        """Test that synonyms and prose explanations are not letters."""
+        self.assertEqual(
+            verify("SEA", "SEA (first letters of Sail East Away)"), [],
+        )
+        self.assertEqual(verify("ALE", "ALE (initial letters)"), [])
+        self.assertEqual(verify("BAT", "BAT (two meanings)"), [])
+        self.assertEqual(verify("TEN", "TEN (net in reverse)"), [])
+        self.assertEqual(verify("PIANO", "PIANO (p + i + ano; p = soft)"), [])
+        self.assertEqual(verify("CAT", "CAT (feline)"), [])
+        self.assertEqual(
+            verify("PAN", "PAN (nap rev., double definition)"), [],
+        )
+        self.assertEqual(verify("PAN", "PAN (definition)"), [])
+
+        self.assertEqual(
+            verify("SEA", "SEA (first letters of Sail On Away)"),
+            ["Wordplay gives SOA, not SEA"],
+        )
+        self.assertEqual(
+            verify("TEN", "TEN (tan in reverse)"),
+            ["Wordplay gives NAT, not TEN"],
+        )
+
+    def test_check_wordplay(self):
+        """Test collecting wordplay errors for a puzzle."""
+        with open(BASIC) as f:
+            data = yaml.safe_load(f)
+        self.assertEqual(Puzzle(data).check_wordplay(), [])
+
+        data["clues"]["Down"] = data["clues"]["Down"].replace(
+            "(baby anag.)", "(bayou anag.)",
+        )
+        puzzle = Puzzle(data)
+        findings = puzzle.check_wordplay()
+        self.assertEqual([f["entry"] for f in findings], ["FLABBY"])
+        self.assertEqual(findings[0]["clue"], "Down 1")
+        self.assertEqual(len(puzzle.errors["wordplay"]), 1)
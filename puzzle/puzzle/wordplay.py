@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+"""Wordplay verifier for the letter arithmetic in clue solutions."""
+import collections
+import itertools
+import re
+
+from puzzle.dictionary import normalize
+from puzzle.helpers import strip_tags
+
+# a solution with its explanation in parentheses, e.g. AGATES (se[tag]a rev.)
+EXPLAINED = re.compile(r"^(.*?)\s+\((.*)\)\s*$")
+
+# explanations that have no letter arithmetic to check
+UNCHECKED = re.compile(
+    r"\b((double )?def(inition)?s?|cryptic|homophone|sounds like|spoonerism)\b"
+    r"|&\s*lit",
+    re.IGNORECASE,
+)
+
+# operators, by the words that introduce them
+ANAGRAM = {"anag", "anag.", "anagram", "anagrammed"}
+REVERSAL = {"rev", "rev.", "reversed", "reversal", "backwards"}
+INSIDE = {"in", "inside", "into", "within", "entering"}
+AROUND = {"around", "about", "containing", "holding", "outside", "round"}
+DELETION = {"without", "minus", "less", "sans", "losing"}
+HIDDEN = {"hidden", "hid.", "hid"}
+OPERATORS = ANAGRAM | REVERSAL | INSIDE | AROUND | DELETION
+
+
+def _initials(match):
+    """Return the first letters of the words in a match, in capitals."""
+    return "".join(word[0] for word in match.group(1).split()).upper()
+
+
+# prose forms, rewritten to the short notation before parsing
+PROSE = [
+    (re.compile(r"^anagram of (.+)$", re.IGNORECASE), r"\1 anag."),
+    (re.compile(r"^reversal of (.+)$", re.IGNORECASE), r"\1 rev."),
+    (re.compile(r"^(.+) reversed$", re.IGNORECASE), r"\1 rev."),
+    (re.compile(r"^(.+) in reverse$", re.IGNORECASE), r"\1 rev."),
+    (
+        re.compile(r"^(?:first|initial) letters? of (.+)$", re.IGNORECASE),
+        _initials,
+    ),
+    (
+        re.compile(r"^hidden (?:in|within) (.+)$", re.IGNORECASE),
+        r"hidden in \1",
+    ),
+]
+
+# the most candidate strings kept for an ambiguous container or deletion
+MAX_CANDIDATES = 1000
+
+
+class Letters:
+    """Letters class.
+
+    The value of a piece of wordplay: either a set of candidate strings,
+    when the order of the letters is known, or a multiset of letters once
+    an anagram has been applied.
+    """
+
+    __slots__ = ("strings", "bag")
+
+    def __init__(self, strings=None, bag=None):
+        """Initialize the Letters class."""
+        self.strings = strings
+        self.bag = bag
+
+    @classmethod
+    def of(cls, text):
+        """Return the letters of some text."""
+        return cls(strings={normalize(text)})
+
+    def counter(self):
+        """Return the multiset of the letters."""
+        if self.bag is not None:
+            return self.bag
+        return collections.Counter(next(iter(self.strings)))
+
+    def describe(self):
+        """Return the letters as text for an error message."""
+        if self.bag is not None:
+            return "".join(sorted(self.bag.elements())) + " (anagram)"
+        return " or ".join(sorted(self.strings)[:3])
+
+
+def _contains(bag, other):
+    """Return true if a multiset contains another."""
+    return not other - bag
+
+
+def anagram(value):
+    """Return the letters of a value in any order."""
+    return Letters(bag=value.counter())
+
+
+def reverse(value):
+    """Return a value reversed."""
+    if value.bag is not None:
+        return value
+    return Letters(strings={s[::-1] for s in value.strings})
+
+
+def concatenate(values):
+    """Return the values joined in order."""
+    if any(value.bag is not None for value in values):
+        counters = (value.counter() for value in values)
+        return Letters(bag=sum(counters, collections.Counter()))
+    strings = set()
+    choices = [sorted(value.strings) for value in values]
+    for parts in itertools.product(*choices):
+        strings.add("".join(parts))
+        if len(strings) >= MAX_CANDIDATES:
+            break
+    return Letters(strings=strings)
+
+
+def insert(inner, outer):
+    """Return inner placed inside outer."""
+    if inner.bag is not None or outer.bag is not None:
+        return Letters(bag=inner.counter() + outer.counter())
+    strings = set()
+    for a in inner.strings:
+        for b in outer.strings:
+            positions = range(1, len(b)) if len(b) > 1 else range(len(b) + 1)
+            strings.update(b[:n] + a + b[n:] for n in positions)
+    return Letters(strings=set(itertools.islice(strings, MAX_CANDIDATES)))
+
+
+def delete(value, removed):
+    """Return a value with some letters taken out, or None if they are not."""
+    if value.bag is not None or removed.bag is not None:
+        bag = value.counter()
+        other = removed.counter()
+        if not _contains(bag, other):
+            return None
+        return Letters(bag=bag - other)
+    strings = set()
+    for a in value.strings:
+        for b in removed.strings:
+            start = a.find(b)
+            while start != -1:
+                strings.add(a[:start] + a[start + len(b):])
+                start = a.find(b, start + 1)
+    if not strings:
+        return None
+    return Letters(strings=strings)
+
+
+def _fits(value, answer):
+    """Return true if a value spells the answer or a part of it."""
+    if value.bag is not None:
+        return _contains(collections.Counter(answer), value.bag)
+    return any(s in answer for s in value.strings)
+
+
+def _literal(tokens):
+    """Return true if a part of an explanation spells out its letters.
+
+    Parts with an operator, or with fodder in capitals or brackets, are
+    taken letter for letter; a bare lowercase word or phrase is a synonym.
+    """
+    return any(
+        token.lower() in OPERATORS
+        or token != token.lower()
+        or "[" in token
+        or "(" in token
+        for token in tokens
+    )
+
+
+def _fodder(clue, answer):
+    """Return true if consecutive words of a clue are an anagram of answer."""
+    words = [normalize(word) for word in clue.split()]
+    target = collections.Counter(answer)
+    for start in range(len(words)):
+        letters = collections.Counter()
+        for word in words[start:]:
+            letters.update(word)
+            if letters == target:
+                return True
+            if not _contains(target, letters):
+                break
+    return False
+
+
+class Verifier:
+    """Verifier class.
+
+    Checks one solution of a clue against its answer. The explanation
+    is split into steps at commas, each step into a charade at plus signs,
+    and each part into deletions, containers and then anagrams and
+    reversals of its words. Parts with no letters of their own, such as
+    "rev." alone, and bare lowercase words stand for a synonym and are not
+    checked.
+    """
+
+    def __init__(self, answer, solution, clue=""):
+        """Initialize the Verifier class."""
+        self.answer = normalize(answer)
+        self.solution = (solution or "").strip()
+        self.clue = strip_tags(clue or "")
+        self.errors = []
+
+    def error(self, message):
+        """Add an error."""
+        self.errors.append(message)
+
+    def verify(self):
+        """Return a list of errors in the solution."""
+        self.errors = []
+        head, explanation = self.solution, ""
+        match = EXPLAINED.match(self.solution)
+        if match:
+            head, explanation = match.groups()
+        elif self.solution != self.solution.upper():
+            head, explanation = "", self.solution.strip("()")
+
+        # the solution spelled out, e.g. AN(CI)ENT or HO-SPICE
+        if head and normalize(head) != self.answer:
+            self.error(f"Solution {head} does not spell {self.answer}")
+
+        if explanation and not UNCHECKED.search(explanation):
+            self._check(explanation)
+        return self.errors
+
+    def _check(self, explanation):
+        """Check the steps of an explanation."""
+        if not explanation.split():
+            return
+        value = None
+        for step in re.split(r"[,;]", explanation):
+            step = step.strip()
+            for pattern, replacement in PROSE:
+                step = pattern.sub(replacement, step)
+            tokens = step.split()
+            if not tokens or "=" in tokens:
+                # glosses such as "p = soft" have nothing to check
+                continue
+            if tokens[0].lower() in HIDDEN:
+                self._check_hidden(tokens)
+                value = None
+                continue
+            if value is not None and self._base(tokens) is None:
+                # operators alone apply to the previous step
+                value = self._apply_postfix(value, tokens)
+                continue
+            if value is not None:
+                self._check_value(value)
+            value = self._charade(step)
+        if value is not None:
+            self._check_value(value)
+        elif (
+            explanation.split()[0].lower() in ANAGRAM
+            and not _fodder(self.clue, self.answer)
+        ):
+            self.error(f"No anagram of {self.answer} in the clue")
+
+    def _check_hidden(self, tokens):
+        """Check that the answer is hidden in the clue or the given words."""
+        words = [token for token in tokens[1:] if token.lower() not in INSIDE]
+        reversed_ = any(token.lower() in REVERSAL for token in words)
+        words = [token for token in words if token.lower() not in REVERSAL]
+        text = normalize(" ".join(words) if words else self.clue)
+        answer = self.answer[::-1] if reversed_ else self.answer
+        if answer not in text:
+            where = " ".join(words) if words else "the clue"
+            self.error(f"{self.answer} is not hidden in {where}")
+
+    def _check_value(self, value):
+        """Check that the letters of a step spell the answer or a part."""
+        if not _fits(value, self.answer):
+            self.error(f"Wordplay gives {value.describe()}, not {self.answer}")
+
+    def _charade(self, step):
+        """Return the value of a charade, or None if a part is not known."""
+        values = []
+        known = True
+        for part in step.split(" + "):
+            tokens = part.split()
+            value = self._part(tokens) if _literal(tokens) else None
+            if value is None:
+                known = False
+            else:
+                values.append(value)
+        if not known:
+            # check the known parts on their own
+            for value in values:
+                self._check_value(value)
+            return None
+        return concatenate(values) if values else None
+
+    def _part(self, tokens):
+        """Return the value of one part, or None if it is not known."""
+        lowered = [token.lower() for token in tokens]
+        for operators in [DELETION, INSIDE, AROUND]:
+            for n, token in enumerate(lowered):
+                if n and token in operators:
+                    left = self._part(tokens[:n])
+                    right = self._part(tokens[n + 1:])
+                    if left is None or right is None:
+                        return None
+                    if operators is DELETION:
+                        value = delete(left, right)
+                        if value is None:
+                            self.error(
+                                f"Cannot take {right.describe()}"
+                                f" from {left.describe()}",
+                            )
+                        return value
+                    if operators is INSIDE:
+                        return insert(left, right)
+                    return insert(right, left)
+        base = self._base(tokens)
+        if base is None:
+            return None
+        return self._apply_postfix(Letters.of(base), tokens)
+
+    @staticmethod
+    def _base(tokens):
+        """Return the letters of a part before its operators, or None."""
+        words = []
+        for token in tokens:
+            if token.lower() in ANAGRAM or token.lower() in REVERSAL:
+                break
+            words.append(token)
+        letters = normalize(" ".join(words))
+        return letters or None
+
+    @staticmethod
+    def _apply_postfix(value, tokens):
+        """Return a value with the anagrams and reversals in tokens applied."""
+        for token in tokens:
+            token = token.lower()
+            if token in ANAGRAM:
+                value = anagram(value)
+            elif token in REVERSAL:
+                value = reverse(value)
+        return value
+
+
+def verify(answer, solution, clue=""):
+    """Return a list of errors in the wordplay of a solution."""
+    return Verifier(answer, solution, clue).verify()
@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+"""Variety is a Python library for working with cryptic crosswords."""
+
+__title__ = 'variety'
+__version__ = '0.0.1'
+__author__ = 'Lukas Karlsson'
+__email__ = 'lukwam@gmail.com'
+__license__ = 'MIT'
+__copyright__ = 'Copyright 2023 Lukas Karlsson'
+
+from variety.core import find_puzzles, run
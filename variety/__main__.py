@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""Run the variety command line interface."""
+import sys
+
+from variety.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""Anagram index of answers and words keyed by sorted-letter signatures."""
+import array
+import collections
+import mmap
+import struct
+
+from puzzle.dictionary import normalize
+
+DEFAULT_PATH = "anagrams.idx"
+
+MAGIC = b"VANAGRM2"
+
+# header: magic, number of signatures, number of words, number of trie
+# nodes, and the sizes of the signature and word text
+HEADER = struct.Struct("<8sQQQQQ")
+
+
+def signature(word):
+    """Return the sorted letters of a word or phrase."""
+    return "".join(sorted(normalize(word)))
+
+
+def _pad(data):
+    """Return bytes padded to a multiple of four."""
+    return data + b"\0" * (-len(data) % 4)
+
+
+def _trie(signatures):
+    """Return the trie of sorted signatures in preorder.
+
+    Each node is the letter on the edge into it, the node after its
+    subtree, which is its next sibling, and one more than the index of
+    the signature it ends, or 0.
+    """
+    letters = bytearray([0])
+    following = array.array("I", [0])
+    ends = array.array("I", [0])
+    path = [0]
+    previous = b""
+    for n, key in enumerate(signatures):
+        key = key.encode()
+        common = 0
+        while (
+            common < min(len(key), len(previous))
+            and key[common] == previous[common]
+        ):
+            common += 1
+        for node in path[common + 1:]:
+            following[node] = len(letters)
+        del path[common + 1:]
+        for letter in key[common:]:
+            path.append(len(letters))
+            letters.append(letter)
+            following.append(0)
+            ends.append(0)
+        ends[path[-1]] = n + 1
+        previous = key
+    for node in path:
+        following[node] = len(letters)
+    return letters, following, ends
+
+
+def compile_index(words):
+    """Return an anagram index of the words, serialised as bytes.
+
+    Words are grouped by signature and the signatures sorted, so the
+    words of a signature are one slice, and the signatures are stored
+    again as a trie for sub-anagrams.
+    """
+    groups = collections.defaultdict(set)
+    for word in words:
+        word = " ".join(word.upper().split())
+        key = signature(word)
+        if key:
+            groups[key].add(word)
+
+    signatures = sorted(groups)
+    sig_offsets = array.array("I", [0])
+    sig_words = array.array("I", [0])
+    word_offsets = array.array("I", [0])
+    sig_text = bytearray()
+    word_text = bytearray()
+    for key in signatures:
+        sig_text += key.encode()
+        sig_offsets.append(len(sig_text))
+        for word in sorted(groups[key]):
+            word_text += word.encode()
+            word_offsets.append(len(word_text))
+        sig_words.append(len(word_offsets) - 1)
+    letters, following, ends = _trie(signatures)
+
+    return b"".join([
+        HEADER.pack(
+            MAGIC,
+            len(signatures),
+            len(word_offsets) - 1,
+            len(letters),
+            len(sig_text),
+            len(word_text),
+        ),
+        sig_offsets.tobytes(),
+        sig_words.tobytes(),
+        word_offsets.tobytes(),
+        following.tobytes(),
+        ends.tobytes(),
+        _pad(bytes(sig_text)),
+        _pad(bytes(letters)),
+        bytes(word_text),
+    ])
+
+
+class AnagramIndex:
+    """Anagram Index class.
+
+    Reads a compiled index in place from a memory-mapped file. Exact
+    anagrams are one binary search over the sorted signatures; for
+    sub-anagrams the trie of the signatures is walked, following only the
+    letters left in the letter counts of the query.
+    """
+
+    def __init__(self, filename=None, data=None):
+        """Initialize the AnagramIndex class."""
+        self._file = None
+        self._mmap = None
+        if filename:
+            self._file = open(filename, "rb")
+            self._mmap = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ,
+            )
+            data = self._mmap
+        elif data is None:
+            raise ValueError("Must provide either a filename or data")
+
+        (
+            magic, self.signatures, self.count, nodes, sig_size, word_size,
+        ) = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"Invalid anagram index: {filename}")
+        view = memoryview(data)
+        offset = HEADER.size
+        sections = []
+        signatures = self.signatures + 1
+        for length in [signatures, signatures, self.count + 1, nodes, nodes]:
+            sections.append(view[offset:offset + length * 4].cast("I"))
+            offset += length * 4
+        (
+            self._sig_offsets,
+            self._sig_words,
+            self._word_offsets,
+            self._following,
+            self._ends,
+        ) = sections
+        self._sig_text = view[offset:offset + sig_size]
+        offset += sig_size + (-sig_size % 4)
+        self._letters = view[offset:offset + nodes]
+        offset += nodes + (-nodes % 4)
+        self._word_text = view[offset:offset + word_size]
+
+    @classmethod
+    def from_words(cls, words):
+        """Return an in-memory index of the given words."""
+        return cls(data=compile_index(words))
+
+    @classmethod
+    def compile(cls, words, output):
+        """Compile an index of the given words to a file."""
+        with open(output, "wb") as f:
+            f.write(compile_index(words))
+        return cls(output)
+
+    def __len__(self):
+        """Return the number of words."""
+        return self.count
+
+    def close(self):
+        """Close the memory-mapped file."""
+        for view in [
+            self._sig_offsets,
+            self._sig_words,
+            self._word_offsets,
+            self._following,
+            self._ends,
+            self._sig_text,
+            self._letters,
+            self._word_text,
+        ]:
+            view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+
+    def _signature(self, n):
+        """Return signature n as bytes."""
+        offsets = self._sig_offsets
+        return bytes(self._sig_text[offsets[n]:offsets[n + 1]])
+
+    def _words(self, n):
+        """Return the words of signature n."""
+        offsets = self._word_offsets
+        text = self._word_text
+        return [
+            bytes(text[offsets[m]:offsets[m + 1]]).decode()
+            for m in range(self._sig_words[n], self._sig_words[n + 1])
+        ]
+
+    def anagrams(self, letters):
+        """Return the words with exactly the given letters."""
+        key = signature(letters).encode()
+        if not key:
+            return []
+        # binary search over the sorted signatures
+        lo, hi = 0, self.signatures
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._signature(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        n = lo
+        if n < self.signatures and self._signature(n) == key:
+            return self._words(n)
+        return []
+
+    def subanagrams(self, letters, min_length=1):
+        """Return the words made from some of the letters, longest first."""
+        counts = [0] * 256
+        for letter in normalize(letters).encode():
+            counts[letter] += 1
+        found = []
+        self._walk(0, 0, counts, min_length, found)
+        found.sort()
+        return [word for _, word in found]
+
+    def _walk(self, node, depth, counts, min_length, found):
+        """Collect the words in the subtree of a node within the letter counts.
+
+        Words are collected with their negated length, for sorting.
+        """
+        end = self._ends[node]
+        if end and depth >= min_length:
+            found.extend((-depth, word) for word in self._words(end - 1))
+        letters = self._letters
+        following = self._following
+        child = node + 1
+        stop = following[node]
+        while child < stop:
+            letter = letters[child]
+            if counts[letter]:
+                counts[letter] -= 1
+                self._walk(child, depth + 1, counts, min_length, found)
+                counts[letter] += 1
+            child = following[child]
@@ -0,0 +1,675 @@
+# -*- coding: utf-8 -*-
+"""Command line interface for the variety tools."""
+import argparse
+import os
+import sys
+
+import yaml
+
+from hex import read_yaml
+
+from variety.core import find_puzzles
+from variety.core import load_puzzle
+from variety.core import run
+from variety.index import Catalog
+from variety.index import DEFAULT_PATH
+from variety.index import GROUPS
+
+STATS_KEYS = [
+    "width",
+    "height",
+    "containers",
+    "clues",
+    "entries",
+    "unclued",
+    "errors",
+]
+
+
+def _jobs(value):
+    """Return a number of worker processes, where 0 means one per CPU."""
+    try:
+        jobs = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number of jobs: {value!r}")
+    if jobs < 0:
+        raise argparse.ArgumentTypeError(
+            f"number of jobs cannot be negative: {jobs}",
+        )
+    return jobs
+
+
+def _add_common_arguments(parser):
+    """Add the arguments shared by every subcommand."""
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=["puzzles"],
+        help="puzzle files or directories (default: puzzles)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=_jobs,
+        default=0,
+        help="number of worker processes, 0 for one per CPU (default: 0)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=os.environ.get("HEX_CACHE_DIR"),
+        help="cache parsed puzzles in this directory (default: HEX_CACHE_DIR)",
+    )
+
+
+def _add_catalog_argument(parser):
+    """Add the catalog database argument."""
+    parser.add_argument(
+        "--db",
+        default=os.environ.get("VARIETY_CATALOG", DEFAULT_PATH),
+        help=f"catalog database (default: VARIETY_CATALOG or {DEFAULT_PATH})",
+    )
+
+
+def _add_anagrams_argument(parser):
+    """Add the anagram index argument."""
+    parser.add_argument(
+        "--index",
+        default=os.environ.get("VARIETY_ANAGRAMS"),
+        help="anagram index file (default: VARIETY_ANAGRAMS or anagrams.idx)",
+    )
+
+
+def _add_lexicon_argument(parser):
+    """Add the indicator lexicon argument."""
+    parser.add_argument(
+        "--lexicon",
+        default=os.environ.get("VARIETY_LEXICON"),
+        help="indicator lexicon file"
+        " (default: VARIETY_LEXICON or the built-in lexicon)",
+    )
+
+
+def get_parser():
+    """Return the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="variety",
+        description="Tools for working with a corpus of cryptic crosswords.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    validate = subparsers.add_parser("validate", help="validate puzzles")
+    _add_common_arguments(validate)
+    validate.add_argument(
+        "--dictionary",
+        default=os.environ.get("VARIETY_DICTIONARY"),
+        help="flag answers and unclued entries not in this compiled dictionary"
+        " (default: VARIETY_DICTIONARY)",
+    )
+
+    wordplay = subparsers.add_parser(
+        "wordplay", help="check the letter arithmetic in clue solutions",
+    )
+    _add_common_arguments(wordplay)
+
+    hidden = subparsers.add_parser(
+        "hidden", help="find answers hidden in clue surfaces across puzzles",
+    )
+    _add_common_arguments(hidden)
+    hidden.add_argument(
+        "--min-length", type=int,
+        help="shortest answer to look for (default: 4)",
+    )
+    hidden.add_argument(
+        "--forwards", action="store_true",
+        help="do not look for reversed answers",
+    )
+    hidden.add_argument(
+        "--others", action="store_true",
+        help="only list other answers, not the clue's own",
+    )
+
+    render = subparsers.add_parser("render", help="render puzzles as SVG")
+    _add_common_arguments(render)
+    render.add_argument(
+        "-o", "--output-dir", required=True, help="directory for SVG files",
+    )
+    render.add_argument(
+        "--solution", action="store_true", help="render the solution grid",
+    )
+
+    convert = subparsers.add_parser("convert", help="convert puzzles")
+    _add_common_arguments(convert)
+    convert.add_argument(
+        "-f", "--format", choices=["text", "yaml"], default="text",
+        help="output format (default: text)",
+    )
+
+    stats = subparsers.add_parser("stats", help="show puzzle statistics")
+    _add_common_arguments(stats)
+
+    index = subparsers.add_parser(
+        "index", help="update the catalog of puzzles and clues",
+    )
+    _add_common_arguments(index)
+    _add_catalog_argument(index)
+    _add_lexicon_argument(index)
+    index.add_argument(
+        "--keep", action="store_true",
+        help="keep catalog entries for files that are not listed",
+    )
+    index.add_argument(
+        "--tag", action="store_true",
+        help="tag the clues of new and changed puzzles with device indicators",
+    )
+
+    tags = subparsers.add_parser(
+        "tags", help="tag clues with the devices their indicators suggest",
+    )
+    _add_common_arguments(tags)
+    _add_lexicon_argument(tags)
+
+    devices = subparsers.add_parser(
+        "devices", help="show the mix of devices in the catalog",
+    )
+    _add_catalog_argument(devices)
+    _add_lexicon_argument(devices)
+    devices.add_argument(
+        "--by", choices=GROUPS, default="author",
+        help="group the device counts by this column (default: author)",
+    )
+    devices.add_argument(
+        "--retag", action="store_true",
+        help="tag every clue in the catalog again with the lexicon first",
+    )
+
+    query = subparsers.add_parser("query", help="search the catalog")
+    _add_catalog_argument(query)
+    query.add_argument("--author", help="author contains this text")
+    query.add_argument("--title", help="title contains this text")
+    query.add_argument("--publication", help="publication contains this text")
+    query.add_argument("--year", type=int, help="year of publication")
+    query.add_argument("--answer", help="find clues with this answer")
+
+    search = subparsers.add_parser(
+        "search", help="search clue surfaces and solutions in the catalog",
+    )
+    _add_catalog_argument(search)
+    search.add_argument("text", help='words and "quoted phrases" to find')
+    search.add_argument(
+        "--field", choices=["clue", "solutions"],
+        help="only search this field (default: both)",
+    )
+    search.add_argument(
+        "-n", "--limit", type=int, default=20,
+        help="maximum number of results (default: 20)",
+    )
+
+    pattern = subparsers.add_parser(
+        "pattern",
+        help="find entries in the catalog matching a letter pattern",
+    )
+    _add_catalog_argument(pattern)
+    pattern.add_argument(
+        "pattern", help="letters and ? wildcards, e.g. ?A?C??E",
+    )
+    pattern.add_argument(
+        "--words", action="store_true",
+        help="only list the matching entries, not where they were used",
+    )
+
+    repeats = subparsers.add_parser(
+        "repeats", help="find answers used in recent puzzles of a publication",
+    )
+    _add_catalog_argument(repeats)
+    repeats.add_argument("puzzle", help="puzzle file to check")
+    repeats.add_argument(
+        "--weeks", type=int, default=8,
+        help="number of weeks before the puzzle date to check (default: 8)",
+    )
+    repeats.add_argument(
+        "--publication", help="check this publication (default: the puzzle's)",
+    )
+
+    dictionary = subparsers.add_parser(
+        "dictionary", help="compile word lists into a dictionary file",
+    )
+    dictionary.add_argument(
+        "lists", nargs="+",
+        help="word list files, one word or phrase per line",
+    )
+    dictionary.add_argument(
+        "-o", "--output", required=True, help="compiled dictionary file",
+    )
+
+    lookup = subparsers.add_parser(
+        "lookup", help="look up words in a dictionary",
+    )
+    lookup.add_argument("dictionary", help="compiled dictionary file")
+    lookup.add_argument("words", nargs="*", help="words to check")
+    lookup.add_argument("--prefix", help="list the words with this prefix")
+    lookup.add_argument(
+        "--match", help="list the words matching a pattern, e.g. ?A?C*",
+    )
+
+    anagram_index = subparsers.add_parser(
+        "anagram-index",
+        help="build an anagram index of answers and word lists",
+    )
+    _add_catalog_argument(anagram_index)
+    _add_anagrams_argument(anagram_index)
+    anagram_index.add_argument(
+        "--catalog", action="store_true",
+        help="include the answers in the catalog",
+    )
+    anagram_index.add_argument(
+        "-w", "--words", action="append", default=[],
+        help="word list file, one word or phrase per line (may be repeated)",
+    )
+    anagram_index.add_argument(
+        "--dictionary", action="append", default=[],
+        help="compiled dictionary file (may be repeated)",
+    )
+
+    anagram = subparsers.add_parser("anagram", help="find anagrams of letters")
+    _add_anagrams_argument(anagram)
+    anagram.add_argument("letters", help="letters to rearrange")
+    anagram.add_argument(
+        "--sub", action="store_true",
+        help="also list words made from some of the letters",
+    )
+    anagram.add_argument(
+        "--min-length", type=int, default=3,
+        help="shortest sub-anagram to list (default: 3)",
+    )
+
+    fill = subparsers.add_parser(
+        "fill", help="fill the unknown (?) cells of a puzzle grid",
+    )
+    _add_catalog_argument(fill)
+    fill.add_argument("puzzle", help="puzzle file with ? in the cells to fill")
+    fill.add_argument(
+        "-w", "--words", action="append", default=[],
+        help="word list file, one word per line (may be repeated)",
+    )
+    fill.add_argument(
+        "--catalog", action="store_true",
+        help="also use the entries in the catalog as words",
+    )
+    fill.add_argument(
+        "-n", "--count", type=int, default=1,
+        help="number of fills to find (default: 1)",
+    )
+    fill.add_argument(
+        "--timeout", type=float, help="give up after this many seconds",
+    )
+    fill.add_argument(
+        "--seed", type=int, help="shuffle candidates with this seed",
+    )
+
+    return parser
+
+
+def _get_options(args):
+    """Return the task options for the parsed arguments."""
+    if args.command == "render":
+        os.makedirs(args.output_dir, exist_ok=True)
+        return {
+            "output_dir": args.output_dir,
+            "show_solution": args.solution,
+        }
+    if args.command == "convert":
+        return {"format": args.format}
+    if args.command == "tags" and args.lexicon:
+        return {"lexicon": os.path.abspath(args.lexicon)}
+    if args.command == "validate" and args.dictionary:
+        return {"dictionary": os.path.abspath(args.dictionary)}
+    return {}
+
+
+def _print_result(command, result):
+    """Print the output of a successful task."""
+    output = result["output"]
+    if command == "stats":
+        values = " ".join(f"{key}={output[key]}" for key in STATS_KEYS)
+        print(f"{result['filename']}: {values}")
+    elif command in ["validate", "wordplay"]:
+        if not output:
+            print(f"{result['filename']}: OK")
+        for kind, errors in output.items():
+            for error in errors:
+                print(f"{result['filename']}: {kind}: {error}")
+    elif command == "render":
+        print(output)
+    elif command == "tags":
+        for clue in output:
+            devices = sorted({tag["device"] for tag in clue["tags"]})
+            indicators = ", ".join(
+                f"{tag['indicator']}={tag['device']}" for tag in clue["tags"]
+            )
+            print(
+                f"{result['filename']}: {clue['container']} {clue['name']}."
+                f" {' '.join(devices) or '-'} ({indicators})",
+            )
+    else:
+        print(f"# {result['filename']}")
+        print(output)
+
+
+def _load_tagger(args):
+    """Return the indicator tagger for the lexicon argument."""
+    from variety.indicators import DEFAULT_LEXICON
+    from variety.indicators import load_tagger
+    return load_tagger(args.lexicon or DEFAULT_LEXICON)
+
+
+def _index(args):
+    """Update the catalog and return the exit status."""
+    filenames = find_puzzles(args.paths)
+    tagger = _load_tagger(args) if args.tag else None
+    with Catalog(args.db) as catalog:
+        counts = catalog.refresh(
+            filenames, jobs=args.jobs, prune=not args.keep, tagger=tagger,
+        )
+    print(" ".join(f"{key}={value}" for key, value in counts.items()))
+    return 1 if counts["failed"] else 0
+
+
+def _hidden(args):
+    """Find answers hidden in clue surfaces and return the exit status."""
+    from variety.hidden import HiddenScanner
+    from variety.hidden import MIN_LENGTH
+    records = []
+    failed = 0
+    for result in run("catalog", find_puzzles(args.paths), jobs=args.jobs):
+        if result["ok"]:
+            records.append((result["filename"], result["output"]))
+        else:
+            failed += 1
+            print(
+                f"{result['filename']}: FAILED: {result['error']}",
+                file=sys.stderr,
+            )
+
+    answers = [
+        answer
+        for _, record in records
+        for clue in record["clues"]
+        for answer in clue["answers"]
+    ]
+    min_length = MIN_LENGTH if args.min_length is None else args.min_length
+    scanner = HiddenScanner(
+        answers, min_length=min_length, reverse=not args.forwards,
+    )
+    hits = scanner.scan_records(records)
+    for hit in hits:
+        if args.others and hit["own"]:
+            continue
+        direction = " reversed" if hit["reversed"] else ""
+        own = " (own answer)" if hit["own"] else ""
+        print(
+            f"{hit['path']}: {hit['container']} {hit['name']}. {hit['clue']}"
+            f" [{hit['start']}:{hit['end']}] {hit['text']!r}"
+            f" = {hit['answer']}{direction}{own}",
+        )
+    print(
+        f"{len(records)} puzzles, {len(scanner.answers)} answers,"
+        f" {len(hits)} hits",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+def _devices(args):
+    """Show the device mix in the catalog and return the exit status."""
+    with Catalog(args.db) as catalog:
+        if args.retag:
+            count = catalog.tag(_load_tagger(args))
+            print(f"{count} tags", file=sys.stderr)
+        rows = catalog.device_mix(by=args.by)
+        untagged = catalog.untagged()
+    for row in rows:
+        print(f"{row['name']}: {row['device']} {row['clues']}")
+    if untagged:
+        print(
+            f"warning: {untagged} puzzles are not tagged, run devices --retag",
+            file=sys.stderr,
+        )
+    return 0
+
+
+def _query(args):
+    """Search the catalog and return the exit status."""
+    with Catalog(args.db) as catalog:
+        if args.answer:
+            for clue in catalog.clues(args.answer):
+                print(
+                    f"{clue['path']}: {clue['container']} {clue['name']}."
+                    f" {clue['clue']} ({clue['enumeration']})"
+                    f" ~ {clue['answers']}",
+                )
+            return 0
+        puzzles = catalog.puzzles(
+            author=args.author,
+            year=args.year,
+            title=args.title,
+            publication=args.publication,
+        )
+    for puzzle in puzzles:
+        print(
+            f"{puzzle['path']}: {puzzle['date']} {puzzle['title']}"
+            f" by {puzzle['author']} ({puzzle['publication']})",
+        )
+    return 0
+
+
+def _search(args):
+    """Search the clue text in the catalog and return the exit status."""
+    with Catalog(args.db) as catalog:
+        clues = catalog.search(args.text, field=args.field, limit=args.limit)
+    for clue in clues:
+        print(
+            f"{clue['path']}: {clue['container']} {clue['name']}."
+            f" {clue['clue']} ~ {clue['answers']} ~ {clue['solutions']}",
+        )
+    return 0
+
+
+def _pattern(args):
+    """Find catalog entries matching a pattern and return the exit status."""
+    with Catalog(args.db) as catalog:
+        words = catalog.pattern_index(len(args.pattern)).match(args.pattern)
+        if args.words:
+            for word in words:
+                print(word)
+            return 0
+        sources = catalog.entry_sources(words)
+    for source in sources:
+        where = f"{source['path']}:"
+        if source["direction"]:
+            where += f" {source['x']},{source['y']} {source['direction']}"
+        if source["name"] is None:
+            print(f"{source['entry']}: {where} (unclued)")
+        else:
+            print(
+                f"{source['entry']}: {where}"
+                f" {source['container']} {source['name']}. {source['clue']}",
+            )
+    return 0
+
+
+def _repeats(args):
+    """Report answers used in recent puzzles and return the exit status."""
+    puzzle = load_puzzle(args.puzzle)
+    with Catalog(args.db) as catalog:
+        repeats = catalog.repeats(
+            puzzle, weeks=args.weeks, publication=args.publication,
+        )
+    for repeat in repeats:
+        name = repeat["name"] or "unclued"
+        used = repeat["used_name"] or "unclued"
+        print(
+            f"{repeat['entry']} ({name}): {repeat['date']} {repeat['title']}"
+            f" ({used}) {repeat['path']}",
+        )
+    return 1 if repeats else 0
+
+
+def _dictionary(args):
+    """Compile word lists into a dictionary and return the exit status."""
+    from puzzle.dictionary import Dictionary
+    dictionary = Dictionary.compile(args.lists, args.output)
+    print(f"{args.output}: {len(dictionary)} words")
+    dictionary.close()
+    return 0
+
+
+def _lookup(args):
+    """Look up words in a dictionary and return the exit status."""
+    from puzzle.dictionary import Dictionary
+    dictionary = Dictionary(args.dictionary)
+    missing = 0
+    for word in args.words:
+        found = word in dictionary
+        missing += not found
+        print(f"{word}: {'yes' if found else 'no'}")
+    if args.prefix is not None:
+        for word in dictionary.prefix(args.prefix):
+            print(word)
+    if args.match:
+        for word in dictionary.match(args.match):
+            print(word)
+    dictionary.close()
+    return 1 if missing else 0
+
+
+def _anagram_index(args):
+    """Build an anagram index and return the exit status."""
+    from puzzle.dictionary import Dictionary
+    from variety.anagrams import AnagramIndex
+    from variety.anagrams import DEFAULT_PATH as ANAGRAMS_PATH
+    output = args.index or ANAGRAMS_PATH
+    words = []
+    if args.catalog:
+        with Catalog(args.db) as catalog:
+            words.extend(catalog.answers())
+    for filename in args.words:
+        with open(filename, encoding="utf-8") as f:
+            words.extend(line.strip() for line in f)
+    for filename in args.dictionary:
+        dictionary = Dictionary(filename)
+        words.extend(dictionary)
+        dictionary.close()
+    index = AnagramIndex.compile(words, output)
+    print(f"{output}: {len(index)} words, {index.signatures} signatures")
+    index.close()
+    return 0
+
+
+def _anagram(args):
+    """Find anagrams in the index and return the exit status."""
+    from variety.anagrams import AnagramIndex
+    from variety.anagrams import DEFAULT_PATH as ANAGRAMS_PATH
+    index = AnagramIndex(args.index or ANAGRAMS_PATH)
+    words = index.anagrams(args.letters)
+    for word in words:
+        print(word)
+    if args.sub:
+        subanagrams = index.subanagrams(
+            args.letters, min_length=args.min_length,
+        )
+        for word in subanagrams:
+            if word not in words:
+                print(f"{word} (sub)")
+    index.close()
+    return 0 if words else 1
+
+
+def _fill(args):
+    """Fill a puzzle grid and return the exit status."""
+    from variety.fill import Filler
+    from variety.fill import load_words
+    words = []
+    for filename in args.words:
+        words.extend(load_words(filename))
+    if args.catalog:
+        with Catalog(args.db) as catalog:
+            words.extend(catalog.entries())
+
+    grid = read_yaml(args.puzzle)["grid"]
+    filler = Filler(grid["rows"], grid["columns"], words, seed=args.seed)
+    count = 0
+    for solution in filler.fills(limit=args.count, timeout=args.timeout):
+        count += 1
+        print(f"# fill {count}")
+        print(yaml.safe_dump({"grid": solution}, sort_keys=False), end="")
+    print(
+        f"{count} fills, {filler.nodes} nodes, {filler.status}",
+        file=sys.stderr,
+    )
+    return 0 if count else 1
+
+
+def main(argv=None):
+    """Run the command line interface and return the exit status."""
+    args = get_parser().parse_args(argv)
+    if args.command == "query":
+        return _query(args)
+    if args.command == "devices":
+        return _devices(args)
+    if args.command == "search":
+        return _search(args)
+    if args.command == "pattern":
+        return _pattern(args)
+    if args.command == "fill":
+        return _fill(args)
+    if args.command == "anagram-index":
+        return _anagram_index(args)
+    if args.command == "anagram":
+        return _anagram(args)
+    if args.command == "repeats":
+        return _repeats(args)
+    if args.command == "dictionary":
+        return _dictionary(args)
+    if args.command == "lookup":
+        return _lookup(args)
+    if args.cache_dir:
+        # worker processes inherit the cache setting from the environment
+        os.environ["HEX_CACHE_DIR"] = args.cache_dir
+    if args.command == "index":
+        return _index(args)
+    if args.command == "hidden":
+        return _hidden(args)
+    filenames = find_puzzles(args.paths)
+    options = _get_options(args)
+
+    failed = 0
+    invalid = 0
+    totals = dict.fromkeys(STATS_KEYS, 0)
+    for result in run(args.command, filenames, jobs=args.jobs, **options):
+        if not result["ok"]:
+            failed += 1
+            print(
+                f"{result['filename']}: FAILED: {result['error']}",
+                file=sys.stderr,
+            )
+            continue
+        if args.command in ["validate", "wordplay"] and result["output"]:
+            invalid += 1
+        if args.command == "stats":
+            for key in STATS_KEYS:
+                totals[key] += result["output"][key]
+        _print_result(args.command, result)
+
+    if args.command == "stats":
+        values = " ".join(
+            f"{key}={totals[key]}" for key in STATS_KEYS[2:]
+        )
+        print(f"total: puzzles={len(filenames) - failed} {values}")
+
+    checked = args.command in ["validate", "wordplay"]
+    print(
+        f"{len(filenames)} files, {failed} failed"
+        + (f", {invalid} invalid" if checked else ""),
+        file=sys.stderr,
+    )
+    return 1 if failed or invalid else 0
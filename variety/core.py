@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""Corpus tasks for puzzle files."""
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from hex import read as read_hex
+from hex import read_yaml
+
+EXTENSION = ".yaml"
+
+
+def find_puzzles(paths, extension=EXTENSION):
+    """Return a sorted list of puzzle files from files and directories."""
+    filenames = set()
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for file in files:
+                    if file.endswith(extension):
+                        filenames.add(os.path.join(root, file))
+        else:
+            filenames.add(path)
+    return sorted(filenames)
+
+
+def load_puzzle(filename):
+    """Read a puzzle file and return a Puzzle."""
+    from puzzle import Puzzle
+    return Puzzle(read_yaml(filename))
+
+
+def catalog(filename):
+    """Return the catalog record of a puzzle file and its clues."""
+    puzzle = load_puzzle(filename)
+    clues = []
+    numbers = {}
+    for container in puzzle.clues.containers:
+        for clue in container.clues:
+            numbers[id(clue)] = len(clues)
+            clues.append({
+                "container": container.title,
+                "name": clue.name,
+                "clue": clue.clue,
+                "answers": clue.answers,
+                "entries": clue.entries,
+                "enumeration": clue.get_enumeration(),
+                "solutions": clue.solutions,
+            })
+
+    # grid slots with the number of the clue for their entry, if any, and
+    # then the clue entries that are not in the grid
+    entries = []
+    found = set()
+    clue_entries = puzzle.entries
+    for slot in puzzle.grid.slots:
+        clue = clue_entries.get(slot["entry"])
+        entries.append({
+            "entry": slot["entry"],
+            "clue": numbers.get(id(clue)),
+            "direction": slot["direction"],
+            "x": slot["x"],
+            "y": slot["y"],
+        })
+        found.add(slot["entry"])
+    for n, clue in enumerate(clues):
+        for entry in clue["entries"]:
+            if entry not in found:
+                entries.append({
+                    "entry": entry,
+                    "clue": n,
+                    "direction": None,
+                    "x": None,
+                    "y": None,
+                })
+
+    # entries and unclued entries with the name of their clue, if any
+    usages = [
+        {"entry": entry, "name": clue.name}
+        for entry, clue in puzzle.entries.items()
+    ]
+    usages.extend({"entry": entry, "name": None} for entry in puzzle.unclued)
+
+    date = puzzle.date
+    return {
+        "title": puzzle.title,
+        "author": puzzle.author,
+        "editor": puzzle.editor,
+        "date": date.isoformat() if date else None,
+        "year": date.year if date else None,
+        "publication": puzzle.publication,
+        "issue": puzzle.issue,
+        "number": puzzle.number,
+        "width": puzzle.width,
+        "height": puzzle.height,
+        "errors": sum(len(errors) for errors in puzzle.errors.values()),
+        "clues": clues,
+        "entries": entries,
+        "usages": usages,
+    }
+
+
+def convert(filename, format="text"):
+    """Convert a puzzle file to text or normalized YAML."""
+    if format == "yaml":
+        return load_puzzle(filename).to_yaml()
+    from cryptic import from_hex
+    return str(from_hex(read_hex(filename)))
+
+
+def render(filename, output_dir=None, show_solution=False):
+    """Render a puzzle file as SVG, optionally writing it to a directory."""
+    from puzzle.svg import SVG
+    svg = SVG.create(load_puzzle(filename), show_solution=show_solution)
+    if not output_dir:
+        return svg
+    name = os.path.splitext(os.path.basename(filename))[0]
+    if show_solution:
+        name += "-solution"
+    path = os.path.join(output_dir, f"{name}.svg")
+    with open(path, "w") as f:
+        f.write(svg)
+    return path
+
+
+def stats(filename):
+    """Return a dict of statistics for a puzzle file."""
+    puzzle = load_puzzle(filename)
+    clues = [clue for container in puzzle.clues for clue in container]
+    return {
+        "width": puzzle.width,
+        "height": puzzle.height,
+        "containers": len(puzzle.clues.containers),
+        "clues": len(clues),
+        "entries": len(puzzle.entries),
+        "unclued": len(puzzle.unclued),
+        "errors": sum(len(errors) for errors in puzzle.errors.values()),
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def open_dictionary(filename):
+    """Return a compiled dictionary, opened once per process."""
+    from puzzle.dictionary import Dictionary
+    return Dictionary(filename)
+
+
+def validate(filename, dictionary=None):
+    """Return the errors found in a puzzle file."""
+    puzzle = load_puzzle(filename)
+    if dictionary:
+        puzzle.check_words(open_dictionary(dictionary))
+    return puzzle.errors
+
+
+def tags(filename, lexicon=None):
+    """Return the clues of a puzzle file with the devices they suggest."""
+    from variety.indicators import DEFAULT_LEXICON
+    from variety.indicators import load_tagger
+    tagger = load_tagger(lexicon or DEFAULT_LEXICON)
+    clues = []
+    for container in load_puzzle(filename).clues.containers:
+        for clue in container.clues:
+            clues.append({
+                "container": container.title,
+                "name": clue.name,
+                "clue": clue.clue,
+                "tags": tagger.tag(clue.clue),
+            })
+    return clues
+
+
+def wordplay(filename):
+    """Return the wordplay errors found in a puzzle file."""
+    puzzle = load_puzzle(filename)
+    puzzle.check_wordplay()
+    errors = puzzle.errors.get("wordplay")
+    return {"wordplay": errors} if errors else {}
+
+
+TASKS = {
+    "catalog": catalog,
+    "convert": convert,
+    "render": render,
+    "stats": stats,
+    "tags": tags,
+    "validate": validate,
+    "wordplay": wordplay,
+}
+
+
+def _run_task(task, filename, options):
+    """Run a task on a single file and capture any failure."""
+    result = {
+        "filename": filename,
+        "ok": True,
+        "output": None,
+        "error": None,
+    }
+    try:
+        result["output"] = TASKS[task](filename, **options)
+    except Exception as error:
+        result["ok"] = False
+        result["error"] = f"{type(error).__name__}: {error}"
+    return result
+
+
+def run(task, filenames, jobs=1, **options):
+    """Run a task over a list of files and yield the results in input order."""
+    if task not in TASKS:
+        raise ValueError(f"Invalid task: {task}")
+    if jobs < 0:
+        raise ValueError(f"Invalid number of jobs: {jobs}")
+    if not jobs:
+        jobs = os.cpu_count() or 1
+
+    worker = functools.partial(_run_task, task, options=options)
+
+    # run small or single-job workloads in this process
+    if jobs == 1 or len(filenames) < 2:
+        yield from map(worker, filenames)
+        return
+
+    # hand each process a few chunks so slow files do not stall the pool
+    chunksize = max(1, len(filenames) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(worker, filenames, chunksize=chunksize)
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""Autofill engine for barred and blocked grids."""
+import random
+import time
+
+from puzzle.grid import parse_slots
+
+from variety.patterns import PatternIndex
+
+# a cell whose letter is still to be filled
+UNKNOWN = "?"
+
+# statuses that stop the search
+STOPPED = ["cancelled", "timeout"]
+
+
+def _cells(lines, direction):
+    """Return a dict of the characters of the cells in the rows or columns."""
+    cells = {}
+    for b, line in enumerate(lines):
+        a = 0
+        for char in line:
+            if char == "|":
+                continue
+            cells[(a, b) if direction == "across" else (b, a)] = char
+            a += 1
+    return cells
+
+
+def _fill_lines(lines, direction, letters):
+    """Return the rows or columns with the unknown cells filled in."""
+    filled = []
+    for b, line in enumerate(lines):
+        a = 0
+        chars = []
+        for char in line:
+            if char != "|":
+                if char == UNKNOWN:
+                    key = (a, b) if direction == "across" else (b, a)
+                    char = letters.get(key, char)
+                a += 1
+            chars.append(char)
+        filled.append("".join(chars))
+    return filled
+
+
+def load_words(filename):
+    """Return the words in a word list file, one per line."""
+    with open(filename) as f:
+        return [normalize_word(line) for line in f if normalize_word(line)]
+
+
+def normalize_word(word):
+    """Return a word as uppercase letters and digits, as entered in a grid."""
+    return "".join(char for char in word.upper() if char.isalnum())
+
+
+class Filler:
+    """Filler class.
+
+    Fills the unknown (?) cells of a grid given as rows and columns, with
+    bars, blocks and blanks, from a word list. Each slot keeps its
+    candidate words as a bitset over the words of its length; crossings
+    are kept arc consistent, and the search assigns the slot with the
+    fewest candidates first and backtracks on a dead end.
+    """
+
+    def __init__(self, rows, columns, words, seed=None):
+        """Initialize the Filler class."""
+        self.rows = [row.strip() for row in rows]
+        self.columns = [column.strip() for column in columns]
+
+        # merge the letters given in the rows and the columns
+        across = _cells(self.rows, "across")
+        down = _cells(self.columns, "down")
+        self.cells = dict(across)
+        for key, char in down.items():
+            if self.cells.get(key, UNKNOWN) == UNKNOWN:
+                self.cells[key] = char
+            elif char not in (UNKNOWN, self.cells[key]):
+                raise ValueError(
+                    f"Cell value mismatch at: {key[0]}, {key[1]}:"
+                    f" {self.cells[key]}, {char}",
+                )
+
+        # slots with the coordinates of their cells
+        self.slots = (
+            parse_slots(self.rows, "across")
+            + parse_slots(self.columns, "down")
+        )
+        for slot in self.slots:
+            x, y = slot["x"], slot["y"]
+            if slot["direction"] == "across":
+                slot["cells"] = [(x + n, y) for n in range(slot["length"])]
+            else:
+                slot["cells"] = [(x, y + n) for n in range(slot["length"])]
+            slot["pattern"] = "".join(
+                self.cells[cell] for cell in slot["cells"]
+            )
+
+        # complete slots are kept even when they are not in the word list
+        words = list(words)
+        words.extend(
+            slot["pattern"]
+            for slot in self.slots
+            if UNKNOWN not in slot["pattern"]
+        )
+        self.index = PatternIndex(words)
+
+        # slots that are already complete are left out of the rule that
+        # no word is used twice, so a grid that repeats one can still fill
+        self.fixed = {
+            n
+            for n, slot in enumerate(self.slots)
+            if UNKNOWN not in slot["pattern"]
+        }
+
+        # crossings of each slot: (position, other slot, other position)
+        owners = {}
+        for n, slot in enumerate(self.slots):
+            for position, cell in enumerate(slot["cells"]):
+                owners.setdefault(cell, []).append((n, position))
+        self.crossings = [[] for _ in self.slots]
+        for owner in owners.values():
+            for a, position in owner:
+                for b, other in owner:
+                    if a != b:
+                        self.crossings[a].append((position, b, other))
+
+        self.random = random.Random(seed) if seed is not None else None
+        self.status = None
+        self.nodes = 0
+
+    def _domains(self):
+        """Return the initial candidate bitset of each slot."""
+        domains = []
+        for slot in self.slots:
+            pattern = slot["pattern"]
+            words = self.index.words.get(len(pattern))
+            if not words:
+                domains.append(0)
+                continue
+            mask = (1 << len(words)) - 1
+            bits = self.index.bits[len(pattern)]
+            for position, letter in enumerate(pattern):
+                if letter != UNKNOWN:
+                    mask &= bits[position].get(letter, 0)
+            domains.append(mask)
+
+        # the words already in the grid are not used again
+        for n in self.fixed:
+            length = self.slots[n]["length"]
+            for m, slot in enumerate(self.slots):
+                if m not in self.fixed and slot["length"] == length:
+                    domains[m] &= ~domains[n]
+        return domains
+
+    def _revise(self, domains, a, position, b, other):
+        """Remove the candidates of slot a with no support in slot b."""
+        bits_a = self.index.bits[self.slots[a]["length"]][position]
+        domain_b = domains[b]
+        support = 0
+        bits_b = self.index.bits[self.slots[b]["length"]][other]
+        for letter, bits in bits_b.items():
+            if bits & domain_b and letter in bits_a:
+                support |= bits_a[letter]
+        domain = domains[a] & support
+        if domain == domains[a]:
+            return False
+        domains[a] = domain
+        return True
+
+    def _propagate(self, domains, queue):
+        """Make the arcs consistent, or return False if a slot has no words."""
+        queue = list(dict.fromkeys(queue))
+        pending = set(queue)
+        while queue:
+            arc = queue.pop()
+            pending.discard(arc)
+            a, position, b, other = arc
+            if self._revise(domains, a, position, b, other):
+                if not domains[a]:
+                    return False
+                for position, c, other in self.crossings[a]:
+                    arc = (c, other, a, position)
+                    if c != b and arc not in pending:
+                        pending.add(arc)
+                        queue.append(arc)
+        return True
+
+    def _assign(self, domains, n, word):
+        """Assign a word to a slot and keep it out of the other open slots."""
+        domains[n] = 1 << word
+        if n in self.fixed:
+            return True
+        length = self.slots[n]["length"]
+        for m, slot in enumerate(self.slots):
+            if m != n and m not in self.fixed and slot["length"] == length:
+                domains[m] &= ~(1 << word)
+                if not domains[m]:
+                    return False
+        return True
+
+    def _arcs(self):
+        """Return every arc between crossing slots."""
+        return [
+            (a, position, b, other)
+            for a, crossings in enumerate(self.crossings)
+            for position, b, other in crossings
+        ]
+
+    def _search(self, domains, assigned, deadline, cancel):
+        """Yield the complete assignments reachable from the given domains."""
+        self.nodes += 1
+        if cancel is not None and cancel.is_set():
+            self.status = "cancelled"
+            return
+        if deadline is not None and time.monotonic() > deadline:
+            self.status = "timeout"
+            return
+
+        # choose the unassigned slot with the fewest candidates
+        choice = None
+        for n, domain in enumerate(domains):
+            if n not in assigned:
+                count = bin(domain).count("1")
+                if choice is None or count < choice[0]:
+                    choice = (count, n)
+        if choice is None:
+            yield domains
+            return
+
+        n = choice[1]
+        candidates = []
+        mask = domains[n]
+        while mask:
+            low = mask & -mask
+            candidates.append(low.bit_length() - 1)
+            mask ^= low
+        if self.random:
+            self.random.shuffle(candidates)
+
+        length = self.slots[n]["length"]
+        for word in candidates:
+            trial = list(domains)
+            if not self._assign(trial, n, word):
+                continue
+            arcs = [
+                (b, other, n, position)
+                for position, b, other in self.crossings[n]
+            ]
+            # removing a word from same-length slots can break other arcs
+            arcs += [
+                (c, other, b, position)
+                for b, slot in enumerate(self.slots)
+                if slot["length"] == length and trial[b] != domains[b]
+                for position, c, other in self.crossings[b]
+            ]
+            if not self._propagate(trial, arcs):
+                continue
+            yield from self._search(trial, assigned | {n}, deadline, cancel)
+            if self.status in STOPPED:
+                return
+
+    def _solution(self, domains):
+        """Return the filled rows and columns for a complete assignment."""
+        letters = {}
+        for slot, domain in zip(self.slots, domains):
+            word = self.index.words[slot["length"]][domain.bit_length() - 1]
+            letters.update(zip(slot["cells"], word))
+        return {
+            "rows": _fill_lines(self.rows, "across", letters),
+            "columns": _fill_lines(self.columns, "down", letters),
+        }
+
+    def fills(self, limit=None, timeout=None, cancel=None):
+        """Yield complete fills as dicts of rows and columns.
+
+        The search stops after limit fills, when timeout seconds have
+        passed, or when the cancel event is set. Status is then "filled",
+        "impossible", "timeout" or "cancelled".
+        """
+        self.status = None
+        self.nodes = 0
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        domains = self._domains()
+        count = 0
+        if all(domains) and self._propagate(domains, self._arcs()):
+            solutions = self._search(domains, frozenset(), deadline, cancel)
+            for solution in solutions:
+                self.status = "filled"
+                yield self._solution(solution)
+                count += 1
+                if limit is not None and count >= limit:
+                    return
+        if self.status is None:
+            self.status = "impossible"
+
+    def fill(self, timeout=None, cancel=None):
+        """Return the first complete fill, or None."""
+        for solution in self.fills(limit=1, timeout=timeout, cancel=cancel):
+            return solution
+        return None
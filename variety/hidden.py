@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""Scanner for answers hidden in clue surfaces across the corpus."""
+import collections
+
+from puzzle.dictionary import normalize
+from puzzle.helpers import strip_tags
+
+# shorter answers turn up by chance in most clues
+MIN_LENGTH = 4
+
+
+def letters(text):
+    """Return the letters of text and the index in text of each letter."""
+    chars = []
+    positions = []
+    for n, char in enumerate(text):
+        char = normalize(char)
+        if char:
+            chars.append(char)
+            positions.extend([n] * len(char))
+    return "".join(chars), positions
+
+
+class Automaton:
+    """Automaton class.
+
+    An Aho-Corasick automaton over a set of words: a trie of the words
+    with failure links, so that every occurrence of every word in a text
+    is found in one pass over the text.
+    """
+
+    def __init__(self, words):
+        """Initialize the Automaton class."""
+        self.words = sorted(set(words))
+        self.goto = [{}]
+        # the word ending at each node, and the next node on its failure
+        # chain that also ends a word
+        self.output = [None]
+        self.fail = [0]
+        self.next_output = [0]
+
+        for index, word in enumerate(self.words):
+            node = 0
+            for char in word:
+                child = self.goto[node].get(char)
+                if child is None:
+                    child = len(self.goto)
+                    self.goto[node][char] = child
+                    self.goto.append({})
+                    self.output.append(None)
+                    self.fail.append(0)
+                    self.next_output.append(0)
+                node = child
+            self.output[node] = index
+
+        queue = collections.deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fail = self.fail[node]
+                while fail and char not in self.goto[fail]:
+                    fail = self.fail[fail]
+                fail = self.goto[fail].get(char, 0)
+                self.fail[child] = fail
+                self.next_output[child] = (
+                    fail if self.output[fail] is not None
+                    else self.next_output[fail]
+                )
+
+    def __len__(self):
+        """Return the number of words."""
+        return len(self.words)
+
+    def find(self, text):
+        """Yield (start, end, word) for every occurrence of a word in text."""
+        goto = self.goto
+        fail = self.fail
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            found = (
+                node if self.output[node] is not None
+                else self.next_output[node]
+            )
+            while found:
+                word = self.words[self.output[found]]
+                yield end - len(word), end, word
+                found = self.next_output[found]
+
+
+class HiddenScanner:
+    """Hidden Scanner class.
+
+    Builds one automaton over the answers, and their reversals, and runs
+    it over the letters of each clue surface. Matches that are exactly
+    whole words of the surface are not hidden and are skipped.
+    """
+
+    def __init__(self, answers, min_length=MIN_LENGTH, reverse=True):
+        """Initialize the HiddenScanner class."""
+        self.reverse = reverse
+        self.answers = {}
+        for answer in answers:
+            word = normalize(answer)
+            if len(word) >= min_length:
+                self.answers.setdefault(word, answer)
+        words = set(self.answers)
+        if reverse:
+            words.update(word[::-1] for word in self.answers)
+        self.automaton = Automaton(words)
+
+    def scan(self, clue):
+        """Return the answers hidden in a clue surface, with their spans."""
+        text = strip_tags(clue or "")
+        chars, positions = letters(text)
+        hits = []
+        for start, end, word in self.automaton.find(chars):
+            first = positions[start]
+            last = positions[end - 1] + 1
+            # skip whole words, which are in plain sight
+            if (first == 0 or not text[first - 1].isalnum()) and (
+                last == len(text) or not text[last].isalnum()
+            ):
+                continue
+            for reversed_, answer in [(False, word), (True, word[::-1])]:
+                if reversed_ and (not self.reverse or answer == word):
+                    # palindromes are only reported forwards
+                    continue
+                if answer in self.answers:
+                    hits.append({
+                        "answer": self.answers[answer],
+                        "start": first,
+                        "end": last,
+                        "text": text[first:last],
+                        "reversed": reversed_,
+                    })
+        return text, hits
+
+    def scan_records(self, records):
+        """Return the hidden answers in the clues of catalog records.
+
+        Records are (path, record) pairs as returned by the catalog task.
+        """
+        hits = []
+        for path, record in records:
+            for clue in record["clues"]:
+                own = {normalize(answer) for answer in clue["answers"]}
+                text, found = self.scan(clue["clue"])
+                for hit in found:
+                    hit.update({
+                        "path": path,
+                        "title": record["title"],
+                        "container": clue["container"],
+                        "name": clue["name"],
+                        "clue": text,
+                        "own": normalize(hit["answer"]) in own,
+                    })
+                    hits.append(hit)
+        return hits
@@ -0,0 +1,653 @@
+# -*- coding: utf-8 -*-
+"""SQLite catalog of the puzzles and clues in a corpus."""
+import datetime
+import hashlib
+import html
+import os
+import re
+import sqlite3
+
+from variety.core import run
+from variety.patterns import PatternIndex
+
+DEFAULT_PATH = "catalog.sqlite"
+
+# catalogs with an older schema are rebuilt from scratch
+SCHEMA_VERSION = 8
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS puzzles (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    title TEXT,
+    author TEXT,
+    editor TEXT,
+    date TEXT,
+    year INTEGER,
+    publication TEXT,
+    issue TEXT,
+    number INTEGER,
+    width INTEGER,
+    height INTEGER,
+    errors INTEGER,
+    tagged INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS clues (
+    id INTEGER PRIMARY KEY,
+    puzzle_id INTEGER NOT NULL REFERENCES puzzles (id) ON DELETE CASCADE,
+    container TEXT,
+    name TEXT,
+    clue TEXT,
+    answers TEXT,
+    entries TEXT,
+    enumeration TEXT,
+    solutions TEXT
+);
+CREATE TABLE IF NOT EXISTS answers (
+    clue_id INTEGER NOT NULL REFERENCES clues (id) ON DELETE CASCADE,
+    answer TEXT NOT NULL,
+    word TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    puzzle_id INTEGER NOT NULL REFERENCES puzzles (id) ON DELETE CASCADE,
+    clue_id INTEGER REFERENCES clues (id) ON DELETE CASCADE,
+    entry TEXT NOT NULL,
+    direction TEXT,
+    x INTEGER,
+    y INTEGER
+);
+CREATE TABLE IF NOT EXISTS usages (
+    key INTEGER NOT NULL,
+    entry TEXT NOT NULL,
+    puzzle_id INTEGER NOT NULL REFERENCES puzzles (id) ON DELETE CASCADE,
+    name TEXT
+);
+CREATE TABLE IF NOT EXISTS indicators (
+    clue_id INTEGER NOT NULL REFERENCES clues (id) ON DELETE CASCADE,
+    device TEXT NOT NULL,
+    indicator TEXT NOT NULL,
+    start INTEGER,
+    stop INTEGER
+);
+CREATE TABLE IF NOT EXISTS settings (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS pattern_words (
+    length INTEGER PRIMARY KEY,
+    words TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pattern_bits (
+    length INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    letter TEXT NOT NULL,
+    bits BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS puzzles_author ON puzzles (author);
+CREATE INDEX IF NOT EXISTS puzzles_year ON puzzles (year);
+CREATE INDEX IF NOT EXISTS clues_puzzle_id ON clues (puzzle_id);
+CREATE INDEX IF NOT EXISTS answers_clue_id ON answers (clue_id);
+CREATE INDEX IF NOT EXISTS answers_word ON answers (word);
+CREATE INDEX IF NOT EXISTS entries_puzzle_id ON entries (puzzle_id);
+CREATE INDEX IF NOT EXISTS entries_clue_id ON entries (clue_id);
+CREATE INDEX IF NOT EXISTS entries_entry ON entries (entry);
+CREATE INDEX IF NOT EXISTS puzzles_publication_date
+    ON puzzles (publication, date);
+CREATE INDEX IF NOT EXISTS usages_key ON usages (key, puzzle_id, name);
+CREATE INDEX IF NOT EXISTS usages_puzzle_id ON usages (puzzle_id);
+CREATE INDEX IF NOT EXISTS indicators_clue_id ON indicators (clue_id);
+CREATE INDEX IF NOT EXISTS indicators_device ON indicators (device);
+CREATE INDEX IF NOT EXISTS pattern_bits_length ON pattern_bits (length);
+CREATE VIRTUAL TABLE IF NOT EXISTS clue_text USING fts5 (
+    clue,
+    solutions,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS clues_delete AFTER DELETE ON clues BEGIN
+    DELETE FROM clue_text WHERE rowid = old.id;
+END;
+"""
+
+TABLES = [
+    "answers",
+    "pattern_bits",
+    "pattern_words",
+    "settings",
+    "clue_text",
+    "entries",
+    "indicators",
+    "usages",
+    "clues",
+    "puzzles",
+]
+
+# columns that the device mix can be grouped by
+GROUPS = ["author", "editor", "publication", "year"]
+
+# markup tags in clue and solution text, which are not indexed
+TAG = re.compile(r"<[^>]*>")
+
+# a quoted phrase or a single term in a search query
+QUERY_PART = re.compile(r'"([^"]*)"?|(\S+)')
+
+# relative weights of the clue and solutions columns when ranking results
+WEIGHTS = (2.0, 1.0)
+
+PUZZLE_FIELDS = [
+    "title",
+    "author",
+    "editor",
+    "date",
+    "year",
+    "publication",
+    "issue",
+    "number",
+    "width",
+    "height",
+    "errors",
+]
+
+
+def file_hash(path):
+    """Return the sha256 hex digest of a file."""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def entry_key(entry):
+    """Return a signed 64-bit hash of a normalised entry for the usages."""
+    digest = hashlib.blake2b(normalize(entry).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def fts_query(text):
+    """Return an FTS5 query matching every term and quoted phrase in text."""
+    phrases = []
+    for match in QUERY_PART.finditer(text):
+        words = re.findall(r"\w+", match.group(1) or match.group(2) or "")
+        if words:
+            phrases.append('"' + " ".join(words) + '"')
+    return " ".join(phrases)
+
+
+def index_text(text):
+    """Return text with markup removed for the full-text index."""
+    return html.unescape(TAG.sub(" ", text or ""))
+
+
+def normalize(answer):
+    """Return an answer as uppercase letters and digits only."""
+    return re.sub(r"[^A-Z0-9]", "", answer.upper())
+
+
+class Catalog:
+    """Catalog class."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        """Initialize the Catalog class."""
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA foreign_keys = ON")
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            for table in TABLES:
+                self.db.execute(f"DROP TABLE IF EXISTS {table}")
+        self.db.executescript(SCHEMA)
+        self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def __enter__(self):
+        """Return the catalog for use as a context manager."""
+        return self
+
+    def __exit__(self, *args):
+        """Close the catalog."""
+        self.close()
+
+    def close(self):
+        """Close the database connection."""
+        self.db.close()
+
+    def _setting(self, name):
+        """Return a stored setting, or None."""
+        row = self.db.execute(
+            "SELECT value FROM settings WHERE name = ?", (name,),
+        ).fetchone()
+        return row["value"] if row else None
+
+    def _set_setting(self, name, value):
+        """Store a setting."""
+        self.db.execute(
+            "INSERT OR REPLACE INTO settings (name, value) VALUES (?, ?)",
+            (name, value),
+        )
+
+    def _lexicon_tagger(self):
+        """Return the tagger of the stored lexicon, or None."""
+        path = self._setting("lexicon")
+        if not path or not os.path.exists(path):
+            return None
+        from variety.indicators import load_tagger
+        return load_tagger(path)
+
+    def _changed(self, filenames, stats):
+        """Return (path, mtime, size, hash) for each new or changed file."""
+        known = {
+            row["path"]: row
+            for row in self.db.execute(
+                "SELECT path, mtime, size, hash FROM puzzles",
+            )
+        }
+        changed = []
+        for path in filenames:
+            row = known.get(path)
+            try:
+                stat = os.stat(path)
+                if (
+                    row
+                    and row["mtime"] == stat.st_mtime
+                    and row["size"] == stat.st_size
+                ):
+                    stats["unchanged"] += 1
+                    continue
+                hash = file_hash(path)
+            except OSError:
+                # the file went away or cannot be read: drop any stale rows
+                self.db.execute("DELETE FROM puzzles WHERE path = ?", (path,))
+                stats["failed"] += 1
+                continue
+            if row and row["hash"] == hash:
+                # touched but not modified
+                self.db.execute(
+                    "UPDATE puzzles SET mtime = ?, size = ? WHERE path = ?",
+                    (stat.st_mtime, stat.st_size, path),
+                )
+                stats["unchanged"] += 1
+                continue
+            changed.append((path, stat.st_mtime, stat.st_size, hash))
+        return changed
+
+    def _tag(self, tagger, clues):
+        """Store the device tags of (clue id, clue text) pairs."""
+        self.db.executemany(
+            "INSERT INTO indicators (clue_id, device, indicator, start, stop)"
+            " VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    clue_id,
+                    tag["device"],
+                    tag["indicator"],
+                    tag["start"],
+                    tag["end"],
+                )
+                for clue_id, clue in clues
+                for tag in tagger.tag(clue)
+            ],
+        )
+
+    def _index_patterns(self):
+        """Store the pattern index of the entries in place of the old one."""
+        index = PatternIndex.from_catalog(self)
+        self.db.execute("DELETE FROM pattern_words")
+        self.db.execute("DELETE FROM pattern_bits")
+        self.db.executemany(
+            "INSERT INTO pattern_words (length, words) VALUES (?, ?)",
+            [
+                (length, "\n".join(words))
+                for length, words in index.words.items()
+            ],
+        )
+        self.db.executemany(
+            "INSERT INTO pattern_bits (length, position, letter, bits)"
+            " VALUES (?, ?, ?, ?)",
+            index.rows(),
+        )
+
+    def _store(self, path, mtime, size, hash, record, tagger=None):
+        """Replace the rows of a puzzle file with a new record."""
+        self.db.execute("DELETE FROM puzzles WHERE path = ?", (path,))
+        cursor = self.db.execute(
+            "INSERT INTO puzzles (path, mtime, size, hash, tagged,"
+            f" {', '.join(PUZZLE_FIELDS)})"
+            f" VALUES (?, ?, ?, ?, ?, {', '.join('?' * len(PUZZLE_FIELDS))})",
+            [path, mtime, size, hash, int(bool(tagger))]
+            + [record[key] for key in PUZZLE_FIELDS],
+        )
+        puzzle_id = cursor.lastrowid
+        clue_ids = []
+        for clue in record["clues"]:
+            cursor = self.db.execute(
+                "INSERT INTO clues"
+                " (puzzle_id, container, name, clue, answers, entries,"
+                " enumeration, solutions)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    puzzle_id,
+                    clue["container"],
+                    clue["name"],
+                    clue["clue"],
+                    ";".join(clue["answers"]),
+                    ";".join(clue["entries"]),
+                    clue["enumeration"],
+                    ";".join(clue["solutions"]),
+                ),
+            )
+            clue_ids.append(cursor.lastrowid)
+            self.db.execute(
+                "INSERT INTO clue_text (rowid, clue, solutions)"
+                " VALUES (?, ?, ?)",
+                (
+                    cursor.lastrowid,
+                    index_text(clue["clue"]),
+                    index_text(" ".join(clue["solutions"])),
+                ),
+            )
+            self.db.executemany(
+                "INSERT INTO answers (clue_id, answer, word) VALUES (?, ?, ?)",
+                [
+                    (cursor.lastrowid, answer, normalize(answer))
+                    for answer in clue["answers"]
+                ],
+            )
+        self.db.executemany(
+            "INSERT INTO entries (puzzle_id, clue_id, entry, direction, x, y)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    puzzle_id,
+                    None if entry["clue"] is None else clue_ids[entry["clue"]],
+                    entry["entry"],
+                    entry["direction"],
+                    entry["x"],
+                    entry["y"],
+                )
+                for entry in record["entries"]
+            ],
+        )
+        self.db.executemany(
+            "INSERT INTO usages (key, entry, puzzle_id, name)"
+            " VALUES (?, ?, ?, ?)",
+            [
+                (
+                    entry_key(usage["entry"]),
+                    normalize(usage["entry"]),
+                    puzzle_id,
+                    usage["name"],
+                )
+                for usage in record["usages"]
+            ],
+        )
+        if tagger:
+            self._tag(tagger, [
+                (clue_id, clue["clue"])
+                for clue_id, clue in zip(clue_ids, record["clues"])
+            ])
+
+    def refresh(self, filenames, jobs=1, prune=True, tagger=None):
+        """Update the catalog from a list of files and return a dict of counts.
+
+        Files whose mtime and size match the catalog are skipped; the rest
+        are hashed and only parsed again when their content changed. With
+        prune, puzzles whose files are not in the list are removed. The
+        clues of new and changed puzzles are tagged with the given tagger,
+        or else with the lexicon the catalog was last tagged with, and every
+        clue is tagged again when that lexicon has changed. The pattern
+        index of the entries is rebuilt when anything changed.
+        """
+        stats = dict.fromkeys(
+            ["added", "updated", "removed", "unchanged", "failed"], 0,
+        )
+        filenames = [os.path.abspath(filename) for filename in filenames]
+        with self.db:
+            if tagger is None:
+                tagger = self._lexicon_tagger()
+            changed = self._changed(filenames, stats)
+            known = {
+                row["path"]
+                for row in self.db.execute("SELECT path FROM puzzles")
+            }
+            results = run("catalog", [item[0] for item in changed], jobs=jobs)
+            for item, result in zip(changed, results):
+                path = item[0]
+                if not result["ok"]:
+                    # drop stale rows so the file is parsed again next time
+                    self.db.execute(
+                        "DELETE FROM puzzles WHERE path = ?", (path,),
+                    )
+                    stats["failed"] += 1
+                    continue
+                self._store(*item, result["output"], tagger=tagger)
+                stats["updated" if path in known else "added"] += 1
+
+            if prune:
+                current = set(filenames)
+                removed = [(path,) for path in known if path not in current]
+                self.db.executemany(
+                    "DELETE FROM puzzles WHERE path = ?", removed,
+                )
+                stats["removed"] = len(removed)
+
+            if any(
+                stats[key] for key in ["added", "updated", "removed", "failed"]
+            ):
+                self._index_patterns()
+
+            if tagger and tagger.filename and (
+                self._setting("lexicon") != tagger.filename
+                or self._setting("lexicon_hash") != file_hash(tagger.filename)
+            ):
+                # unchanged puzzles were tagged with another lexicon or none
+                if stats["unchanged"]:
+                    self._tag_all(tagger)
+                else:
+                    self._set_lexicon(tagger)
+        return stats
+
+    def _tag_all(self, tagger):
+        """Tag every clue in the catalog again and record the lexicon."""
+        self.db.execute("DELETE FROM indicators")
+        clues = self.db.execute("SELECT id, clue FROM clues").fetchall()
+        self._tag(tagger, clues)
+        self.db.execute("UPDATE puzzles SET tagged = 1")
+        if tagger.filename:
+            self._set_lexicon(tagger)
+
+    def _set_lexicon(self, tagger):
+        """Record the lexicon file of a tagger as the one the clues have."""
+        self._set_setting("lexicon", tagger.filename)
+        self._set_setting("lexicon_hash", file_hash(tagger.filename))
+
+    def tag(self, tagger):
+        """Tag every clue in the catalog again and return the tag count."""
+        with self.db:
+            self._tag_all(tagger)
+        return self.db.execute("SELECT COUNT(*) FROM indicators").fetchone()[0]
+
+    def untagged(self):
+        """Return the number of puzzles whose clues have not been tagged."""
+        return self.db.execute(
+            "SELECT COUNT(*) FROM puzzles WHERE NOT tagged",
+        ).fetchone()[0]
+
+    def device_mix(self, by="author"):
+        """Return the number of clues of each device, grouped by a column."""
+        if by not in GROUPS:
+            raise ValueError(f"Invalid group: {by}")
+        sql = (
+            f"SELECT puzzles.{by} AS name, indicators.device,"
+            " COUNT(DISTINCT indicators.clue_id) AS clues"
+            " FROM indicators"
+            " JOIN clues ON clues.id = indicators.clue_id"
+            " JOIN puzzles ON puzzles.id = clues.puzzle_id"
+            f" GROUP BY puzzles.{by}, indicators.device"
+            " ORDER BY name, clues DESC, indicators.device"
+        )
+        return [dict(row) for row in self.db.execute(sql)]
+
+    def answers(self):
+        """Return the distinct answers in the catalog."""
+        sql = "SELECT DISTINCT answer FROM answers"
+        return [row[0] for row in self.db.execute(sql)]
+
+    def entries(self):
+        """Return the distinct entries in the catalog."""
+        sql = "SELECT DISTINCT entry FROM entries"
+        return [row[0] for row in self.db.execute(sql)]
+
+    def pattern_index(self, length=None):
+        """Return the stored pattern index of all entries or one length."""
+        where = ""
+        params = ()
+        if length is not None:
+            where = " WHERE length = ?"
+            params = (length,)
+        words = {
+            row["length"]: row["words"].split("\n")
+            for row in self.db.execute(
+                f"SELECT length, words FROM pattern_words{where}", params,
+            )
+        }
+        rows = self.db.execute(
+            f"SELECT length, position, letter, bits FROM pattern_bits{where}",
+            params,
+        )
+        return PatternIndex.from_rows(words, rows)
+
+    def entry_sources(self, entries):
+        """Return the grid positions and clues of the given entries."""
+        sources = []
+        entries = list(entries)
+        # stay under the SQLite limit on query parameters
+        for start in range(0, len(entries), 500):
+            chunk = entries[start:start + 500]
+            sql = (
+                "SELECT entries.entry, entries.direction, entries.x,"
+                " entries.y, puzzles.path, puzzles.title, puzzles.date,"
+                " clues.container, clues.name, clues.clue"
+                " FROM entries"
+                " JOIN puzzles ON puzzles.id = entries.puzzle_id"
+                " LEFT JOIN clues ON clues.id = entries.clue_id"
+                f" WHERE entries.entry IN ({', '.join('?' * len(chunk))})"
+            )
+            sources.extend(dict(row) for row in self.db.execute(sql, chunk))
+        sources.sort(
+            key=lambda row: (row["entry"], row["date"] or "", row["path"]),
+        )
+        return sources
+
+    def puzzles(self, author=None, year=None, title=None, publication=None):
+        """Return the puzzles matching the given filters, ordered by date."""
+        where = []
+        params = []
+        for column, value in [
+            ("author", author),
+            ("title", title),
+            ("publication", publication),
+        ]:
+            if value:
+                where.append(f"{column} LIKE ?")
+                params.append(f"%{value}%")
+        if year:
+            where.append("year = ?")
+            params.append(int(year))
+        sql = "SELECT * FROM puzzles"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY date, path"
+        return [dict(row) for row in self.db.execute(sql, params)]
+
+    def clues(self, answer):
+        """Return the clues with an answer, ignoring spaces and punctuation."""
+        sql = (
+            "SELECT DISTINCT puzzles.path, puzzles.title, puzzles.date,"
+            " clues.*"
+            " FROM answers"
+            " JOIN clues ON clues.id = answers.clue_id"
+            " JOIN puzzles ON puzzles.id = clues.puzzle_id"
+            " WHERE answers.word = ?"
+            " ORDER BY puzzles.date, puzzles.path, clues.id"
+        )
+        rows = self.db.execute(sql, (normalize(answer),))
+        return [dict(row) for row in rows]
+
+    def repeats(self, puzzle, weeks=8, publication=None):
+        """Return the entries of a puzzle used in the weeks before its date.
+
+        Only earlier puzzles of the same publication, or of the given one,
+        are checked. Each repeat is a dict with the entry and clue name in
+        the puzzle and the path, date and clue name of the earlier use.
+        """
+        date = puzzle.date or datetime.date.today()
+        start = date - datetime.timedelta(weeks=weeks)
+        if publication is None:
+            publication = puzzle.publication
+
+        usages = {}
+        for entry, clue in puzzle.entries.items():
+            usages.setdefault(entry_key(entry), []).append((entry, clue.name))
+        for entry in puzzle.unclued:
+            usages.setdefault(entry_key(entry), []).append((entry, None))
+
+        rows = []
+        keys = list(usages)
+        # stay under the SQLite limit on query parameters
+        for begin in range(0, len(keys), 500):
+            chunk = keys[begin:begin + 500]
+            sql = (
+                "SELECT usages.key, usages.entry, usages.name,"
+                " puzzles.path, puzzles.title, puzzles.date"
+                " FROM usages"
+                " JOIN puzzles ON puzzles.id = usages.puzzle_id"
+                f" WHERE usages.key IN ({', '.join('?' * len(chunk))})"
+                " AND puzzles.publication IS ?"
+                " AND puzzles.date >= ? AND puzzles.date < ?"
+            )
+            params = [publication, start.isoformat(), date.isoformat()]
+            rows.extend(self.db.execute(sql, chunk + params))
+
+        repeats = []
+        for row in rows:
+            for entry, name in usages[row["key"]]:
+                # the key is a hash, so check the entry itself
+                if normalize(entry) != row["entry"]:
+                    continue
+                repeats.append({
+                    "entry": entry,
+                    "name": name,
+                    "path": row["path"],
+                    "title": row["title"],
+                    "date": row["date"],
+                    "used_name": row["name"],
+                })
+        repeats.sort(
+            key=lambda row: (row["entry"], row["date"], row["path"]),
+        )
+        return repeats
+
+    def search(self, query, field=None, limit=20):
+        """Return the clues best matching a text query.
+
+        Every term and quoted phrase in the query must match, in the clue
+        surface or the solutions, or only in the given field.
+        """
+        match = fts_query(query)
+        if not match:
+            return []
+        if field:
+            if field not in ["clue", "solutions"]:
+                raise ValueError(f"Invalid field: {field}")
+            match = f"{field} : ({match})"
+        sql = (
+            "SELECT puzzles.path, puzzles.title, puzzles.date, clues.*,"
+            f" bm25(clue_text, {WEIGHTS[0]}, {WEIGHTS[1]}) AS rank"
+            " FROM clue_text"
+            " JOIN clues ON clues.id = clue_text.rowid"
+            " JOIN puzzles ON puzzles.id = clues.puzzle_id"
+            " WHERE clue_text MATCH ?"
+            " ORDER BY rank, puzzles.date, puzzles.path"
+            " LIMIT ?"
+        )
+        return [dict(row) for row in self.db.execute(sql, (match, limit))]
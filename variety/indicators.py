@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""Tagger for the cryptic devices suggested by indicator words in clues."""
+import functools
+import os
+import re
+
+import yaml
+
+from puzzle.helpers import strip_tags
+
+from variety.hidden import Automaton
+
+DEFAULT_LEXICON = os.path.join(os.path.dirname(__file__), "indicators.yaml")
+
+# a word of a clue surface, lowercased, with any apostrophes inside it
+WORD = re.compile(r"\w+(?:'\w+)*")
+
+
+def tokens(text):
+    """Return the words of some text with their spans."""
+    # curly apostrophes are straightened, which keeps the spans
+    text = strip_tags(text or "").lower().replace("\u2019", "'")
+    return [
+        (match.group(), match.start(), match.end())
+        for match in WORD.finditer(text)
+    ]
+
+
+def read_lexicon(filename):
+    """Return a dict of device -> indicators from a YAML lexicon file."""
+    with open(filename, encoding="utf-8") as f:
+        lexicon = yaml.safe_load(f) or {}
+    if not isinstance(lexicon, dict):
+        raise ValueError(
+            f"Lexicon must be a mapping of devices to indicators: {filename}",
+        )
+    return {
+        str(device): [str(indicator) for indicator in indicators or []]
+        for device, indicators in lexicon.items()
+    }
+
+
+class Tagger:
+    """Tagger class.
+
+    Compiles every indicator phrase of a lexicon into one Aho-Corasick
+    automaton over words, so that a clue is tagged with a single pass over
+    its words whatever the size of the lexicon. The filename is that of
+    the lexicon file, if it was read from one.
+    """
+
+    def __init__(self, lexicon, filename=None):
+        """Initialize the Tagger class."""
+        self.filename = filename
+        self.devices = {}
+        for device, indicators in lexicon.items():
+            for indicator in indicators:
+                words = tuple(word for word, _, _ in tokens(indicator))
+                if words:
+                    self.devices.setdefault(words, set()).add(device)
+        self.automaton = Automaton(self.devices)
+
+    def tag(self, clue):
+        """Return the device tags of a clue, with indicators and spans."""
+        words = tokens(clue)
+        tags = []
+        found = self.automaton.find([word for word, _, _ in words])
+        for start, end, phrase in found:
+            for device in sorted(self.devices[phrase]):
+                tags.append({
+                    "device": device,
+                    "indicator": " ".join(phrase),
+                    "start": words[start][1],
+                    "end": words[end - 1][2],
+                })
+        return tags
+
+    def devices_of(self, clue):
+        """Return the sorted candidate devices of a clue."""
+        return sorted({tag["device"] for tag in self.tag(clue)})
+
+
+@functools.lru_cache(maxsize=None)
+def load_tagger(filename=DEFAULT_LEXICON):
+    """Return the tagger for a lexicon file, compiled once per process."""
+    return Tagger(read_lexicon(filename), filename=os.path.abspath(filename))
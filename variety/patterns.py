@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""Letter-pattern index of words for wildcard lookups."""
+import collections
+
+# characters that match any letter in a pattern
+WILDCARDS = "?._"
+
+
+def _bits(indexes, size):
+    """Return an integer bitset with the given bits set."""
+    bitmap = bytearray((size + 7) // 8)
+    for index in indexes:
+        bitmap[index >> 3] |= 1 << (index & 7)
+    return int.from_bytes(bitmap, "little")
+
+
+def _members(mask):
+    """Yield the positions of the bits set in an integer bitset."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class PatternIndex:
+    """Pattern Index class.
+
+    Words are bucketed by length. Each bucket keeps, for every position,
+    a bitset per letter of the words that have that letter there, so a
+    pattern is matched with one AND per fixed letter.
+    """
+
+    def __init__(self, words=()):
+        """Initialize the PatternIndex class."""
+        buckets = collections.defaultdict(set)
+        for word in words:
+            word = word.upper()
+            if word:
+                buckets[len(word)].add(word)
+
+        # length -> sorted words, and length -> [{letter: bitset}, ...]
+        self.words = {}
+        self.bits = {}
+        for length, bucket in buckets.items():
+            bucket = sorted(bucket)
+            positions = [collections.defaultdict(list) for _ in range(length)]
+            for n, word in enumerate(bucket):
+                for position, letter in enumerate(word):
+                    positions[position][letter].append(n)
+            self.words[length] = bucket
+            self.bits[length] = [
+                {
+                    letter: _bits(indexes, len(bucket))
+                    for letter, indexes in position.items()
+                }
+                for position in positions
+            ]
+
+    def __len__(self):
+        """Return the number of words in the index."""
+        return sum(len(words) for words in self.words.values())
+
+    @classmethod
+    def from_catalog(cls, catalog):
+        """Return an index of the entries in a catalog."""
+        return cls(catalog.entries())
+
+    @classmethod
+    def from_rows(cls, words, rows):
+        """Return an index of stored words by length and their bitset rows."""
+        index = cls()
+        for length, bucket in words.items():
+            index.words[length] = bucket
+            index.bits[length] = [{} for _ in range(length)]
+        for length, position, letter, bits in rows:
+            mask = int.from_bytes(bits, "little")
+            index.bits[length][position][letter] = mask
+        return index
+
+    def rows(self):
+        """Yield (length, position, letter, bits) with each bitset as bytes."""
+        for length, positions in self.bits.items():
+            size = (len(self.words[length]) + 7) // 8
+            for position, letters in enumerate(positions):
+                for letter, mask in letters.items():
+                    bits = mask.to_bytes(size, "little")
+                    yield length, position, letter, bits
+
+    def match(self, pattern):
+        """Return the sorted words that match a pattern such as ?A?C??E."""
+        pattern = pattern.upper()
+        words = self.words.get(len(pattern))
+        if not words:
+            return []
+        mask = (1 << len(words)) - 1
+        for position, letter in enumerate(pattern):
+            if letter in WILDCARDS:
+                continue
+            mask &= self.bits[len(pattern)][position].get(letter, 0)
+            if not mask:
+                return []
+        return [words[n] for n in _members(mask)]
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+
+from variety.anagrams import AnagramIndex
+from variety.anagrams import compile_index
+from variety.anagrams import signature
+
+WORDS = [
+    "listen",
+    "Silent",
+    "enlist",
+    "tin",
+    "inlet",
+    "stile",
+    "ice cream",
+    "creamcie",
+    "it",
+]
+
+
+class TestAnagramIndex(unittest.TestCase):
+
+    def test_signature(self):
+        """Test the sorted letters of words and phrases."""
+        self.assertEqual(signature("Listen"), "EILNST")
+        self.assertEqual(signature("ice cream"), "ACCEEIMR")
+        self.assertEqual(signature("--"), "")
+
+    def test_compile(self):
+        """Test compiling the words grouped by signature."""
+        index = AnagramIndex(data=compile_index(WORDS + ["", "LISTEN"]))
+        self.assertEqual(len(index), 9)
+        self.assertEqual(index.signatures, 6)
+
+        with self.assertRaises(ValueError):
+            AnagramIndex(data=b"\0" * 64)
+        with self.assertRaises(ValueError):
+            AnagramIndex()
+
+    def test_file(self):
+        """Test reading a compiled index from a memory-mapped file."""
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "anagrams.idx")
+            AnagramIndex.compile(WORDS, filename).close()
+            index = AnagramIndex(filename)
+            self.assertEqual(len(index), len(WORDS))
+            self.assertEqual(
+                index.anagrams("tinsel"), ["ENLIST", "LISTEN", "SILENT"],
+            )
+            index.close()
+
+    def test_anagrams(self):
+        """Test finding the words with exactly the given letters."""
+        index = AnagramIndex.from_words(WORDS)
+        self.assertEqual(
+            index.anagrams("tinsel"), ["ENLIST", "LISTEN", "SILENT"],
+        )
+        self.assertEqual(
+            index.anagrams("Mice, Acre"), ["CREAMCIE", "ICE CREAM"],
+        )
+        self.assertEqual(index.anagrams("tins"), [])
+        self.assertEqual(index.anagrams(""), [])
+
+    def test_subanagrams(self):
+        """Test finding the words made from some of the given letters."""
+        index = AnagramIndex.from_words(WORDS)
+        self.assertEqual(
+            index.subanagrams("tinsel"),
+            ["ENLIST", "LISTEN", "SILENT", "INLET", "STILE", "TIN", "IT"],
+        )
+        self.assertEqual(
+            index.subanagrams("tinsel", min_length=5),
+            ["ENLIST", "LISTEN", "SILENT", "INLET", "STILE"],
+        )
+        # each letter is used no more often than it is given
+        self.assertEqual(index.subanagrams("nit"), ["TIN", "IT"])
+        self.assertEqual(index.subanagrams("ti"), ["IT"])
+        self.assertEqual(index.subanagrams("xyz"), [])
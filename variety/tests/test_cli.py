@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from variety.cli import main
+from variety.core import run
+
+BASIC = os.path.join(
+    os.path.dirname(__file__), os.pardir, os.pardir,
+    "puzzle", "puzzle", "tests", "basic.yaml",
+)
+
+
+class TestCli(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db = os.path.join(self.tmp, "catalog.sqlite")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def _main(self, *argv):
+        """Run the command line and return the exit status and output."""
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            with contextlib.redirect_stderr(stderr):
+                status = main(list(argv))
+        return status, stdout.getvalue(), stderr.getvalue()
+
+    def test_stats(self):
+        """Test printing the statistics of a puzzle."""
+        status, out, err = self._main("stats", BASIC)
+        self.assertEqual(status, 0)
+        self.assertIn("width=", out)
+        self.assertIn("total: puzzles=1", out)
+        self.assertIn("1 files, 0 failed", err)
+
+    def test_validate(self):
+        """Test validating a puzzle."""
+        status, out, err = self._main("validate", BASIC, "--jobs", "2")
+        self.assertEqual(status, 0)
+        self.assertIn(": OK", out)
+        self.assertIn("0 invalid", err)
+
+    def test_convert(self):
+        """Test converting a puzzle to YAML."""
+        status, out, _ = self._main("convert", BASIC, "--format", "yaml")
+        self.assertEqual(status, 0)
+        self.assertIn("The Puzzle Times", out)
+
+    def test_failed(self):
+        """Test that a missing file is reported without stopping the run."""
+        missing = os.path.join(self.tmp, "missing.yaml")
+        status, _, err = self._main("stats", BASIC, missing)
+        self.assertEqual(status, 1)
+        self.assertIn("missing.yaml: FAILED", err)
+        self.assertIn("2 files, 1 failed", err)
+
+    def test_index_query(self):
+        """Test indexing a puzzle and querying the catalog."""
+        status, _, _ = self._main("index", BASIC, "--db", self.db)
+        self.assertEqual(status, 0)
+        status, out, _ = self._main(
+            "query", "--db", self.db, "--author", "Tweedle",
+        )
+        self.assertEqual(status, 0)
+        self.assertIn("The Puzzle Times", out)
+
+    def test_jobs(self):
+        """Test that a negative or invalid number of jobs is rejected."""
+        for jobs in ["-1", "two"]:
+            with self.assertRaises(SystemExit):
+                self._main("stats", BASIC, "--jobs", jobs)
+        with self.assertRaises(ValueError):
+            list(run("stats", [BASIC], jobs=-1))
+        status, _, _ = self._main("stats", BASIC, "--jobs", "0")
+        self.assertEqual(status, 0)
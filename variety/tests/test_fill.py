@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+import threading
+import unittest
+
+from variety.fill import Filler
+
+WORDS = ["CAT", "ORE", "WED", "COW", "ARE", "TED", "DOG"]
+
+
+class TestFiller(unittest.TestCase):
+
+    def test_fill(self):
+        """Test that an open grid is filled with distinct words of the list."""
+        filler = Filler(["???", "???", "???"], ["???", "???", "???"], WORDS)
+        solution = filler.fill()
+        self.assertEqual(filler.status, "filled")
+        words = solution["rows"] + solution["columns"]
+        self.assertTrue(set(words) <= set(WORDS))
+        self.assertEqual(len(set(words)), 6)
+        self.assertEqual(
+            ["".join(column) for column in zip(*solution["rows"])],
+            solution["columns"],
+        )
+
+    def test_given_letters(self):
+        """Test that the letters already in the grid are kept."""
+        filler = Filler(["C??", "???", "??D"], ["C??", "???", "??D"], WORDS)
+        solution = filler.fill()
+        self.assertEqual(solution["rows"][0][0], "C")
+        self.assertEqual(solution["rows"][2][2], "D")
+
+    def test_repeated_given_word(self):
+        """Test that words already repeated in the grid do not block a fill."""
+        row = "CAT#CAT#?O"
+        filler = Filler([row], list(row), ["GO"])
+        self.assertEqual(filler.fill()["rows"], ["CAT#CAT#GO"])
+        self.assertEqual(filler.status, "filled")
+
+        # but an open slot does not take a word that is already in the grid
+        filler = Filler(["CAT#???"], list("CAT#???"), ["CAT"])
+        self.assertIsNone(filler.fill())
+        self.assertEqual(filler.status, "impossible")
+
+    def test_impossible(self):
+        """Test that a grid with no fill reports impossible."""
+        filler = Filler(
+            ["???", "???", "???"], ["???", "???", "???"], ["CAT", "DOG"],
+        )
+        self.assertIsNone(filler.fill())
+        self.assertEqual(filler.status, "impossible")
+
+    def test_limit(self):
+        """Test that the number of fills is limited."""
+        filler = Filler(["??"], ["?", "?"], ["GO", "NO", "SO"])
+        self.assertEqual(len(list(filler.fills())), 3)
+        self.assertEqual(len(list(filler.fills(limit=2))), 2)
+
+    def test_timeout(self):
+        """Test that the search stops when the time is up."""
+        filler = Filler(["???", "???", "???"], ["???", "???", "???"], WORDS)
+        self.assertIsNone(filler.fill(timeout=-1))
+        self.assertEqual(filler.status, "timeout")
+
+    def test_cancel(self):
+        """Test that the search stops when it is cancelled."""
+        cancel = threading.Event()
+        cancel.set()
+        filler = Filler(["???", "???", "???"], ["???", "???", "???"], WORDS)
+        self.assertIsNone(filler.fill(cancel=cancel))
+        self.assertEqual(filler.status, "cancelled")
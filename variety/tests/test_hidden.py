@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from variety.hidden import Automaton
+from variety.hidden import HiddenScanner
+from variety.hidden import letters
+
+
+class TestAutomaton(unittest.TestCase):
+
+    def test_overlapping(self):
+        """Test that every occurrence is found, even inside other words."""
+        automaton = Automaton(["HE", "SHE", "HIS", "HERS"])
+        self.assertEqual(len(automaton), 4)
+        self.assertEqual(
+            sorted(automaton.find("USHERS")),
+            [(1, 4, "SHE"), (2, 4, "HE"), (2, 6, "HERS")],
+        )
+
+    def test_repeats(self):
+        """Test overlapping occurrences of the same word."""
+        automaton = Automaton(["AA", "AAA"])
+        self.assertEqual(
+            sorted(automaton.find("AAAA")),
+            [
+                (0, 2, "AA"),
+                (0, 3, "AAA"),
+                (1, 3, "AA"),
+                (1, 4, "AAA"),
+                (2, 4, "AA"),
+            ],
+        )
+        self.assertEqual(list(automaton.find("BAB")), [])
+
+    def test_tokens(self):
+        """Test matching sequences of words instead of letters."""
+        automaton = Automaton([("in", "part"), ("part",)])
+        self.assertEqual(
+            list(automaton.find(["some", "in", "part", "of"])),
+            [(1, 3, ("in", "part")), (2, 3, ("part",))],
+        )
+
+
+class TestHiddenScanner(unittest.TestCase):
+
+    def test_letters(self):
+        """Test the letters of text and their positions."""
+        self.assertEqual(letters("a-B c"), ("ABC", [0, 2, 4]))
+        self.assertEqual(letters("café!"), ("CAFE", [0, 1, 2, 3]))
+
+    def test_scan(self):
+        """Test finding an answer across words, with its span in the text."""
+        scanner = HiddenScanner(["Deaf", "clot"])
+        text, hits = scanner.scan("Parade, a <i>fault</i>")
+        self.assertEqual(text, "Parade, a fault")
+        self.assertEqual(len(hits), 1)
+        hit = hits[0]
+        self.assertEqual(hit["answer"], "Deaf")
+        self.assertFalse(hit["reversed"])
+        self.assertEqual((hit["start"], hit["end"]), (4, 11))
+        self.assertEqual(text[hit["start"]:hit["end"]], "de, a f")
+        self.assertEqual(hit["text"], "de, a f")
+
+    def test_reversed(self):
+        """Test finding an answer reversed in the text."""
+        scanner = HiddenScanner(["STRAW"])
+        _, hits = scanner.scan("Wart swept away")
+        self.assertEqual(
+            [(hit["answer"], hit["reversed"], hit["text"]) for hit in hits],
+            [("STRAW", True, "Wart s")],
+        )
+        scanner = HiddenScanner(["STRAW"], reverse=False)
+        _, hits = scanner.scan("Wart swept away")
+        self.assertEqual(hits, [])
+
+    def test_palindrome(self):
+        """Test that a palindrome is only reported forwards."""
+        scanner = HiddenScanner(["LEVEL"])
+        _, hits = scanner.scan("Hotel Evelyn")
+        self.assertEqual(
+            [(hit["answer"], hit["reversed"], hit["text"]) for hit in hits],
+            [("LEVEL", False, "l Evel")],
+        )
+
+    def test_whole_words(self):
+        """Test that whole words of the text are not hidden."""
+        scanner = HiddenScanner(["HEART", "EARTH"])
+        _, hits = scanner.scan("Heart of the earthworm")
+        self.assertEqual([hit["text"] for hit in hits], ["earth"])
+
+    def test_min_length(self):
+        """Test that short answers are not looked for."""
+        scanner = HiddenScanner(["ONE", "TONE"])
+        self.assertEqual(list(scanner.answers), ["TONE"])
+        scanner = HiddenScanner(["ONE", "TONE"], min_length=3)
+        _, hits = scanner.scan("Bat one")
+        self.assertEqual([hit["answer"] for hit in hits], ["TONE"])
+
+    def test_scan_records(self):
+        """Test scanning catalog records, marking each clue's own answer."""
+        records = [(
+            "a.yaml",
+            {
+                "title": "A",
+                "clues": [
+                    {
+                        "container": "Across",
+                        "name": "1",
+                        "clue": "Parade a fault",
+                        "answers": ["DEAF"],
+                    },
+                    {
+                        "container": "Down",
+                        "name": "2",
+                        "clue": "Hide a fence",
+                        "answers": ["RAIL"],
+                    },
+                ],
+            },
+        )]
+        hits = HiddenScanner(["DEAF", "RAIL"]).scan_records(records)
+        self.assertEqual(
+            [(hit["name"], hit["answer"], hit["own"]) for hit in hits],
+            [("1", "DEAF", True), ("2", "DEAF", False)],
+        )
+        self.assertEqual(hits[1]["path"], "a.yaml")
+        self.assertEqual(hits[1]["clue"], "Hide a fence")
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+import datetime
+import os
+import shutil
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+import yaml
+
+from variety.core import load_puzzle
+from variety.index import Catalog
+
+BASIC = os.path.join(
+    os.path.dirname(__file__), os.pardir, os.pardir,
+    "puzzle", "puzzle", "tests", "basic.yaml",
+)
+
+
+class TestCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        with open(BASIC) as f:
+            self.data = yaml.safe_load(f)
+        self.paths = [
+            self._write("a", author="Alice", date=datetime.date(2021, 5, 1)),
+            self._write(
+                "b",
+                author="Bob",
+                date=datetime.date(2022, 6, 1),
+                title="Second",
+            ),
+        ]
+        self.catalog = Catalog(os.path.join(self.tmp, "catalog.sqlite"))
+
+    def tearDown(self):
+        self.catalog.close()
+        shutil.rmtree(self.tmp)
+
+    def _write(self, name, **fields):
+        path = os.path.join(self.tmp, f"{name}.yaml")
+        with open(path, "w") as f:
+            yaml.safe_dump(dict(self.data, **fields), f)
+        return path
+
+    def test_refresh(self):
+        """Test that only new and changed files are parsed again."""
+        stats = self.catalog.refresh(self.paths)
+        self.assertEqual(
+            stats,
+            {
+                "added": 2,
+                "updated": 0,
+                "removed": 0,
+                "unchanged": 0,
+                "failed": 0,
+            },
+        )
+        stats = self.catalog.refresh(self.paths)
+        self.assertEqual(stats["unchanged"], 2)
+        self.assertEqual(stats["added"] + stats["updated"], 0)
+
+        # touched but not modified
+        os.utime(self.paths[0], (0, 0))
+        stats = self.catalog.refresh(self.paths)
+        self.assertEqual(stats["unchanged"], 2)
+
+        self._write("b", author="Carol", date=datetime.date(2022, 6, 1))
+        os.utime(self.paths[1], (0, 0))
+        stats = self.catalog.refresh(self.paths)
+        self.assertEqual((stats["updated"], stats["unchanged"]), (1, 1))
+        self.assertEqual(
+            [puzzle["author"] for puzzle in self.catalog.puzzles()],
+            ["Alice", "Carol"],
+        )
+
+    def test_failed(self):
+        """Test that files that cannot be parsed or have gone are failed."""
+        self.catalog.refresh(self.paths)
+        bad = os.path.join(self.tmp, "bad.yaml")
+        with open(bad, "w") as f:
+            f.write("title: [")
+        os.remove(self.paths[1])
+        stats = self.catalog.refresh(self.paths + [bad])
+        self.assertEqual(stats["failed"], 2)
+        self.assertEqual(stats["unchanged"], 1)
+        self.assertEqual(
+            [puzzle["path"] for puzzle in self.catalog.puzzles()],
+            [self.paths[0]],
+        )
+
+    def test_prune(self):
+        """Test removing the puzzles whose files are no longer listed."""
+        self.catalog.refresh(self.paths)
+        stats = self.catalog.refresh(self.paths[:1], prune=False)
+        self.assertEqual(stats["removed"], 0)
+        self.assertEqual(len(self.catalog.puzzles()), 2)
+        stats = self.catalog.refresh(self.paths[:1])
+        self.assertEqual(stats["removed"], 1)
+        self.assertEqual(
+            [puzzle["path"] for puzzle in self.catalog.puzzles()],
+            self.paths[:1],
+        )
+        db = self.catalog.db
+        self.assertEqual(
+            db.execute("SELECT COUNT(*) FROM clue_text").fetchone()[0],
+            db.execute("SELECT COUNT(*) FROM clues").fetchone()[0],
+        )
+
+    def test_query(self):
+        """Test finding puzzles by their metadata and clues by answers."""
+        self.catalog.refresh(self.paths)
+        self.assertEqual(
+            [puzzle["author"] for puzzle in self.catalog.puzzles()],
+            ["Alice", "Bob"],
+        )
+        self.assertEqual(
+            [puzzle["author"] for puzzle in self.catalog.puzzles(author="bo")],
+            ["Bob"],
+        )
+        self.assertEqual(
+            [puzzle["author"] for puzzle in self.catalog.puzzles(year=2021)],
+            ["Alice"],
+        )
+        self.assertEqual(
+            [puzzle["title"] for puzzle in self.catalog.puzzles(title="sec")],
+            ["Second"],
+        )
+        self.assertEqual(self.catalog.puzzles(publication="Nowhere"), [])
+
+        clues = self.catalog.clues("french-bed")
+        self.assertEqual([clue["path"] for clue in clues], self.paths)
+        self.assertEqual(clues[0]["name"], "1")
+        self.assertIn("FRENCH BED", self.catalog.answers())
+        self.assertIn("AGATES", self.catalog.entries())
+
+    def test_search(self):
+        """Test full-text search of the clue surfaces and solutions."""
+        self.catalog.refresh(self.paths[:1])
+        clues = self.catalog.search("practical joke")
+        self.assertEqual([clue["answers"] for clue in clues], ["FRENCH BED"])
+        self.assertEqual(self.catalog.search('"joke practical"'), [])
+        self.assertEqual(self.catalog.search("homophone", field="clue"), [])
+        self.assertTrue(self.catalog.search("homophone", field="solutions"))
+        self.assertEqual(len(self.catalog.search("a", limit=3)), 3)
+        self.assertEqual(self.catalog.search("--"), [])
+        with self.assertRaises(ValueError):
+            self.catalog.search("joke", field="answers")
+
+    def test_schema(self):
+        """Test that a catalog is reopened with its rows."""
+        self.catalog.refresh(self.paths)
+        self.catalog.close()
+        self.catalog = Catalog(os.path.join(self.tmp, "catalog.sqlite"))
+        self.assertEqual(len(self.catalog.puzzles()), 2)
+
+
+class TestRepeats(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        with open(BASIC) as f:
+            self.data = yaml.safe_load(f)
+        self.paths = {}
+        for name, date, publication in [
+            ("jan", datetime.date(2022, 1, 1), "Times"),
+            ("feb", datetime.date(2022, 2, 1), "Times"),
+            ("other", datetime.date(2022, 2, 1), "Other"),
+            ("mar", datetime.date(2022, 3, 15), "Times"),
+        ]:
+            self.paths[name] = self._write(
+                name, date=date, publication=publication,
+            )
+        self.catalog = Catalog(os.path.join(self.tmp, "catalog.sqlite"))
+        self.catalog.refresh(sorted(self.paths.values()))
+        self.puzzle = load_puzzle(self.paths["mar"])
+
+    def tearDown(self):
+        self.catalog.close()
+        shutil.rmtree(self.tmp)
+
+    def _write(self, name, **fields):
+        data = dict(self.data, **fields)
+        path = os.path.join(self.tmp, f"{name}.yaml")
+        with open(path, "w") as f:
+            yaml.safe_dump(data, f)
+        return path
+
+    def _dates(self, repeats):
+        return sorted({repeat["date"] for repeat in repeats})
+
+    def test_window(self):
+        """Test that only puzzles in the weeks before the date are checked."""
+        repeats = self.catalog.repeats(self.puzzle, weeks=8)
+        self.assertEqual(self._dates(repeats), ["2022-02-01"])
+        self.assertEqual(
+            {repeat["path"] for repeat in repeats}, {self.paths["feb"]},
+        )
+        self.assertEqual(
+            len(repeats), len(self.puzzle.entries) + len(self.puzzle.unclued),
+        )
+        self.assertEqual(
+            self._dates(self.catalog.repeats(self.puzzle, weeks=11)),
+            ["2022-01-01", "2022-02-01"],
+        )
+        self.assertEqual(self.catalog.repeats(self.puzzle, weeks=1), [])
+
+    def test_repeat(self):
+        """Test the details of a repeat."""
+        repeats = self.catalog.repeats(self.puzzle)
+        repeat = [row for row in repeats if row["entry"] == "AGATES"][0]
+        self.assertEqual(repeat["name"], repeat["used_name"])
+        self.assertEqual(repeat["title"], self.data["title"])
+        unclued = [repeat for repeat in repeats if repeat["name"] is None]
+        self.assertEqual(len(unclued), len(self.puzzle.unclued))
+
+    def test_publication(self):
+        """Test that only puzzles of the same publication are checked."""
+        repeats = self.catalog.repeats(self.puzzle, publication="Other")
+        self.assertEqual(
+            {repeat["path"] for repeat in repeats}, {self.paths["other"]},
+        )
+        self.assertEqual(
+            self.catalog.repeats(self.puzzle, publication="None"), [],
+        )
+
+    def test_batches(self):
+        """Test looking up more entries than fit in one query."""
+        entries = {
+            f"WORD{n}": types.SimpleNamespace(name=str(n)) for n in range(1200)
+        }
+        entries.update(self.puzzle.entries)
+        puzzle = types.SimpleNamespace(
+            date=datetime.date(2022, 3, 15),
+            publication="Times",
+            entries=entries,
+            unclued=self.puzzle.unclued,
+        )
+        self.assertEqual(
+            self.catalog.repeats(puzzle), self.catalog.repeats(self.puzzle),
+        )
+
+    def test_reindex(self):
+        """Test that the usages of a changed puzzle are replaced on refresh."""
+        self.assertIn(
+            "DOC",
+            [repeat["entry"] for repeat in self.catalog.repeats(self.puzzle)],
+        )
+        self._write(
+            "feb",
+            date=datetime.date(2022, 2, 1),
+            publication="Times",
+            unclued=[],
+        )
+        os.utime(self.paths["feb"], (0, 0))
+        stats = self.catalog.refresh(sorted(self.paths.values()))
+        self.assertEqual(stats["updated"], 1)
+        repeats = self.catalog.repeats(self.puzzle)
+        self.assertEqual(len(repeats), len(self.puzzle.entries))
+        self.assertNotIn("DOC", [repeat["entry"] for repeat in repeats])
+
+        os.remove(self.paths["other"])
+        self.catalog.refresh(
+            [self.paths["jan"], self.paths["feb"], self.paths["mar"]],
+        )
+        self.assertEqual(
+            self.catalog.repeats(self.puzzle, publication="Other"), [],
+        )
+
+    def test_collision(self):
+        """Test that entries whose keys collide are not reported."""
+        with mock.patch("variety.index.entry_key", return_value=1):
+            self.catalog.refresh([self.paths["feb"]], prune=False)
+            self.catalog.db.execute("UPDATE puzzles SET mtime = 0, hash = ''")
+            self.catalog.refresh(sorted(self.paths.values()))
+            repeats = self.catalog.repeats(self.puzzle)
+        self.assertEqual(
+            sorted(repeat["entry"] for repeat in repeats),
+            sorted(list(self.puzzle.entries) + list(self.puzzle.unclued)),
+        )
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+
+import yaml
+
+from variety.index import Catalog
+from variety.indicators import Tagger
+from variety.indicators import load_tagger
+from variety.indicators import read_lexicon
+from variety.indicators import tokens
+
+BASIC = os.path.join(
+    os.path.dirname(__file__), os.pardir, os.pardir,
+    "puzzle", "puzzle", "tests", "basic.yaml",
+)
+
+LEXICON = {
+    "anagram": ["broken", "of sorts"],
+    "reversal": ["back", "going back"],
+    "hidden": ["in part", "some"],
+    "insertion": ["in"],
+    "homophone": ["it's said"],
+}
+
+
+class TestTagger(unittest.TestCase):
+
+    def test_tokens(self):
+        """Test splitting text into lowercase words with their spans."""
+        self.assertEqual(
+            tokens("Café <i>broken</i>, it’s 2 late"),
+            [
+                ("café", 0, 4),
+                ("broken", 5, 11),
+                ("it's", 13, 17),
+                ("2", 18, 19),
+                ("late", 20, 24),
+            ],
+        )
+
+    def test_tag(self):
+        """Test tagging the devices suggested by the indicators in a clue."""
+        tagger = Tagger(LEXICON)
+        self.assertIsNone(tagger.filename)
+        clue = "Team going back in part, sorts broken"
+        tags = tagger.tag(clue)
+        self.assertEqual(
+            [(tag["device"], tag["indicator"]) for tag in tags],
+            [
+                ("reversal", "going back"),
+                ("reversal", "back"),
+                ("insertion", "in"),
+                ("hidden", "in part"),
+                ("anagram", "broken"),
+            ],
+        )
+        self.assertEqual(clue[tags[0]["start"]:tags[0]["end"]], "going back")
+        self.assertEqual(clue[tags[3]["start"]:tags[3]["end"]], "in part")
+        self.assertEqual(
+            tagger.devices_of(clue),
+            ["anagram", "hidden", "insertion", "reversal"],
+        )
+
+    def test_apostrophes(self):
+        """Test that indicators with apostrophes match either quote."""
+        tagger = Tagger(LEXICON)
+        self.assertEqual(tagger.devices_of("Knight, it's said"), ["homophone"])
+        self.assertEqual(tagger.devices_of("Knight, it’s said"), ["homophone"])
+        self.assertEqual(tagger.devices_of("Knight, its aid"), [])
+
+    def test_lexicon(self):
+        """Test reading a lexicon file."""
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "lexicon.yaml")
+            with open(filename, "w") as f:
+                yaml.safe_dump(LEXICON, f)
+            self.assertEqual(read_lexicon(filename), LEXICON)
+            tagger = load_tagger(filename)
+            self.assertEqual(tagger.filename, os.path.abspath(filename))
+            self.assertEqual(
+                tagger.devices_of("Some broken"), ["anagram", "hidden"],
+            )
+
+            with open(filename, "w") as f:
+                yaml.safe_dump(["broken"], f)
+            with self.assertRaises(ValueError):
+                read_lexicon(filename)
+
+
+class TestCatalogTags(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.lexicon = os.path.join(self.tmp, "lexicon.yaml")
+        self._write_lexicon({"anagram": ["rocking"]})
+        self.db = os.path.join(self.tmp, "catalog.sqlite")
+        self.paths = []
+        for name, author in [("a.yaml", "Alice"), ("b.yaml", "Bob")]:
+            with open(BASIC) as f:
+                data = yaml.safe_load(f)
+            data["author"] = author
+            path = os.path.join(self.tmp, name)
+            with open(path, "w") as f:
+                yaml.safe_dump(data, f)
+            self.paths.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def _write_lexicon(self, lexicon):
+        with open(self.lexicon, "w") as f:
+            yaml.safe_dump(lexicon, f)
+        load_tagger.cache_clear()
+
+    def test_device_mix(self):
+        """Test counting the tagged clues per device and author."""
+        with Catalog(self.db) as catalog:
+            catalog.refresh(self.paths, tagger=Tagger(LEXICON))
+            rows = catalog.device_mix(by="author")
+            self.assertEqual({row["name"] for row in rows}, {"Alice", "Bob"})
+            mix = {}
+            for row in rows:
+                mix.setdefault(row["name"], {})[row["device"]] = row["clues"]
+            alice = mix["Alice"]
+            bob = mix["Bob"]
+            self.assertEqual(alice, bob)
+            self.assertTrue(alice)
+            self.assertEqual(catalog.untagged(), 0)
+            with self.assertRaises(ValueError):
+                catalog.device_mix(by="clue")
+
+    def test_untagged(self):
+        """Test counting the puzzles that were stored without a tagger."""
+        with Catalog(self.db) as catalog:
+            catalog.refresh(self.paths[:1])
+            self.assertEqual(catalog.untagged(), 1)
+            self.assertEqual(catalog.device_mix(), [])
+            self.assertGreater(catalog.tag(Tagger(LEXICON)), 0)
+            self.assertEqual(catalog.untagged(), 0)
+            # a tagger without a file is not remembered
+            catalog.refresh(self.paths)
+            self.assertEqual(catalog.untagged(), 1)
+
+    def test_stored_lexicon(self):
+        """Test that later refreshes tag with the catalog's stored lexicon."""
+        with Catalog(self.db) as catalog:
+            catalog.refresh(self.paths[:1], tagger=load_tagger(self.lexicon))
+            self.assertEqual(
+                {row["device"] for row in catalog.device_mix()}, {"anagram"},
+            )
+
+            # a plain refresh keeps the tags and tags the new puzzle
+            catalog.refresh(self.paths)
+            self.assertEqual(catalog.untagged(), 0)
+            self.assertEqual(
+                [(row["name"], row["device"]) for row in catalog.device_mix()],
+                [("Alice", "anagram"), ("Bob", "anagram")],
+            )
+
+            # a changed lexicon tags every clue again
+            self._write_lexicon({"reversal": ["regressive"]})
+            catalog.refresh(self.paths)
+            self.assertEqual(
+                [(row["name"], row["device"]) for row in catalog.device_mix()],
+                [("Alice", "reversal"), ("Bob", "reversal")],
+            )
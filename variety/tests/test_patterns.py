@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+
+from variety.index import Catalog
+from variety.patterns import PatternIndex
+
+BASIC = os.path.join(
+    os.path.dirname(__file__), os.pardir, os.pardir,
+    "puzzle", "puzzle", "tests", "basic.yaml",
+)
+
+WORDS = ["cat", "COT", "cut", "dog", "ACT", "catch", "Cat", ""]
+
+
+class TestPatternIndex(unittest.TestCase):
+
+    def test_match(self):
+        """Test matching words against letter patterns."""
+        index = PatternIndex(WORDS)
+        self.assertEqual(len(index), 6)
+        self.assertEqual(index.match("C?T"), ["CAT", "COT", "CUT"])
+        self.assertEqual(index.match("c.t"), ["CAT", "COT", "CUT"])
+        self.assertEqual(index.match("_A_"), ["CAT"])
+        self.assertEqual(
+            index.match("???"), ["ACT", "CAT", "COT", "CUT", "DOG"],
+        )
+        self.assertEqual(index.match("CATCH"), ["CATCH"])
+        self.assertEqual(index.match("C?X"), [])
+        self.assertEqual(index.match("????"), [])
+        self.assertEqual(index.match(""), [])
+
+    def test_many(self):
+        """Test matching across more words than fit in one machine word."""
+        words = [
+            f"{a}{b}{c}"
+            for a in "ABCDEFGH" for b in "ABCDEFGH" for c in "ABCDEFGH"
+        ]
+        index = PatternIndex(words)
+        self.assertEqual(index.match("H?A"), [f"H{b}A" for b in "ABCDEFGH"])
+        self.assertEqual(len(index.match("???")), 512)
+
+    def test_rows(self):
+        """Test rebuilding an index from its stored rows."""
+        index = PatternIndex(WORDS)
+        stored = PatternIndex.from_rows(index.words, index.rows())
+        for pattern in ["C?T", "???", "?A???", "XYZ"]:
+            self.assertEqual(stored.match(pattern), index.match(pattern))
+
+    def test_catalog(self):
+        """Test that the catalog keeps its pattern index up to date."""
+        with tempfile.TemporaryDirectory() as tmp:
+            with Catalog(os.path.join(tmp, "catalog.sqlite")) as catalog:
+                self.assertEqual(catalog.pattern_index(6).match("??????"), [])
+                catalog.refresh([BASIC])
+                expected = PatternIndex.from_catalog(catalog).match("A?A???")
+                self.assertIn("AGATES", expected)
+                self.assertEqual(
+                    catalog.pattern_index(6).match("A?A???"), expected,
+                )
+                self.assertEqual(
+                    catalog.pattern_index().match("A?A???"), expected,
+                )
+                self.assertEqual(catalog.pattern_index(5).match("A?A???"), [])
+
+                catalog.refresh([])
+                self.assertEqual(catalog.pattern_index(6).match("A?A???"), [])